@@ -1,8 +1,16 @@
 import asyncio
+import hashlib
 import json
-from openai import OpenAI
+import os
+import threading
+import time
+from collections import OrderedDict
+from openai import AsyncOpenAI
 
-from backend.config.env import OPENAI_API_KEY
+from backend.config.env import (
+    OPENAI_API_KEY, AI_MODEL, AI_RATING_MODE, AI_REQUEST_TIMEOUT_SECONDS, AI_CACHE_TTL_SECONDS, AI_CACHE_MAX_ENTRIES,
+    AI_BATCH_WINDOW_SECONDS, AI_BATCH_MAX_SIZE, AI_MAX_CONCURRENT_REQUESTS
+)
 
 # Tool for AI-Feedback for the description
 description = [{
@@ -69,35 +77,251 @@ title = [{
     }
 }]
 
+# Tool for rating title and description in a single request (AI_RATING_MODE=combined)
+title_and_description = [{
+    "type": "function",
+    "function": {
+        "name": "rate_website_title_and_description",
+        "description": (
+            f"Bewerte bitte den Titel und die Beschreibung der Webseite. "
+            f"Titel: {title[0]['function']['description']} "
+            f"Beschreibung: {description[0]['function']['description']}"
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                **{f"title_{name}": prop for name, prop in title[0]['function']['parameters']['properties'].items()},
+                **{f"description_{name}": prop for name, prop in description[0]['function']['parameters']['properties'].items()},
+            },
+            "required": [
+                "title_rating",
+                "title_reason",
+                "title_improvement",
+                "description_rating",
+                "description_reason",
+                "description_improvement"
+            ],
+            "additionalProperties": False
+        },
+        "strict": True
+    }
+}]
+
+# Tool for rating several websites in one request (batching, see AIService)
+batch = [{
+    "type": "function",
+    "function": {
+        "name": "rate_websites",
+        "description": (
+            f"Bewerte bitte für jede Webseite der Liste den Titel und die Beschreibung. "
+            f"Titel: {title[0]['function']['description']} "
+            f"Beschreibung: {description[0]['function']['description']}"
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "ratings": {
+                    "type": "array",
+                    "description": "Eine Bewertung pro Webseite, in derselben Reihenfolge wie die Liste.",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "index": {
+                                "type": "integer",
+                                "description": "Index der Webseite in der Liste."
+                            },
+                            **title_and_description[0]['function']['parameters']['properties'],
+                        },
+                        "required": ["index", *title_and_description[0]['function']['parameters']['required']],
+                        "additionalProperties": False
+                    }
+                },
+            },
+            "required": [
+                "ratings"
+            ],
+            "additionalProperties": False
+        },
+        "strict": True
+    }
+}]
+
+AI_RATING_MODES = ('separate', 'combined')
+
+class AIService:
+    """
+    Process-wide access to the OpenAI ratings.
+
+    Holds one long-lived AsyncOpenAI client (and with it one HTTP connection pool)
+    on an event loop that runs in a background thread, so synchronous callers like
+    build_ai_card don't have to spin up a new loop per analysis. Ratings are cached
+    by a hash of model, title and description for AI_CACHE_TTL_SECONDS.
+
+    In 'separate' mode title and description are rated with one request each,
+    in 'combined' mode with a single tool call (half the requests and prompt overhead).
+
+    With a batch window > 0, requests arriving within the window (e.g. from the pages
+    of one crawl) are sent as one multi-item request of up to batch_max_size entries
+    and the results are fanned back out to the callers. Items missing from a batch
+    answer, or all items of a failed batch, are retried individually so one bad item
+    doesn't fail the others. At most max_concurrency requests are in flight.
+    """
+
+    def __init__(self, api_key=OPENAI_API_KEY, model=AI_MODEL, mode=AI_RATING_MODE, cache_ttl=AI_CACHE_TTL_SECONDS, cache_max_entries=AI_CACHE_MAX_ENTRIES,
+                 batch_window=AI_BATCH_WINDOW_SECONDS, batch_max_size=AI_BATCH_MAX_SIZE, max_concurrency=AI_MAX_CONCURRENT_REQUESTS):
+        if mode not in AI_RATING_MODES:
+            raise ValueError(f"Invalid AI rating mode '{mode}'. Use one of: {', '.join(AI_RATING_MODES)}.")
+        self.model = model
+        self.mode = mode
+        self.cache_ttl = cache_ttl
+        self.cache_max_entries = cache_max_entries
+        self.batch_window = batch_window
+        self.batch_max_size = batch_max_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pending = []  # (description, title, future) waiting for the next batch
+        self._flush_handle = None
+        self._inflight = {}  # cache key -> future, identical concurrent requests share one
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="ai-service-loop", daemon=True)
+        self._thread.start()
+        self._client = AsyncOpenAI(api_key=api_key, timeout=AI_REQUEST_TIMEOUT_SECONDS, max_retries=1)
+
+    def _cache_key(self, website_description, website_title):
+        return hashlib.sha256(f"{self.model}\0{website_title}\0{website_description}".encode('utf-8')).hexdigest()
+
+    def _cache_get(self, key):
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at < time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return result
+
+    def _cache_put(self, key, result):
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
+
+    async def _rate(self, website_description, website_title):
+        key = self._cache_key(website_description, website_title)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return dict(cached)
+        if key in self._inflight:
+            return dict(await asyncio.shield(self._inflight[key]))
+
+        future = self._loop.create_future()
+        self._inflight[key] = future
+        try:
+            if self.batch_window > 0:
+                self._enqueue(website_description, website_title, future)
+            else:
+                self._loop.create_task(self._resolve_single(website_description, website_title, future))
+            result = await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+        self._cache_put(key, result)
+        return dict(result)
+
+    async def _request(self, website_description, website_title):
+        request_ratings = _request_combined_rating if self.mode == 'combined' else _request_ratings
+        async with self._semaphore:
+            return await request_ratings(self._client, self.model, website_description, website_title)
+
+    async def _resolve_single(self, website_description, website_title, future):
+        try:
+            future.set_result(await self._request(website_description, website_title))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _enqueue(self, website_description, website_title, future):
+        self._pending.append((website_description, website_title, future))
+        if len(self._pending) >= self.batch_max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self.batch_window, self._flush)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        items, self._pending = self._pending, []
+        if len(items) == 1:
+            self._loop.create_task(self._resolve_single(*items[0]))
+        elif items:
+            self._loop.create_task(self._resolve_batch(items))
+
+    async def _resolve_batch(self, items):
+        try:
+            async with self._semaphore:
+                results = await _request_batch_ratings(self._client, self.model, [(d, t) for d, t, _ in items])
+        except Exception as e:
+            print(f"Warning: Batched AI rating of {len(items)} items failed, retrying individually: {e}")
+            results = {}
+        for index, (website_description, website_title, future) in enumerate(items):
+            if index in results:
+                future.set_result(results[index])
+            else:
+                self._loop.create_task(self._resolve_single(website_description, website_title, future))
+
+    def rate(self, website_description, website_title, timeout=None):
+        """Blocking entry point for synchronous code. Runs the request on the service loop."""
+        future = asyncio.run_coroutine_threadsafe(self._rate(website_description, website_title), self._loop)
+        return future.result(timeout)
+
+    async def rate_async(self, website_description, website_title):
+        """Awaitable entry point for coroutines running on any other event loop."""
+        future = asyncio.run_coroutine_threadsafe(self._rate(website_description, website_title), self._loop)
+        return await asyncio.wrap_future(future)
+
+_service = None
+_service_pid = None
+_service_lock = threading.Lock()
+
+def get_ai_service() -> AIService:
+    """Returns the process-wide AI service. A new one is created after a fork, as the loop thread does not survive it."""
+    global _service, _service_pid
+    with _service_lock:
+        if _service is None or _service_pid != os.getpid():
+            _service = AIService()
+            _service_pid = os.getpid()
+        return _service
+
 async def ai_analyzer(website_description, website_title):
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    return await get_ai_service().rate_async(website_description, website_title)
 
+async def _request_ratings(client, model, website_description, website_title):
     description_message = [{
         "role": "user",
         "content": (
             f"Bitte bewerte die Beschreibung einer Webseite - Verwende Formulierungen wie 'Die Beschreibung deiner Webseite' - "
-            f"###Beginn der Beschreibung###{website_description}.###Ende der Beschreibung###"
+            f"{_description_block(website_description)}"
         )
     }]
     title_message = [{
         "role": "user",
         "content": (
             f"Bitte bewerte den Titel einer Webseite - Verwende Formulierungen wie 'Der Titel deiner Webseite' - "
-            f"###Beginn des Titels###{website_title}.###Ende des Titels###"
+            f"{_title_block(website_title)}"
         )
     }]
 
-    # Use asyncio.to_thread to run the synchronous create() calls concurrently.
-    task_description = asyncio.to_thread(
-        client.chat.completions.create,
-        model="gpt-4o",
+    task_description = client.chat.completions.create(
+        model=model,
         messages=description_message,
         tools=description,
         tool_choice={"type": "function", "function": {"name": "rate_website_description"}}
     )
-    task_title = asyncio.to_thread(
-        client.chat.completions.create,
-        model="gpt-4o",
+    task_title = client.chat.completions.create(
+        model=model,
         messages=title_message,
         tools=title,
         tool_choice={"type": "function", "function": {"name": "rate_website_title"}}
@@ -115,4 +339,79 @@ async def ai_analyzer(website_description, website_title):
         "title_rating": ai_output_title['rating'],
         "title_reason": ai_output_title['reason'],
         "title_improvement": ai_output_title['improvement']
-    }
\ No newline at end of file
+    }
+
+async def _request_combined_rating(client, model, website_description, website_title):
+    message = [{
+        "role": "user",
+        "content": (
+            f"Bitte bewerte den Titel und die Beschreibung einer Webseite - Verwende Formulierungen wie "
+            f"'Der Titel deiner Webseite' und 'Die Beschreibung deiner Webseite' - "
+            f"{_title_block(website_title)} {_description_block(website_description)}"
+        )
+    }]
+
+    completion = await client.chat.completions.create(
+        model=model,
+        messages=message,
+        tools=title_and_description,
+        tool_choice={"type": "function", "function": {"name": "rate_website_title_and_description"}}
+    )
+
+    ai_output = json.loads(completion.choices[0].message.tool_calls[0].function.arguments)
+
+    return {
+        "description_rating": ai_output['description_rating'],
+        "description_reason": ai_output['description_reason'],
+        "description_improvement": ai_output['description_improvement'],
+        "title_rating": ai_output['title_rating'],
+        "title_reason": ai_output['title_reason'],
+        "title_improvement": ai_output['title_improvement']
+    }
+
+def _title_block(website_title):
+    return f"###Beginn des Titels###{website_title}.###Ende des Titels###"
+
+def _description_block(website_description):
+    return f"###Beginn der Beschreibung###{website_description}.###Ende der Beschreibung###"
+
+async def _request_batch_ratings(client, model, websites):
+    """Rates a list of (description, title) pairs with one request. Returns {index: ratings}."""
+    website_list = json.dumps(
+        [{"index": i, "title": t, "description": d} for i, (d, t) in enumerate(websites)],
+        ensure_ascii=False
+    )
+    message = [{
+        "role": "user",
+        "content": (
+            f"Bitte bewerte Titel und Beschreibung jeder Webseite der folgenden Liste - Verwende Formulierungen wie "
+            f"'Der Titel deiner Webseite' und 'Die Beschreibung deiner Webseite' - "
+            f"###Beginn der Liste###{website_list}###Ende der Liste###"
+        )
+    }]
+
+    completion = await client.chat.completions.create(
+        model=model,
+        messages=message,
+        tools=batch,
+        tool_choice={"type": "function", "function": {"name": "rate_websites"}}
+    )
+
+    ai_output = json.loads(completion.choices[0].message.tool_calls[0].function.arguments)
+
+    results = {}
+    for rating in ai_output.get('ratings', []):
+        try:
+            index = int(rating['index'])
+            if 0 <= index < len(websites):
+                results[index] = {
+                    "description_rating": rating['description_rating'],
+                    "description_reason": rating['description_reason'],
+                    "description_improvement": rating['description_improvement'],
+                    "title_rating": rating['title_rating'],
+                    "title_reason": rating['title_reason'],
+                    "title_improvement": rating['title_improvement']
+                }
+        except (KeyError, TypeError, ValueError):
+            continue  # malformed item, it is retried individually
+    return results
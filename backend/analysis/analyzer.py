@@ -1,14 +1,33 @@
 import datetime
 from bs4 import BeautifulSoup
-from backend.models.results import AnalyzedWebsite
+from backend.models.results import AnalyzedWebsite, AnalysisScreenshot, AnalysisSection, record_tracked_url, save_sections
+from backend.models.user import User
 from backend.analysis.fetcher import format_url, fetch_website_content
 from backend.analysis.card_builders import build_all_cards, build_serp_preview, build_overall_results
+from backend.analysis.screenshots import process_screenshot
+from backend.analysis.result_schema import compact_results
+from backend.storage.snapshots import get_snapshot_store
+from backend.config.env import ANALYSIS_STALE_AFTER_SECONDS
 import time
 from backend.analysis.text_snippet_functions import (
     get_content_length_comment, get_website_response_time_text, get_file_size_text, get_media_count_text, get_link_count_text
 )
 
-def analyze_website(user_uuid, url, db, is_premium_user, send_progress=None):
+# Sections of a complete results dict, in the order analyze_website builds them (cards are 1-8)
+RESULT_SECTIONS = ('general_results', '1', '2', '3', '4', '5', '6', '7', '8', 'serp_preview', 'overall_results')
+
+def settle_status(session, analysis_uuid, status, started):
+    """
+    Status of an analysis, with 'running' analyses started more than ANALYSIS_STALE_AFTER_SECONDS
+    ago marked 'failed': their worker was killed before analyze_website could do it.
+    """
+    if status != 'running' or started is None or (datetime.datetime.now() - started).total_seconds() <= ANALYSIS_STALE_AFTER_SECONDS:
+        return status
+    session.query(AnalyzedWebsite).filter_by(uuid=analysis_uuid, status='running').update({AnalyzedWebsite.status: 'failed'})
+    session.commit()
+    return 'failed'
+
+def analyze_website(user_uuid, url, db, is_premium_user, send_progress=None, analysis_uuid=None, on_parsed=None):
     start_time = time.time()
     
     def progress(step, message):
@@ -18,15 +37,114 @@ def analyze_website(user_uuid, url, db, is_premium_user, send_progress=None):
             pass  # do nothing if no callback is provided
 
     formatted_url = format_url(url)
+    basic_url = formatted_url.split("://")[1].lstrip("www.").rstrip("/")
 
-    if send_progress:
-        yield from progress(5, "Fetching website content...")
-    response, page_source, screenshot = fetch_website_content(formatted_url)
+    # Stored right away so the sections below can be read (and survive) while the analysis runs
+    analysis_results = AnalyzedWebsite(user_uuid=user_uuid, url=basic_url, status='running', time=datetime.datetime.now())
+    if analysis_uuid:
+        analysis_results.uuid = analysis_uuid  # chosen by the caller, e.g. as the progress channel ID
+    db.session.add(analysis_results)
+    db.session.commit()
+    analysis_uuid = analysis_results.uuid
+
+    results = {}
+    saved_sections = set()
+
+    def save_new_sections():
+        new_sections = {key: value for key, value in results.items() if str(key) not in saved_sections}
+        if new_sections:
+            compacted = compact_results(new_sections)
+            save_sections(db.session, analysis_uuid, {str(key): compacted[key] for key in new_sections})
+            db.session.commit()
+            saved_sections.update(str(key) for key in new_sections)
+
+    try:
+        if send_progress:
+            yield from progress(5, "Fetching website content...")
+        response, page_source, screenshot = fetch_website_content(formatted_url)
+
+        try:
+            snapshot_id = get_snapshot_store().save(response, page_source, screenshot)
+        except OSError as e:
+            print(f"Warning: Could not store snapshot for {formatted_url}: {e}")
+            snapshot_id = None
 
+        if send_progress:
+            yield from progress(20, "Parsing website content...")
+        soup = BeautifulSoup(page_source, 'html.parser')
+        if on_parsed:
+            on_parsed(soup, response)  # e.g. the crawler collecting links; the soup is dropped with this analysis
+
+        results['general_results'] = build_general_results(soup, formatted_url, response)
+        save_new_sections()
+
+        # Cards are added to results between the progress events, each one is stored as soon as it's there
+        for event in build_all_cards(results, soup, formatted_url, response, is_premium_user):
+            save_new_sections()
+            if send_progress:
+                yield event
+        save_new_sections()
+
+        if send_progress:
+            yield from progress(90, "Building SERP preview and calculating overall results")
+        results['serp_preview'] = build_serp_preview(soup, formatted_url, response)
+        results['overall_results'] = build_overall_results(results)
+
+        if send_progress:
+                yield from progress(100, "Analysis complete. Saving results to database.")
+
+        computation_time = f"{time.time() - start_time:.2f} Sekunden"
+
+        screenshot_record = None
+        if screenshot:
+            try:
+                screenshot_record = AnalysisScreenshot(**process_screenshot(screenshot))
+            except Exception as e:
+                print(f"Warning: Could not process screenshot for {formatted_url}: {e}")
+
+        analysis_results.results = compact_results(results)
+        analysis_results.computation_time = computation_time
+        analysis_results.time = datetime.datetime.now()
+        analysis_results.screenshot_record = screenshot_record
+        analysis_results.snapshot_id = snapshot_id
+        analysis_results.status = 'complete'
+        db.session.query(AnalysisSection).filter_by(analysis_uuid=analysis_uuid).delete()
+        if user_uuid is not None:
+            # Same transaction as the results, so the counters and URL summary the profile shows can't drift
+            db.session.flush()
+            db.session.query(User).filter_by(uuid=user_uuid).update({User.analysis_count: User.analysis_count + 1})
+            record_tracked_url(db.session, analysis_results)
+        db.session.commit()
+    except BaseException:
+        # Includes GeneratorExit when a stream client disconnects; the sections stored so far stay readable
+        db.session.rollback()
+        db.session.query(AnalyzedWebsite).filter_by(uuid=analysis_uuid).update({AnalyzedWebsite.status: 'failed'})
+        db.session.commit()
+        raise
+    
     if send_progress:
-        yield from progress(20, "Parsing website content...")
+        yield f"data: DONE|{analysis_uuid}\n\n"
+    else:
+        return analysis_uuid
+
+def analyze_snapshot(snapshot_id, url, is_premium_user):
+    """
+    Re-runs the card builders on a stored snapshot instead of fetching the page
+    with requests and Chrome again. Returns the results dict.
+    """
+    formatted_url = format_url(url)
+    response, page_source, _ = get_snapshot_store().load(snapshot_id)
     soup = BeautifulSoup(page_source, 'html.parser')
 
+    results = {}
+    results['general_results'] = build_general_results(soup, formatted_url, response)
+    for _ in build_all_cards(results, soup, formatted_url, response, is_premium_user):
+        pass
+    results['serp_preview'] = build_serp_preview(soup, formatted_url, response)
+    results['overall_results'] = build_overall_results(results)
+    return results
+
+def build_general_results(soup, formatted_url, response):
     website_response_time = response.elapsed.total_seconds()
     file_size = len(response.content)
     word_count = len(soup.get_text().split())
@@ -34,8 +152,7 @@ def analyze_website(user_uuid, url, db, is_premium_user, send_progress=None):
     internal_link_count = len([link for link in soup.find_all('a', href=True) if not link['href'].startswith('http') or (link['href'].startswith('http') and formatted_url in link['href'])])
     external_link_count = len([link for link in soup.find_all('a', href=True) if link['href'].startswith('http') and formatted_url not in link['href']])
 
-    results = {}
-    results['general_results'] = {
+    return {
         'isCard': False,
         'website_response_time': website_response_time,
         'website_response_time_text': get_website_response_time_text(website_response_time),
@@ -48,36 +165,3 @@ def analyze_website(user_uuid, url, db, is_premium_user, send_progress=None):
         'link_count': f"{internal_link_count} Intern / {external_link_count} Extern",
         'link_count_text': get_link_count_text(internal_link_count, external_link_count),
     }
-
-    if send_progress:
-        yield from build_all_cards(results, soup, formatted_url, response, is_premium_user)
-    else:
-        # Fallback: collect all yields to exhaust the generator
-        for _ in build_all_cards(results, soup, formatted_url, response, is_premium_user):
-            pass
-    if send_progress:
-        yield from progress(90, "Building SERP preview and calculating overall results")
-    results['serp_preview'] = build_serp_preview(soup, formatted_url, response)
-    results['overall_results'] = build_overall_results(results)
-
-    if send_progress:
-            yield from progress(100, "Analysis complete. Saving results to database.")
-
-    computation_time = f"{time.time() - start_time:.2f} Sekunden"
-
-    basic_url = formatted_url.split("://")[1].lstrip("www.").rstrip("/")
-    analysis_results = AnalyzedWebsite(
-        user_uuid=user_uuid,
-        url=basic_url,
-        results=results,
-        computation_time=computation_time,
-        time=datetime.datetime.now(),
-        screenshot=screenshot
-    )
-    db.session.add(analysis_results)
-    db.session.commit()
-    
-    if send_progress:
-        yield f"data: DONE|{analysis_results.uuid}\n\n"
-    else:
-        return analysis_results.uuid
\ No newline at end of file
@@ -0,0 +1,203 @@
+import datetime
+import threading
+import time
+import uuid as uuid_lib
+from collections import OrderedDict, deque
+from urllib.parse import urlparse
+
+from backend.config.env import BATCH_WORKERS, BATCH_PER_HOST_CONCURRENCY, BATCH_HOST_DELAY_SECONDS, CHROME_MAX_PAGES_PER_DRIVER
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.models.results import AnalysisBatch, AnalysisBatchItem
+from backend.analysis.analyzer import analyze_website
+from backend.analysis.shared_resources import SharedResources, sharing
+
+STALE_AFTER_SECONDS = 300  # a batch with unfinished items and no heartbeat for this long lost its scheduler
+HEARTBEAT_SECONDS = 60
+
+class _Batch:
+    __slots__ = ('uuid', 'user_uuid', 'is_premium_user', 'pending', 'running', 'resources')
+
+    def __init__(self, batch_uuid, user_uuid, is_premium_user, urls, max_drivers):
+        self.uuid = batch_uuid
+        self.user_uuid = user_uuid
+        self.is_premium_user = is_premium_user
+        self.pending = deque((position, url, urlparse(url).hostname) for position, url in urls)
+        self.running = 0
+        self.resources = SharedResources(max_idle_drivers=max_drivers, max_pages_per_driver=CHROME_MAX_PAGES_PER_DRIVER)
+
+class BatchScheduler:
+    """
+    Runs the analyses of submitted batches on a fixed number of worker threads
+    (greenlets under the gevent worker), so a batch finishes in about
+    urls / workers analysis times as long as its hosts differ.
+
+    Politeness: at most per_host analyses of one host run at once, across all
+    batches, and a host rests host_delay seconds after each analysis before the
+    next one starts. Workers take the next URL round-robin across batches, so a
+    large batch doesn't hold up smaller ones. The analyses of a batch share one
+    SharedResources (robots.txt, sitemap checks, PageSpeed results, Chrome).
+
+    The queue lives in this process. While it holds a batch, the batch's updated_at
+    is refreshed every HEARTBEAT_SECONDS; requeue_if_interrupted picks up batches
+    whose process exited with items left.
+    """
+
+    def __init__(self, app, db, workers=BATCH_WORKERS, per_host=BATCH_PER_HOST_CONCURRENCY, host_delay=BATCH_HOST_DELAY_SECONDS):
+        self.app = app
+        self.db = db
+        self.workers = workers
+        self.per_host = per_host
+        self.host_delay = host_delay
+        self._batches = OrderedDict()  # batch UUID -> _Batch, the least recently served first
+        self._running_per_host = {}
+        self._host_ready_at = {}  # host -> monotonic time its rest ends
+        self._condition = threading.Condition()
+        self._threads = []
+        self._heartbeat_thread = None
+
+    def submit(self, batch_uuid, user_uuid, is_premium_user, urls):
+        """Queues the (position, url) pairs of a stored AnalysisBatch."""
+        batch = _Batch(batch_uuid, user_uuid, is_premium_user, urls, max_drivers=self.workers)
+        with self._condition:
+            self._batches[batch_uuid] = batch
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f"batch-worker-{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            if self._heartbeat_thread is None:
+                self._heartbeat_thread = threading.Thread(target=self._heartbeat, name="batch-heartbeat", daemon=True)
+                self._heartbeat_thread.start()
+            self._condition.notify_all()
+
+    def holds(self, batch_uuid) -> bool:
+        with self._condition:
+            return batch_uuid in self._batches
+
+    def _heartbeat(self):
+        """Refreshes updated_at of the batches this process holds, also of those waiting for a worker or a resting host."""
+        with self.app.app_context():
+            session = self.db.session
+            while True:
+                time.sleep(HEARTBEAT_SECONDS)
+                with self._condition:
+                    batch_uuids = list(self._batches)
+                if not batch_uuids:
+                    continue
+                try:
+                    session.query(AnalysisBatch).filter(AnalysisBatch.uuid.in_(batch_uuids)).update(
+                        {'updated_at': datetime.datetime.now()}, synchronize_session=False)
+                    session.commit()
+                except SQLAlchemyError as e:
+                    session.rollback()
+                    print(f"Warning: Could not refresh batches: {e}")
+                finally:
+                    session.remove()
+
+    def _next_job(self, now):
+        """Returns (job, None), or (None, seconds until a resting host is ready; None if nothing can become ready)."""
+        wait = None
+        for batch in self._batches.values():
+            for index, (position, url, host) in enumerate(batch.pending):
+                if self._running_per_host.get(host, 0) >= self.per_host:
+                    continue
+                ready_at = self._host_ready_at.get(host, 0)
+                if ready_at > now:
+                    wait = ready_at - now if wait is None else min(wait, ready_at - now)
+                    continue
+                del batch.pending[index]
+                self._batches.move_to_end(batch.uuid)
+                return (batch, position, url, host), None
+        return None, wait
+
+    def _work(self):
+        while True:
+            with self._condition:
+                job, wait = self._next_job(time.monotonic())
+                while job is None:
+                    self._condition.wait(wait)
+                    job, wait = self._next_job(time.monotonic())
+                batch, position, url, host = job
+                batch.running += 1
+                self._running_per_host[host] = self._running_per_host.get(host, 0) + 1
+
+            try:
+                self._analyze(batch, position, url)
+            except Exception as e:
+                print(f"Warning: Could not record batch {batch.uuid} item {position}: {e}")
+            finally:
+                finished = False
+                with self._condition:
+                    batch.running -= 1
+                    self._running_per_host[host] -= 1
+                    if not self._running_per_host[host]:
+                        del self._running_per_host[host]
+                    now = time.monotonic()
+                    self._host_ready_at = {key: ready_at for key, ready_at in self._host_ready_at.items() if ready_at > now}
+                    self._host_ready_at[host] = now + self.host_delay
+                    if not batch.pending and not batch.running:
+                        del self._batches[batch.uuid]
+                        finished = True
+                    self._condition.notify_all()
+                if finished:
+                    batch.resources.close()
+
+    def _analyze(self, batch, position, url):
+        analysis_uuid = str(uuid_lib.uuid4())
+        with self.app.app_context():
+            session = self.db.session
+            try:
+                self._update_item(batch.uuid, position, status='running', analysis_uuid=analysis_uuid)
+                with sharing(batch.resources):
+                    for _ in analyze_website(batch.user_uuid, url, self.db, batch.is_premium_user, analysis_uuid=analysis_uuid):
+                        pass
+                self._update_item(batch.uuid, position, status='complete')
+            except Exception as e:
+                print(f"Warning: Batch {batch.uuid} analysis of {url} failed: {e}")
+                session.rollback()
+                self._update_item(batch.uuid, position, status='failed', error=str(e))
+            finally:
+                session.remove()
+
+    def _update_item(self, batch_uuid, position, **values):
+        self.db.session.query(AnalysisBatchItem).filter_by(batch_uuid=batch_uuid, position=position).update(values)
+        self.db.session.query(AnalysisBatch).filter_by(uuid=batch_uuid).update({'updated_at': datetime.datetime.now()})
+        self.db.session.commit()
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_batch_scheduler(app, db) -> BatchScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = BatchScheduler(app, db)
+        return _scheduler
+
+def requeue_if_interrupted(app, db, batch: AnalysisBatch, is_premium_user) -> bool:
+    """
+    Queues the unfinished items of a batch in this process's scheduler again if the process
+    that held it exited: no heartbeat for STALE_AFTER_SECONDS. Items it was analyzing start
+    over. The batch is claimed with a conditional update, so only one request (on any host)
+    takes it over. Returns True if the batch was requeued.
+    """
+    now = datetime.datetime.now()
+    if batch.updated_at and (now - batch.updated_at).total_seconds() <= STALE_AFTER_SECONDS:
+        return False
+    scheduler = get_batch_scheduler(app, db)
+    session = db.session
+    unfinished = session.query(AnalysisBatchItem).filter(AnalysisBatchItem.batch_uuid == batch.uuid,
+                                                         AnalysisBatchItem.status.in_(('queued', 'running'))).count()
+    if not unfinished or scheduler.holds(batch.uuid):
+        return False
+    seen = AnalysisBatch.updated_at == batch.updated_at if batch.updated_at else AnalysisBatch.updated_at.is_(None)
+    claimed = session.query(AnalysisBatch).filter(AnalysisBatch.uuid == batch.uuid, seen).update({'updated_at': now}, synchronize_session=False)
+    if not claimed:
+        session.rollback()
+        return False
+    session.query(AnalysisBatchItem).filter_by(batch_uuid=batch.uuid, status='running').update({'status': 'queued', 'analysis_uuid': None})
+    items = (session.query(AnalysisBatchItem.position, AnalysisBatchItem.url)
+             .filter_by(batch_uuid=batch.uuid, status='queued').order_by(AnalysisBatchItem.position).all())
+    session.commit()
+    scheduler.submit(batch.uuid, batch.user_uuid, is_premium_user, [(position, url) for position, url in items])
+    return True
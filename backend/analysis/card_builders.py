@@ -3,7 +3,6 @@
 # ############################################################################ #
 
 # Standard Library Imports
-import asyncio
 import json
 import socket
 import re
@@ -19,13 +18,17 @@ from langdetect import detect_langs, DetectorFactory, LangDetectException
 #       English text is generated inline in this file.
 from backend.models.results import Card, Category
 from backend.models.calc import Calc
-from backend.analysis.ai_analyzer import ai_analyzer # Assuming ai_analyzer is an async function
+from backend.analysis.ai_analyzer import get_ai_service
+from backend.analysis.circuit_breaker import get_circuit_breaker, CircuitOpenError
+from backend.analysis.geoip import get_geoip_database
+from backend.analysis.dns_resolver import get_dns_resolver, get_http_session, resolve_ip
+from backend.analysis.shared_resources import shared_fetch
 
 # ############################################################################ #
 #                              ENVIRONMENT SETUP                               #
 # ############################################################################ #
 
-from backend.config.env import GOOGLE_PAGESPEED_API_KEY
+from backend.config.env import GOOGLE_PAGESPEED_API_KEY, AI_REQUEST_TIMEOUT_SECONDS
 
 # ############################################################################ #
 #                                 CONSTANTS                                    #
@@ -82,6 +85,11 @@ HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
 GOOGLE_PAGESPEED_API_URL = 'https://www.googleapis.com/pagespeedonline/v5/runPagespeed'
 IP_API_URL_TEMPLATE = "http://ip-api.com/json/{ip}"
 
+# --- Circuit Breakers (fail fast while an external service is degraded) ---
+PAGESPEED_BREAKER = get_circuit_breaker('pagespeed', slow_call_seconds=40)
+IP_API_BREAKER = get_circuit_breaker('ip-api', slow_call_seconds=3)
+OPENAI_BREAKER = get_circuit_breaker('openai', slow_call_seconds=25)
+
 # ############################################################################ #
 #                             MAIN ORCHESTRATOR                              #
 # ############################################################################ #
@@ -101,17 +109,20 @@ def build_all_cards(results: dict, soup: BeautifulSoup, url: str, response: requ
     pagespeed_data = None
     lighthouse_metrics = None
     stack_packs = None
+    pagespeed_unavailable = False
 
     # Fetch PageSpeed data once if premium (needed for Performance, Technical, Accessibility)
     if is_premium_user:
         yield "data: 25|Computing Lighthouse metrics (approx. 30sec)...\n\n"
         try:
-            pagespeed_data = fetch_pagespeed_data(url)
+            pagespeed_data = shared_fetch(('pagespeed', url), PAGESPEED_BREAKER.call, fetch_pagespeed_data, url)
             if pagespeed_data:
                 lighthouse_metrics = pagespeed_data.get("lighthouseResult", {}).get("audits", {})
                 stack_packs = pagespeed_data.get("lighthouseResult", {}).get("stackPacks", [])
         except Exception as e:
-            raise RuntimeError(f"Error fetching PageSpeed data: {e}")
+            # Degrade to the cards without Lighthouse data instead of failing the whole analysis
+            print(f"Warning: PageSpeed data unavailable for {url}: {e}")
+            pagespeed_unavailable = True
     else:
         yield "data: 25|Computing Lighthouse metrics...\n\n"
             
@@ -126,7 +137,9 @@ def build_all_cards(results: dict, soup: BeautifulSoup, url: str, response: requ
 
     yield "data: 55|Analyzing Core Web Vitals...\n\n"
     # --- Performance Card (Premium) ---
-    if is_premium_user:
+    if is_premium_user and pagespeed_unavailable:
+        build_service_unavailable_card('Performance', 'Google PageSpeed Insights').add_to_results(results, manual_points=100, index=6)
+    elif is_premium_user:
         performance_card = build_performance_card(url, soup, response, pagespeed_data, lighthouse_metrics) # Pass metrics
         performance_card.add_to_results(results, index=6)
     else:
@@ -142,7 +155,9 @@ def build_all_cards(results: dict, soup: BeautifulSoup, url: str, response: requ
 
     yield "data: 75|Conducting AI Analysis...\n\n"
     # --- AI Analysis Card (Premium) ---
-    if is_premium_user:
+    if is_premium_user and not OPENAI_BREAKER.available():
+        build_service_unavailable_card('AI Analysis', 'OpenAI').add_to_results(results, manual_points=100, index=8)
+    elif is_premium_user:
         build_ai_card(soup).add_to_results(results, index=8)
     else:
         build_not_available_card(
@@ -168,7 +183,7 @@ def fetch_pagespeed_data(url: str) -> dict | None:
         "category": ["performance", "accessibility", "best-practices", "seo"] # Fetch relevant categories
     }
     try:
-        response = requests.get(GOOGLE_PAGESPEED_API_URL, params=params, timeout=45)
+        response = get_http_session().get(GOOGLE_PAGESPEED_API_URL, params=params, timeout=45)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -178,6 +193,23 @@ def fetch_pagespeed_data(url: str) -> dict | None:
         print(f"Unexpected error processing PageSpeed data: {e}")
         raise RuntimeError(f"PageSpeed processing failed: {e}") from e
 
+def lookup_server_location(ip: str) -> dict:
+    """Looks up the location of an IP in the local GeoIP database, or via ip-api.com if none is installed."""
+    geoip_database = get_geoip_database()
+    if geoip_database is None:
+        return IP_API_BREAKER.call(fetch_ip_location, ip)
+    location = geoip_database.lookup(ip)
+    if location is None:
+        return {}
+    country, city = location
+    return {'country': country or 'Unknown', 'city': city}
+
+def fetch_ip_location(ip: str) -> dict:
+    """Fetches the estimated location of an IP address from ip-api.com."""
+    ip_api_response = get_http_session().get(IP_API_URL_TEMPLATE.format(ip=ip), timeout=5)
+    ip_api_response.raise_for_status()
+    return ip_api_response.json()
+
 # ############################################################################ #
 #                        AUDIT HELPER FUNCTIONS                              #
 # ############################################################################ #
@@ -323,17 +355,16 @@ def build_meta_social_card(soup: BeautifulSoup, url: str) -> Card:
     server_location = 'Unknown'
     try:
         domain = parsed_url.netloc.split(':')[0]
-        ip = socket.gethostbyname(domain)
-        ip_api_response = requests.get(IP_API_URL_TEMPLATE.format(ip=ip), timeout=5)
-        ip_api_response.raise_for_status()
-        location_data = ip_api_response.json()
+        ip = resolve_ip(domain)
+        location_data = lookup_server_location(ip)
         country = location_data.get('country', 'Unknown')
         city = location_data.get('city', '')
         server_location = f"{city}, {country}" if city and country != 'Unknown' else country
     except socket.gaierror: server_location = 'Domain not resolvable'
+    except CircuitOpenError: server_location = 'Location service temporarily unavailable'
     except requests.exceptions.RequestException: server_location = 'Location API unreachable'
     except Exception: server_location = 'Error during location lookup'
-    finally: language_category.add_content(server_location not in ['Unknown', 'Error during location lookup', 'Domain not resolvable', 'Location API unreachable'], f'Server Location (estimated): {server_location}')
+    finally: language_category.add_content(server_location not in ['Unknown', 'Error during location lookup', 'Domain not resolvable', 'Location API unreachable', 'Location service temporarily unavailable'], f'Server Location (estimated): {server_location}')
     card.add_category(language_category)
 
     # --- Essential Meta Tags (Charset only now) ---
@@ -947,7 +978,7 @@ def build_technical_config_card(url: str, response: requests.Response, lighthous
             www_check_message = "Could not verify WWW/Non-WWW consistency."
             if opposite_url:
                 try:
-                    response_opposite = requests.get(opposite_url, timeout=10, allow_redirects=True)
+                    response_opposite = get_http_session().get(opposite_url, timeout=10, allow_redirects=True)
                     if response_opposite.url == final_url:
                          redirecting_www_correctly = True
                          www_check_message = f"The {'non-WWW' if base_domain.startswith('www.') else 'WWW'} version correctly redirects."
@@ -960,6 +991,17 @@ def build_technical_config_card(url: str, response: requests.Response, lighthous
         except Exception as e: redirects_category.add_content(False, f"Error during WWW/Non-WWW check setup: {e}")
     card.add_category(redirects_category)
 
+    # --- DNS & IPv6 ---
+    dns_category = Category('DNS & IPv6')
+    try:
+        addresses = get_dns_resolver().resolve(parsed_url.hostname or base_domain)
+        dns_category.add_content("", f"IPv4 addresses (A records): {', '.join(addresses.ipv4) if addresses.ipv4 else 'None'}")
+        dns_category.add_content("", f"IPv6 addresses (AAAA records): {', '.join(addresses.ipv6)}" if addresses.has_ipv6
+            else "No IPv6 (AAAA) records found. The site is not reachable from IPv6-only networks.")
+    except socket.gaierror as e:
+        dns_category.add_content("", f"Domain could not be resolved: {e}")  # informational like the records, not scored
+    card.add_category(dns_category)
+
     # --- Robots.txt & Sitemap ---
     # (This section remains the same)
     robots_category = Category('Robots.txt & Sitemap')
@@ -968,7 +1010,7 @@ def build_technical_config_card(url: str, response: requests.Response, lighthous
     sitemap_in_robots = None
     robots_status = "Not Checked"
     try:
-        response_robots = requests.get(robots_url, timeout=10, allow_redirects=False)
+        response_robots = shared_fetch(('get', robots_url), get_http_session().get, robots_url, timeout=10, allow_redirects=False)
         if response_robots.status_code == 200:
             robots_found = True; robots_status = "Found and accessible."
             robots_content = response_robots.text
@@ -983,7 +1025,7 @@ def build_technical_config_card(url: str, response: requests.Response, lighthous
     if sitemap_in_robots:
         sitemap_url_checked = sitemap_in_robots
         try:
-            response_sitemap = requests.head(sitemap_url_checked, timeout=10, allow_redirects=True)
+            response_sitemap = shared_fetch(('head', sitemap_url_checked), get_http_session().head, sitemap_url_checked, timeout=10, allow_redirects=True)
             if response_sitemap.status_code == 200: sitemap_found = True; sitemap_status = f"Declared in robots.txt and accessible."
             else: sitemap_status = f"Declared in robots.txt ({sitemap_url_checked}) but not reachable (Status: {response_sitemap.status_code})."
         except requests.exceptions.RequestException: sitemap_status = f"Declared in robots.txt ({sitemap_url_checked}) but connection error."
@@ -995,7 +1037,7 @@ def build_technical_config_card(url: str, response: requests.Response, lighthous
         for path in common_sitemap_paths:
             sitemap_url = f"{parsed_url.scheme}://{base_domain}{path}"
             try:
-                response_sitemap = requests.head(sitemap_url, timeout=10, allow_redirects=True)
+                response_sitemap = shared_fetch(('head', sitemap_url), get_http_session().head, sitemap_url, timeout=10, allow_redirects=True)
                 if response_sitemap.status_code == 200: sitemap_found = True; sitemap_url_checked = sitemap_url; sitemap_status = f"Found at: {sitemap_url_checked}"; break
             except requests.exceptions.RequestException: continue
             except Exception as e: sitemap_status = f"Error checking {sitemap_url}: {e}"; break
@@ -1108,9 +1150,7 @@ def build_ai_card(soup: BeautifulSoup) -> Card:
     if not title_text and not description_content:
         error_category = Category("Missing Data"); error_category.add_content(False, "No title or description found for AI analysis."); card.add_category(error_category); return card
     try:
-        ai_results = ai_results = asyncio.run(
-            ai_analyzer(description_content, title_text)
-        )
+        ai_results = OPENAI_BREAKER.call(get_ai_service().rate, description_content, title_text, timeout=AI_REQUEST_TIMEOUT_SECONDS)
         if description_content:
             ai_desc_category = Category('AI Analysis: Description')
             ai_desc_category.add_content("", f'Original Description: "{description_content}"')
@@ -1146,6 +1186,14 @@ def build_not_available_card(title: str, category_title: str, message: str) -> C
     card.add_category(category)
     return card
 
+def build_service_unavailable_card(title: str, service_name: str) -> Card:
+    """ Creates a placeholder Card for a section whose external service is currently failing. """
+    return build_not_available_card(
+        title=title,
+        category_title=f'{title} Temporarily Unavailable',
+        message=f'{service_name} is temporarily unavailable, so this section was skipped. Please run the analysis again later.'
+    )
+
 def build_serp_preview(soup: BeautifulSoup, url: str, response: requests.Response) -> dict:
     """ Generates data for a Search Engine Results Page (SERP) preview. (Translated) """
     title = soup.title.string.strip() if soup.title and soup.title.string else "No title found"
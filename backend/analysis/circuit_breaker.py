@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose circuit is open."""
+
+    def __init__(self, name):
+        super().__init__(f"Service '{name}' is temporarily unavailable (circuit open).")
+        self.name = name
+
+class CircuitBreaker:
+    """
+    Tracks the calls to one external service over a rolling time window.
+
+    A call counts as failed if it raises or takes longer than slow_call_seconds.
+    Once at least min_calls were made in the window and the failure rate reaches
+    failure_rate_threshold, the circuit opens and calls fail fast with
+    CircuitOpenError. After open_seconds one probe call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, name, failure_rate_threshold=0.5, slow_call_seconds=10.0, window_seconds=60.0, min_calls=5, open_seconds=30.0):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._calls = deque()  # (finished_at, failed, duration)
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """False while the circuit is open and not yet due for a probe. Does not change the state."""
+        with self._lock:
+            if self._state == OPEN:
+                return time.monotonic() - self._opened_at >= self.open_seconds
+            if self._state == HALF_OPEN:
+                return not self._probe_in_flight
+            return True
+
+    def call(self, func, *args, **kwargs):
+        self._before_call()
+        started = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self._record(failed=True, duration=time.monotonic() - started)
+            raise
+        duration = time.monotonic() - started
+        self._record(failed=duration > self.slow_call_seconds, duration=duration)
+        return result
+
+    def _before_call(self):
+        with self._lock:
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    raise CircuitOpenError(self.name)
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError(self.name)
+                self._probe_in_flight = True
+
+    def _record(self, failed, duration):
+        with self._lock:
+            now = time.monotonic()
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                self._calls.clear()
+                if failed:
+                    self._open(now)
+                else:
+                    self._state = CLOSED
+                    self._calls.append((now, failed, duration))
+                return
+
+            self._calls.append((now, failed, duration))
+            self._trim(now)
+            if self._state == CLOSED and len(self._calls) >= self.min_calls and self._failure_rate() >= self.failure_rate_threshold:
+                self._open(now)
+
+    def _open(self, now):
+        self._state = OPEN
+        self._opened_at = now
+        print(f"Warning: Circuit for '{self.name}' opened, failing fast for {self.open_seconds:.0f}s.")
+
+    def _trim(self, now):
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _failure_rate(self):
+        return sum(1 for _, failed, _ in self._calls if failed) / len(self._calls) if self._calls else 0.0
+
+    def state(self) -> dict:
+        with self._lock:
+            self._trim(time.monotonic())
+            durations = [duration for _, _, duration in self._calls]
+            return {
+                'state': self._state,
+                'calls': len(self._calls),
+                'failure_rate': round(self._failure_rate(), 3),
+                'avg_latency_ms': round(sum(durations) / len(durations) * 1000) if durations else None,
+                'max_latency_ms': round(max(durations) * 1000) if durations else None,
+                'retry_in_seconds': round(max(0.0, self.open_seconds - (time.monotonic() - self._opened_at)), 1) if self._state == OPEN else None,
+            }
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(name, **kwargs) -> CircuitBreaker:
+    """Returns the process-wide breaker for a service, creating it with kwargs on first use."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **kwargs)
+        return _breakers[name]
+
+def circuit_breaker_states() -> dict:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.state() for breaker in breakers}
@@ -0,0 +1,372 @@
+import datetime
+import threading
+import time
+import uuid as uuid_lib
+from collections import Counter
+from urllib.parse import urljoin, urlparse, urlunparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import load_only
+
+from backend.config.env import CRAWL_CONCURRENCY, CRAWL_DELAY_SECONDS, CHROME_MAX_PAGES_PER_DRIVER
+from backend.models.results import AnalyzedWebsite, SiteCrawl, CrawlPage
+from backend.analysis.analyzer import analyze_website
+from backend.analysis.fetcher import format_url
+from backend.analysis.dns_resolver import get_http_session
+from backend.analysis.result_schema import compact_results
+from backend.analysis.shared_resources import SharedResources, sharing, shared_fetch
+from backend.analysis.sitemaps import SitemapReader
+
+ROBOTS_USER_AGENT = 'QuarkSEO'
+# Links to these can't be analyzed as pages
+SKIPPED_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.css', '.js', '.xml', '.json',
+                      '.zip', '.gz', '.mp3', '.mp4', '.webm', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx')
+STALE_AFTER_SECONDS = 300  # a 'running' crawl without progress for this long is considered interrupted
+HEARTBEAT_SECONDS = 60  # how often a running crawl refreshes updated_at, well within STALE_AFTER_SECONDS
+ENQUEUE_CHUNK_SIZE = 500
+
+def normalize_crawl_url(href: str, base_url: str, host: str) -> str | None:
+    """
+    Absolute format_url form of a link if it is a page on the crawled host, else None.
+    Fragments and query strings are dropped, so URL variants are crawled once.
+    """
+    try:
+        parsed = urlparse(urljoin(base_url, href.strip()))
+    except ValueError:
+        return None
+    if parsed.scheme not in ('http', 'https') or parsed.path.lower().endswith(SKIPPED_EXTENSIONS):
+        return None
+    url = format_url(urlunparse((parsed.scheme, parsed.netloc.lower(), parsed.path or '/', '', '', '')))
+    return url if urlparse(url).hostname == host else None
+
+def extract_internal_links(soup, base_url: str, host: str) -> set:
+    """Normalized URLs of the followable internal links (no rel=nofollow) of a parsed page."""
+    links = set()
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        if not href or href.startswith(('#', 'mailto:', 'tel:', 'javascript:')) or 'nofollow' in (link.get('rel') or []):
+            continue
+        url = normalize_crawl_url(href, base_url, host)
+        if url:
+            links.add(url)
+    return links
+
+def load_robots(root_url: str) -> RobotFileParser:
+    """
+    Parsed robots.txt of the site, with urllib.robotparser's rules for missing files:
+    401/403 disallow everything, other client errors allow everything. If robots.txt
+    can't be fetched at all, everything is allowed.
+    """
+    robots_url = urljoin(root_url, '/robots.txt')
+    robots = RobotFileParser(robots_url)
+    try:
+        response = shared_fetch(('robots.txt', robots_url), get_http_session().get, robots_url, timeout=10)
+    except requests.exceptions.RequestException as e:
+        print(f"Warning: Could not fetch {robots_url}, crawling without robots.txt rules: {e}")
+        robots.allow_all = True
+        return robots
+    if response.status_code in (401, 403):
+        robots.disallow_all = True
+    elif response.status_code >= 400:
+        robots.allow_all = True
+    else:
+        robots.parse(response.text.splitlines())
+    return robots
+
+class SiteCrawler:
+    """
+    Breadth-first crawl of one site: the root URL and the sitemap entries are depth 0,
+    the internal links of a page at depth d are queued at d + 1 up to max_depth, and
+    at most max_pages pages are analyzed. Every page is a regular analysis. URLs
+    robots.txt disallows are recorded as well, but also at most max_pages of them.
+
+    The frontier lives in the crawl_pages table and pages are claimed from it in
+    (depth, position) order, so a crawl can be resumed after the process stopped.
+    Only URL strings are kept in memory (for deduplication); a page's soup is dropped
+    with its analysis. Up to `workers` pages are analyzed at once, and page starts are
+    spaced by CRAWL_DELAY_SECONDS or the robots.txt Crawl-delay, whichever is higher.
+    """
+
+    def __init__(self, app, db, crawl_uuid, workers=CRAWL_CONCURRENCY):
+        self.app = app
+        self.db = db
+        self.crawl_uuid = crawl_uuid
+        self.workers = workers
+        self.resources = SharedResources(max_idle_drivers=workers, max_pages_per_driver=CHROME_MAX_PAGES_PER_DRIVER)
+        self._condition = threading.Condition()
+        self._running = 0
+        self._next_start = 0.0
+        self._seen = set()
+        self._page_count = 0  # frontier rows that count towards max_pages, i.e. not 'disallowed'
+        self._disallowed_count = 0
+        self._next_position = 0
+
+    def run(self):
+        stop_heartbeat = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(stop_heartbeat,), name=f"crawl-heartbeat-{self.crawl_uuid}", daemon=True).start()
+        try:
+            with self.app.app_context():
+                self._prepare()
+            threads = [threading.Thread(target=self._work, name=f"crawl-worker-{i}", daemon=True) for i in range(self.workers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            with self.app.app_context():
+                session = self.db.session
+                unfinished = session.query(CrawlPage).filter(CrawlPage.crawl_uuid == self.crawl_uuid, CrawlPage.status.in_(('queued', 'running'))).count()
+                if unfinished:
+                    raise RuntimeError(f"The crawl workers stopped with {unfinished} pages left")
+                report = build_site_report(session, self.crawl_uuid)
+                session.query(SiteCrawl).filter_by(uuid=self.crawl_uuid).update({'status': 'complete', 'report': report})
+                session.commit()
+        except Exception as e:
+            print(f"Warning: Crawl {self.crawl_uuid} failed: {e}")
+            with self.app.app_context():
+                self.db.session.rollback()
+                self.db.session.query(SiteCrawl).filter_by(uuid=self.crawl_uuid).update({'status': 'failed'})
+                self.db.session.commit()
+        finally:
+            stop_heartbeat.set()
+            self.resources.close()
+
+    def _heartbeat(self, stop):
+        """
+        Refreshes updated_at every HEARTBEAT_SECONDS while the crawl runs, including while
+        it reads sitemaps or analyzes slow pages, so only a stopped crawl becomes stale.
+        """
+        with self.app.app_context():
+            session = self.db.session
+            try:
+                while not stop.wait(HEARTBEAT_SECONDS):
+                    try:
+                        session.query(SiteCrawl).filter_by(uuid=self.crawl_uuid, status='running').update({'updated_at': datetime.datetime.now()})
+                        session.commit()
+                    except SQLAlchemyError as e:
+                        session.rollback()
+                        print(f"Warning: Could not refresh crawl {self.crawl_uuid}: {e}")
+            finally:
+                session.remove()
+
+    def _prepare(self):
+        session = self.db.session
+        crawl = session.get(SiteCrawl, self.crawl_uuid)
+        self.user_uuid = crawl.user_uuid
+        self.is_premium_user = crawl.is_premium_user
+        self.max_depth = crawl.max_depth
+        self.max_pages = crawl.max_pages
+        self.host = urlparse(crawl.root_url).hostname
+        crawl.status = 'running'
+        crawl.updated_at = datetime.datetime.now()
+        # Pages a previous run was working on when it stopped are analyzed again
+        session.query(CrawlPage).filter_by(crawl_uuid=self.crawl_uuid, status='running').update({'status': 'queued'})
+        session.commit()
+
+        with sharing(self.resources):
+            self.robots = load_robots(crawl.root_url)
+        self.delay = max(CRAWL_DELAY_SECONDS, float(self.robots.crawl_delay(ROBOTS_USER_AGENT) or 0))
+
+        rows = session.query(CrawlPage.url, CrawlPage.status, CrawlPage.position).filter_by(crawl_uuid=self.crawl_uuid).yield_per(1000)
+        for url, status, position in rows:
+            self._seen.add(url)
+            self._page_count += status != 'disallowed'
+            self._disallowed_count += status == 'disallowed'
+            self._next_position = max(self._next_position, position + 1)
+        if not self._seen:
+            self._enqueue(session, [crawl.root_url], depth=0)
+            self._seed_from_sitemaps(session, crawl.root_url)
+        session.commit()
+
+    def _seed_from_sitemaps(self, session, root_url):
+        """Queues the sitemap entries of the site at depth 0, streaming them until max_pages is reached."""
+        sitemaps = self.robots.site_maps() or [urljoin(root_url, '/sitemap.xml')]
+        lastmods = {}
+        root_in_sitemap = False
+        for entry in SitemapReader().entries(sitemaps):
+            url = normalize_crawl_url(entry.loc, root_url, self.host)
+            if url == root_url:
+                root_in_sitemap = True
+            elif url:
+                lastmods[url] = entry.lastmod
+            if len(lastmods) >= ENQUEUE_CHUNK_SIZE:
+                self._enqueue(session, list(lastmods), depth=0, lastmods=lastmods)
+                lastmods = {}
+                if self._page_count >= self.max_pages:
+                    break
+        self._enqueue(session, list(lastmods), depth=0, lastmods=lastmods)
+        if root_in_sitemap:
+            session.query(CrawlPage).filter_by(crawl_uuid=self.crawl_uuid, url=root_url).update({'in_sitemap': True})
+
+    def _enqueue(self, session, urls, depth, lastmods=None):
+        """
+        Adds the URLs not seen yet to the frontier, as long as max_pages isn't reached
+        (counted separately for allowed and disallowed URLs, so links into a large
+        disallowed area can't grow the frontier without bound).
+        lastmods (url -> datetime or None) marks the URLs as listed in the sitemap.
+        Runs in the caller's transaction.
+        """
+        rows = []
+        with self._condition:
+            for url in urls:
+                if url in self._seen:
+                    continue
+                allowed = self.robots.can_fetch(ROBOTS_USER_AGENT, url)
+                if (self._page_count if allowed else self._disallowed_count) >= self.max_pages:
+                    continue
+                self._seen.add(url)
+                self._page_count += allowed
+                self._disallowed_count += not allowed
+                rows.append({'crawl_uuid': self.crawl_uuid, 'url': url, 'position': self._next_position, 'depth': depth,
+                             'status': 'queued' if allowed else 'disallowed', 'in_sitemap': lastmods is not None,
+                             'lastmod': lastmods.get(url) if lastmods else None})
+                self._next_position += 1
+        if rows:
+            session.execute(CrawlPage.__table__.insert(), rows)
+
+    def _claim(self, session):
+        """Marks the next queued page as running and returns (url, depth, analysis_uuid), or None once the crawl is done."""
+        with self._condition:
+            while True:
+                page = (session.query(CrawlPage.url, CrawlPage.depth)
+                        .filter_by(crawl_uuid=self.crawl_uuid, status='queued')
+                        .order_by(CrawlPage.depth, CrawlPage.position).first())
+                if page is None:
+                    session.rollback()  # end the read transaction, the other workers commit new pages
+                    if not self._running:
+                        return None
+                    self._condition.wait()
+                    continue
+                wait = self._next_start - time.monotonic()
+                if wait > 0:
+                    session.rollback()
+                    self._condition.wait(wait)
+                    continue
+                analysis_uuid = str(uuid_lib.uuid4())
+                session.query(CrawlPage).filter_by(crawl_uuid=self.crawl_uuid, url=page.url).update(
+                    {'status': 'running', 'analysis_uuid': analysis_uuid})
+                session.commit()
+                self._running += 1
+                self._next_start = time.monotonic() + self.delay
+                return page.url, page.depth, analysis_uuid
+
+    def _work(self):
+        with self.app.app_context():
+            session = self.db.session
+            try:
+                while True:
+                    claimed = self._claim(session)
+                    if claimed is None:
+                        return
+                    try:
+                        self._crawl_page(session, *claimed)
+                    finally:
+                        with self._condition:
+                            self._running -= 1
+                            self._condition.notify_all()
+            finally:
+                session.remove()
+
+    def _crawl_page(self, session, url, depth, analysis_uuid):
+        links = set()
+
+        def collect_links(soup, response):
+            if depth < self.max_depth:
+                links.update(extract_internal_links(soup, response.url, self.host))
+
+        values = {'status': 'complete'}
+        try:
+            with sharing(self.resources):
+                for _ in analyze_website(self.user_uuid, url, self.db, self.is_premium_user,
+                                         analysis_uuid=analysis_uuid, on_parsed=collect_links):
+                    pass
+        except Exception as e:
+            print(f"Warning: Crawl {self.crawl_uuid} analysis of {url} failed: {e}")
+            session.rollback()
+            values = {'status': 'failed', 'error': str(e)}
+
+        links = sorted(links)
+        for start in range(0, len(links), ENQUEUE_CHUNK_SIZE):
+            self._enqueue(session, links[start:start + ENQUEUE_CHUNK_SIZE], depth + 1)
+        session.query(CrawlPage).filter_by(crawl_uuid=self.crawl_uuid, url=url).update(values)
+        session.query(SiteCrawl).filter_by(uuid=self.crawl_uuid).update({'updated_at': datetime.datetime.now()})
+        session.commit()
+
+def build_site_report(session, crawl_uuid, issue_limit=20, worst_limit=10) -> dict:
+    """
+    Aggregates the analyzed pages of a crawl: page counts, sitemap coverage, rating
+    statistics, the lowest rated pages and the checks failing on the most pages.
+    Results are read one row at a time, so the report costs the same memory for 10
+    or 10k pages.
+    """
+    status_counts = dict(session.query(CrawlPage.status, func.count()).filter_by(crawl_uuid=crawl_uuid).group_by(CrawlPage.status).all())
+    depth_counts = session.query(CrawlPage.depth, func.count()).filter_by(crawl_uuid=crawl_uuid, status='complete').group_by(CrawlPage.depth).order_by(CrawlPage.depth).all()
+
+    in_sitemap = session.query(func.count()).select_from(CrawlPage).filter_by(crawl_uuid=crawl_uuid, in_sitemap=True).scalar()
+    linked_only = session.query(CrawlPage.url).filter_by(crawl_uuid=crawl_uuid, in_sitemap=False).filter(CrawlPage.status != 'disallowed')
+
+    pages = (session.query(AnalyzedWebsite)
+             .join(CrawlPage, CrawlPage.analysis_uuid == AnalyzedWebsite.uuid)
+             .filter(CrawlPage.crawl_uuid == crawl_uuid, CrawlPage.status == 'complete')
+             .options(load_only(AnalyzedWebsite.uuid, AnalyzedWebsite.url, AnalyzedWebsite.overall_rating, AnalyzedWebsite.improvement_count,
+                                AnalyzedWebsite.results_data, AnalyzedWebsite.legacy_results))
+             .yield_per(100))
+    ratings = []
+    improvement_count = 0
+    worst = []
+    issues = Counter()
+    for page in pages:
+        if page.overall_rating is not None:
+            ratings.append(page.overall_rating)
+            worst.append((page.overall_rating, page.url, page.uuid))
+            worst = sorted(worst)[:worst_limit]
+        improvement_count += page.improvement_count or 0
+        for value in compact_results(page.results or {}).values():
+            if isinstance(value, dict) and value.get('isCard'):
+                for category_name, content in value['categories']:
+                    if any(isinstance(item, list) and item[0] is False for item in content):
+                        issues[(value['card_name'], category_name)] += 1
+
+    return {
+        'pages': {status: status_counts.get(status, 0) for status in ('complete', 'failed', 'disallowed', 'queued', 'running')},
+        'pages_per_depth': {depth: count for depth, count in depth_counts},
+        'average_rating': round(sum(ratings) / len(ratings), 1) if ratings else None,
+        'min_rating': min(ratings) if ratings else None,
+        'max_rating': max(ratings) if ratings else None,
+        'improvement_count': improvement_count,
+        'sitemap': {
+            'listed_pages': in_sitemap,
+            # Pages only found through links: missing from the sitemap (or beyond max_pages when it was read)
+            'linked_only_pages': linked_only.count(),
+            'linked_only_examples': [url for url, in linked_only.order_by(CrawlPage.position).limit(worst_limit)],
+        },
+        'lowest_rated_pages': [{'url': url, 'overall_rating': rating, 'analysis_uuid': analysis_uuid} for rating, url, analysis_uuid in worst],
+        'top_issues': [{'card_name': card_name, 'category_name': category_name, 'pages': count}
+                       for (card_name, category_name), count in issues.most_common(issue_limit)],
+    }
+
+_active_crawls = set()
+_active_crawls_lock = threading.Lock()
+
+def is_stale(crawl: SiteCrawl) -> bool:
+    """True if a 'running' crawl made no progress for STALE_AFTER_SECONDS, i.e. its process stopped."""
+    return crawl.updated_at is None or (datetime.datetime.now() - crawl.updated_at).total_seconds() > STALE_AFTER_SECONDS
+
+def start_crawl(app, db, crawl_uuid) -> bool:
+    """Runs the crawl in a background thread of this process. False if it already runs here."""
+    with _active_crawls_lock:
+        if crawl_uuid in _active_crawls:
+            return False
+        _active_crawls.add(crawl_uuid)
+
+    def run():
+        try:
+            SiteCrawler(app, db, crawl_uuid).run()
+        finally:
+            with _active_crawls_lock:
+                _active_crawls.discard(crawl_uuid)
+
+    threading.Thread(target=run, name=f"crawl-{crawl_uuid}", daemon=True).start()
+    return True
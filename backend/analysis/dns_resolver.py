@@ -0,0 +1,198 @@
+import asyncio
+import ipaddress
+import os
+import random
+import socket
+import threading
+import time
+from collections import namedtuple
+
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from backend.config.env import DNS_NAMESERVERS, DNS_TIMEOUT_SECONDS, DNS_MIN_TTL_SECONDS, DNS_MAX_TTL_SECONDS, DNS_NEGATIVE_TTL_SECONDS
+
+class HostAddresses(namedtuple('HostAddresses', ['ipv4', 'ipv6'])):
+    @property
+    def has_ipv6(self):
+        return bool(self.ipv6)
+
+    @property
+    def first(self):
+        return (self.ipv4 or self.ipv6)[0]
+
+class DNSResolver:
+    """
+    Non-blocking A/AAAA resolver with an in-process cache.
+
+    Both record types are queried concurrently on an event loop in a background
+    thread. Answers are cached for their record TTL (clamped to min_ttl..max_ttl),
+    names that don't exist for negative_ttl. Identical concurrent lookups share one
+    query. Failed lookups raise socket.gaierror like socket.gethostbyname.
+    """
+
+    def __init__(self, nameservers=DNS_NAMESERVERS, port=53, timeout=DNS_TIMEOUT_SECONDS,
+                 min_ttl=DNS_MIN_TTL_SECONDS, max_ttl=DNS_MAX_TTL_SECONDS, negative_ttl=DNS_NEGATIVE_TTL_SECONDS):
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self._resolver = dns.asyncresolver.Resolver(configure=not nameservers)
+        if nameservers:
+            self._resolver.nameservers = list(nameservers)
+        self._resolver.port = port
+        self._resolver.lifetime = timeout
+        self._cache = {}  # host -> (expires_at, HostAddresses or None for a negative answer)
+        self._cache_lock = threading.Lock()
+        self._inflight = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="dns-resolver-loop", daemon=True)
+        self._thread.start()
+
+    def resolve(self, host: str, timeout=None) -> HostAddresses:
+        """Blocking entry point for synchronous code."""
+        literal = _ip_literal(host)
+        if literal:
+            return literal
+        cached = self._cache_get(host)
+        if cached is not None:
+            return cached
+        future = asyncio.run_coroutine_threadsafe(self._resolve(host), self._loop)
+        return future.result(timeout)
+
+    async def resolve_async(self, host: str) -> HostAddresses:
+        """Awaitable entry point for coroutines running on any other event loop."""
+        literal = _ip_literal(host)
+        if literal:
+            return literal
+        future = asyncio.run_coroutine_threadsafe(self._resolve(host), self._loop)
+        return await asyncio.wrap_future(future)
+
+    def _cache_get(self, host):
+        with self._cache_lock:
+            entry = self._cache.get(host)
+            if entry is None:
+                return None
+            expires_at, addresses = entry
+            if expires_at < time.monotonic():
+                del self._cache[host]
+                return None
+        if addresses is None:
+            raise socket.gaierror(socket.EAI_NONAME, f"Name or service not known: {host} (cached)")
+        return addresses
+
+    def _cache_put(self, host, addresses, ttl):
+        with self._cache_lock:
+            self._cache[host] = (time.monotonic() + ttl, addresses)
+
+    async def _resolve(self, host):
+        cached = self._cache_get(host)
+        if cached is not None:
+            return cached
+        if host not in self._inflight:
+            self._inflight[host] = self._loop.create_task(self._query(host))
+            self._inflight[host].add_done_callback(lambda _: self._inflight.pop(host, None))
+        return await asyncio.shield(self._inflight[host])
+
+    async def _query(self, host):
+        answers = await asyncio.gather(
+            self._resolver.resolve(host, 'A', search=True),
+            self._resolver.resolve(host, 'AAAA', search=True),
+            return_exceptions=True
+        )
+        addresses = HostAddresses([], [])
+        ttls = []
+        nonexistent = 0
+        for answer, found in zip(answers, (addresses.ipv4, addresses.ipv6)):
+            if isinstance(answer, dns.resolver.NXDOMAIN):
+                nonexistent += 1
+            elif isinstance(answer, (dns.resolver.NoAnswer, dns.resolver.NoNameservers, dns.exception.Timeout)):
+                continue
+            elif isinstance(answer, Exception):
+                raise socket.gaierror(socket.EAI_FAIL, f"DNS lookup for {host} failed: {answer}") from answer
+            else:
+                found.extend(record.address for record in answer)
+                ttls.append(answer.rrset.ttl)
+
+        if not addresses.ipv4 and not addresses.ipv6:
+            if nonexistent:
+                self._cache_put(host, None, self.negative_ttl)
+            raise socket.gaierror(socket.EAI_NONAME, f"Name or service not known: {host}")
+        self._cache_put(host, addresses, min(max(min(ttls), self.min_ttl), self.max_ttl))
+        return addresses
+
+def _ip_literal(host):
+    try:
+        address = ipaddress.ip_address(host.strip('[]'))
+    except ValueError:
+        return None
+    return HostAddresses([str(address)], []) if address.version == 4 else HostAddresses([], [str(address)])
+
+_resolver = None
+_resolver_pid = None
+_resolver_lock = threading.Lock()
+
+def get_dns_resolver() -> DNSResolver:
+    """Returns the process-wide resolver shared by all network paths. Recreated after a fork."""
+    global _resolver, _resolver_pid
+    with _resolver_lock:
+        if _resolver is None or _resolver_pid != os.getpid():
+            _resolver = DNSResolver()
+            _resolver_pid = os.getpid()
+        return _resolver
+
+def resolve_ip(host: str) -> str:
+    """Drop-in for socket.gethostbyname backed by the shared resolver (prefers IPv4)."""
+    return get_dns_resolver().resolve(host).first
+
+# --- requests integration ---
+# urllib3 connects to self._dns_host while keeping self.host for the Host header,
+# SNI and certificate checks, so only the socket target is replaced.
+
+class _ResolvingConnectionMixin:
+    def _new_conn(self):
+        try:
+            addresses = get_dns_resolver().resolve(self.host)
+            self._dns_host = random.choice(addresses.ipv4 or addresses.ipv6)
+        except socket.gaierror:
+            pass  # let urllib3 resolve it itself and raise its usual connection error
+        return super()._new_conn()
+
+class _ResolvedHTTPConnection(_ResolvingConnectionMixin, HTTPConnection):
+    pass
+
+class _ResolvedHTTPSConnection(_ResolvingConnectionMixin, HTTPSConnection):
+    pass
+
+class _ResolvedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _ResolvedHTTPConnection
+
+class _ResolvedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _ResolvedHTTPSConnection
+
+class ResolvingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections resolve host names through the shared DNSResolver."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _ResolvedHTTPConnectionPool,
+            'https': _ResolvedHTTPSConnectionPool,
+        }
+
+_sessions = threading.local()
+
+def get_http_session() -> requests.Session:
+    """Per-thread requests session using the shared resolver and keep-alive connection pools."""
+    session = getattr(_sessions, 'session', None)
+    if session is None:
+        session = requests.Session()
+        adapter = ResolvingHTTPAdapter()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _sessions.session = session
+    return session
@@ -7,6 +7,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from backend.config.env import FLASK_ENV
 from webdriver_manager.chrome import ChromeDriverManager
+from backend.analysis.dns_resolver import get_http_session
+from backend.analysis.shared_resources import current_shared_resources
 
 def format_url(url: str) -> str:
     url = url.replace("https://", "http://").replace("www.", "")
@@ -37,21 +39,32 @@ def fetch_website_content(url: str):
     Returns a tuple: (response, page_source, screenshot).
     """
     # Get the static response first
-    response = requests.get(url, allow_redirects=True)
+    response = get_http_session().get(url, allow_redirects=True)
+
+    shared_resources = current_shared_resources()
+    if shared_resources is not None:
+        # Batch analyses reuse their batch's Chrome instances instead of starting one per page
+        with shared_resources.driver(get_driver) as driver:
+            page_source, screenshot = load_page(driver, url)
+        return response, page_source, screenshot
 
     driver = get_driver()
+    try:
+        page_source, screenshot = load_page(driver, url)
+    finally:
+        driver.quit()
+
+    return response, page_source, screenshot
+
+def load_page(driver, url: str):
+    """Loads the URL in Chrome. Returns a tuple: (page_source, screenshot)."""
     try:
         driver.get(url)
         WebDriverWait(driver, 2).until(
             EC.presence_of_all_elements_located((By.XPATH, "//*"))
         )
-        page_source = driver.page_source
-        screenshot = driver.get_screenshot_as_png()
+        return driver.page_source, driver.get_screenshot_as_png()
     except Exception as e:
         raise requests.exceptions.RequestException(
             'Unser Server konnte die Webseite nicht erreichen. Bitte überprüfen Sie die URL und versuchen Sie es erneut.'
-        ) from e
-    finally:
-        driver.quit()
-
-    return response, page_source, screenshot
\ No newline at end of file
+        ) from e
\ No newline at end of file
@@ -0,0 +1,124 @@
+import bisect
+import csv
+import json
+import mmap
+import os
+import socket
+import struct
+import threading
+
+from backend.config.env import GEOIP_DATABASE_PATH
+from backend.analysis.country_names import country_name
+
+# File layout: header | ranges (sorted by start) | locations (JSON list of [country, city])
+# Every range is a 16 byte start, a 16 byte end (both big endian IPv6, IPv4 mapped to ::ffff:0:0/96)
+# and a uint32 index into the locations, so byte-wise comparison equals numeric comparison.
+MAGIC = b'QGEO1'
+HEADER = struct.Struct('>5sIII')  # magic, range count, locations offset, locations length
+RANGE = struct.Struct('>16s16sI')
+
+IPV4_MAPPED_PREFIX = b'\x00' * 10 + b'\xff\xff'
+
+def _ip_key(ip: str) -> bytes:
+    try:
+        return IPV4_MAPPED_PREFIX + socket.inet_pton(socket.AF_INET, ip)
+    except OSError:
+        pass
+    try:
+        return socket.inet_pton(socket.AF_INET6, ip)
+    except OSError as e:
+        raise ValueError(f"Invalid IP address: {ip}") from e
+
+class _RangeStarts:
+    """Sequence view on the range starts of the mapped file, for bisect."""
+
+    def __init__(self, buffer, count):
+        self.buffer = buffer
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        offset = HEADER.size + index * RANGE.size
+        return self.buffer[offset:offset + 16]
+
+class GeoIPDatabase:
+    """
+    Read-only IP range -> (country, city) database.
+
+    The file is memory-mapped, so the range table lives in the OS page cache and is
+    shared by all worker processes instead of being copied into each of them.
+    Lookups are a binary search over the mapping and need no network.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, locations_offset, locations_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a GeoIP database built by 'flask geoip-import'.")
+        self._starts = _RangeStarts(self._mmap, self._count)
+        self._locations = json.loads(self._mmap[locations_offset:locations_offset + locations_length])
+
+    def lookup(self, ip: str) -> tuple[str, str] | None:
+        """Returns (country name, city) for the IP address, or None if no range contains it."""
+        key = _ip_key(ip)
+        index = bisect.bisect_right(self._starts, key) - 1
+        if index < 0:
+            return None
+        _, end, location_index = RANGE.unpack_from(self._mmap, HEADER.size + index * RANGE.size)
+        if key > end:
+            return None
+        country, city = self._locations[location_index]
+        return country_name(country), city  # files built before the codes were mapped at build time hold ISO codes
+
+    @staticmethod
+    def build(csv_path, output_path) -> int:
+        """
+        Converts an IP range CSV into the database file and returns the number of ranges.
+        Accepted rows: 'start,end,country,city' or the DB-IP city lite layout
+        'start,end,continent,country,state,city,...'. ISO country codes are stored as
+        the names ip-api.com reports, so both sources read the same.
+        """
+        locations = {}
+        ranges = []
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            for row in csv.reader(f):
+                if len(row) < 4 or row[0].startswith('#'):
+                    continue
+                try:
+                    start, end = _ip_key(row[0].strip()), _ip_key(row[1].strip())
+                except ValueError:
+                    continue  # header line or malformed address
+                country, city = (row[3], row[5]) if len(row) >= 6 else (row[2], row[3])
+                location_index = locations.setdefault((country_name(country.strip()), city.strip()), len(locations))
+                ranges.append((start, end, location_index))
+        ranges.sort()
+
+        locations_blob = json.dumps([list(location) for location in locations], ensure_ascii=False).encode('utf-8')
+        locations_offset = HEADER.size + len(ranges) * RANGE.size
+        tmp_path = f"{output_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(ranges), locations_offset, len(locations_blob)))
+            for start, end, location_index in ranges:
+                f.write(RANGE.pack(start, end, location_index))
+            f.write(locations_blob)
+        os.replace(tmp_path, output_path)
+        return len(ranges)
+
+_database = None
+_database_loaded = False
+_database_lock = threading.Lock()
+
+def get_geoip_database() -> GeoIPDatabase | None:
+    """Returns the process-wide GeoIP database, or None if no database file is installed."""
+    global _database, _database_loaded
+    with _database_lock:
+        if not _database_loaded:
+            _database_loaded = True
+            if os.path.exists(GEOIP_DATABASE_PATH):
+                _database = GeoIPDatabase(GEOIP_DATABASE_PATH)
+            else:
+                print(f"Warning: No GeoIP database at {GEOIP_DATABASE_PATH}, falling back to ip-api.com.")
+        return _database
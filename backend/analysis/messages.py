@@ -0,0 +1,276 @@
+"""
+Message catalog for the texts the card builders add to a result.
+
+Results are stored with message IDs and parameters instead of the rendered
+sentences (see backend/analysis/result_schema.py); the text is rendered from
+this catalog when the results are served. The English templates are the
+source language and must render exactly the strings card_builders.py produces,
+otherwise those texts are simply stored verbatim. Further languages go into
+TRANSLATIONS under the same IDs; missing IDs fall back to English.
+IDs are stored in the database: add new ones, but never rename or remove one.
+"""
+
+MESSAGES = {
+    # --- Meta & Social ---
+    'meta_social.title_tag_present': 'Title tag is present.',
+    'meta_social.title_tag_missing': 'Title tag is missing.',
+    'meta_social.meta_description_present': 'Meta description is present.',
+    'meta_social.meta_description_missing': 'Meta description is missing.',
+    'meta_social.canonical_link_tag_found': 'Canonical link tag found: {canonical_href}',
+    'meta_social.canonical_link_tag_missing': 'Canonical link tag is missing.',
+    'meta_social.declared_html_lang_attribute': 'Declared HTML lang attribute: {declared_lang}',
+    'meta_social.character_set_declared': 'Character set declared: {charset_value}',
+    'meta_social.character_set_missing': 'Character set meta tag missing.',
+    'meta_social.favicon_link_tag_found': 'Favicon link tag found.',
+    'meta_social.no_favicon_link_tag': 'No favicon link tag found.',
+    'meta_social.found_open_graph_og': 'Found {og_tags_count} Open Graph (og:) tags.',
+    'meta_social.no_open_graph_og': 'No Open Graph (og:) tags found.',
+    'meta_social.found_twitter_card_twitter': 'Found {twitter_tags_count} Twitter Card (twitter:) tags.',
+    'meta_social.no_twitter_card_twitter': 'No Twitter Card (twitter:) tags found.',
+    'meta_social.add_descriptive_relevant_title': 'Add a descriptive and relevant <title> tag to your page.',
+    'meta_social.title_text': 'Title: "{title_text}"',
+    'meta_social.title_length_optimal': 'Title length is {title_length} characters (optimal: {title_min_length}-{title_max_length}).',
+    'meta_social.title_length_not_optimal': 'Title length is {title_length} characters. Recommended length is {title_min_length}-{title_max_length} characters.',
+    'meta_social.no_significant_word_repetitions': 'No significant word repetitions found in the title.',
+    'meta_social.word_repetitions_found_title': 'Word repetitions found in title: {repeated_words}.',
+    'meta_social.description_text': 'Description: "{description_content}"',
+    'meta_social.description_length_optimal': 'Description length is approx. {desc_length_px}px ({desc_length_chars} chars). Recommended pixel range is {desc_min_length_px}-{desc_max_length_px}px.',
+    'meta_social.description_length_outside_range': 'Description length is approx. {desc_length_px}px ({desc_length_chars} chars). This is outside the recommended range ({desc_min_length_px}-{desc_max_length_px}px).',
+    'meta_social.add_unique_compelling_meta': 'Add a unique and compelling meta description. It influences click-through rates from search results.',
+    'meta_social.add_canonical_link_tag': 'Add a canonical link tag (`<link rel="canonical" href="{url}">`) to prevent duplicate content issues.',
+    'meta_social.declared_detected_languages_match': 'Declared and detected languages match.',
+    'meta_social.declared_language_might_mismatch': "Declared language '{declared_lang}' might mismatch detected language '{detected_lang}'.",
+    'meta_social.server_location_estimated': 'Server Location (estimated): {server_location}',
+    'meta_social.add_character_set_meta': 'Add a character set meta tag (e.g., `<meta charset="UTF-8">`) to ensure correct text rendering.',
+    'meta_social.add_favicon_link_tag': 'Add a favicon link tag in the `<head>`. It improves brand recognition in browser tabs and bookmarks.',
+    'meta_social.add_open_graph_tags': 'Add Open Graph tags (og:title, og:description, og:image, og:url) to control how your page appears when shared on platforms like Facebook.',
+    'meta_social.add_twitter_card_tags': 'Add Twitter Card tags (twitter:card, twitter:title, twitter:description, twitter:image) to control appearance when shared on Twitter.',
+    'meta_social.adjust_title_length_between': 'Adjust title length to be between {title_min_length} and {title_max_length} characters for optimal display in search results.',
+    'meta_social.avoid_repeating_words_like': "Avoid repeating words like '{repeated_words}' in the title. Keep it concise and informative.",
+    'meta_social.adjust_description_length_aim': "Adjust the description length. Aim for {desc_min_length_px}-{desc_max_length_px} pixels to ensure it's fully visible in search results.",
+    'meta_social.no_text_content_found': 'No text content found for language detection.',
+    'meta_social.error_during_automatic_language': 'Error during automatic language detection.',
+    'meta_social.unexpected_error_during_language': 'Unexpected error during language detection: {error}',
+    'meta_social.ensure_lang_attribute_html': 'Ensure the `lang` attribute in `<html>` correctly reflects the main language of the page content.',
+    'meta_social.declare_page_language_using': 'Declare the page language using the `lang` attribute on the `<html>` tag (e.g., `<html lang="en">`).',
+    'meta_social.missing_essential_open_graph': 'Missing essential Open Graph tags: {missing_og}.',
+    'meta_social.ensure_essential_open_graph': 'Ensure essential Open Graph tags (og:title, og:description, og:image, og:url) are present and have content.',
+    'meta_social.missing_essential_twitter_card': 'Missing essential Twitter Card tags: {missing_tw}.',
+    'meta_social.ensure_essential_twitter_card': 'Ensure essential Twitter Card tags (twitter:card, twitter:title, twitter:description, twitter:image) are present and have content.',
+    'meta_social.warning_canonical_tag_points': 'Warning: Canonical tag ({canonical_href}) points to a significantly different URL than accessed ({url}). Ensure this is intentional.',
+    'meta_social.verify_canonical_tag_should': 'Verify the canonical tag. It should typically point to the preferred version of the current page URL.',
+    'meta_social.canonical_tag_points_similar': 'Canonical tag points to a similar URL ({canonical_href}), likely handling variations correctly.',
+    'meta_social.detected_language_text_probability': 'Detected language in text: {detected_lang} (Probability: {probability})',
+    'meta_social.could_not_detect_language': 'Could not detect language from page text.',
+
+    # --- Content Quality ---
+    'content_quality.content_length_sufficient': 'Content length is {total_word_count} words.',
+    'content_quality.content_length_below_minimum': 'Content length is {total_word_count} words, which is below the recommended minimum of {min_content_word_count}.',
+    'content_quality.consider_expanding_content_if': 'Consider expanding the content if the topic requires more detail. Aim for at least {min_content_word_count} words.',
+    'content_quality.unique_words_basic_filter': 'Unique words (basic filter): {unique_words_count}',
+    'content_quality.keywords_title_appear_content': 'Keywords from the title appear in the content.',
+    'content_quality.keywords_title_were_not': 'Keywords from the title were not found in the page content.',
+    'content_quality.title_tag_missing_cannot': 'Title tag missing, cannot perform title/content relevance check.',
+    'content_quality.not_enough_distinct_sentences': 'Not enough distinct sentences found to reliably check for duplicates.',
+    'content_quality.no_significant_duplicate_sentences': 'No significant duplicate sentences found.',
+    'content_quality.potential_duplicate_sentences_found': 'Potential duplicate sentences found.',
+    'content_quality.ensure_important_keywords_title': "Ensure important keywords from your title ('{title_text}') are naturally integrated into the main content.",
+    'content_quality.avoid_repeating_identical_sentences': "Avoid repeating identical sentences or large text blocks. Example duplicate found: '{example}'",
+
+    # --- Structured Data ---
+    'structured_data.no_schema_org_structured': 'No Schema.org structured data (Microdata or JSON-LD) detected.',
+    'structured_data.implement_structured_data_using': 'Implement structured data using Schema.org (JSON-LD recommended) to help search engines understand your content.',
+    'structured_data.schema_org_structured_data': 'Schema.org structured data detected.',
+    'structured_data.verify_structured_data_using': "Verify your structured data using Google's Rich Results Test or Schema.org validator.",
+    'structured_data.found_microdata_element_s': 'Found {schema_elements_count} Microdata element(s).',
+    'structured_data.found_json_ld_scripts': 'Found {json_ld_scripts_count} JSON-LD script tag(s).',
+    'structured_data.detected_schema_types': 'Detected Schema types: {detected_types}',
+    'structured_data.json_ld_parse_failed': 'Found JSON-LD script, but failed to parse its content.',
+    'structured_data.error_processing_detected_json': 'Error processing detected JSON-LD content.',
+
+    # --- Linking ---
+    'linking.found_internal_links_out': 'Found {internal_link_count} internal links (out of {links_analyzed_count} total analyzed).',
+    'linking.found_external_links': 'Found {external_link_count} external links.',
+    'linking.all_internal_links_have': 'All internal links have text.',
+    'linking.internal_links_empty_text': '{internal_empty_text_count} internal link(s) have empty text.',
+    'linking.internal_link_texts_concise': 'Internal link texts are concise.',
+    'linking.internal_links_long_text': '{internal_long_text_count} internal link(s) have long text (> {max_link_text_length} chars).',
+    'linking.all_external_links_have': 'All external links have text.',
+    'linking.external_links_empty_text': '{external_empty_text_count} external link(s) have empty text.',
+    'linking.provide_descriptive_text_all': 'Provide descriptive text for all internal links. Empty link example: {href}',
+    'linking.keep_internal_link_texts': "Keep internal link texts descriptive but concise. Long text example: '{example}...'",
+    'linking.internal_link_texts_appear': 'Internal link texts appear varied.',
+    'linking.some_internal_links_use': 'Some internal links use identical text.',
+    'linking.provide_descriptive_text_external': 'Provide descriptive text for external links. Empty link example: {href}',
+    'linking.external_links_nofollow': "{nofollow_links} external link(s) have the 'nofollow' attribute.",
+    'linking.if_links_point_different': 'If links point to different destinations, use unique, descriptive text for each link.',
+
+    # --- Mobile & Accessibility ---
+    'mobile_accessibility.viewport_meta_tag_present': 'Viewport meta tag present: {viewport_content}',
+    'mobile_accessibility.viewport_meta_tag_missing': 'Viewport meta tag missing.',
+    'mobile_accessibility.add_viewport_meta_tag': 'Add a viewport meta tag (`<meta name="viewport" content="width=device-width, initial-scale=1.0">`).',
+    'mobile_accessibility.no_img_tags_found': 'No `<img>` tags found.',
+    'mobile_accessibility.all_image_s_have': 'All {total_images} image(s) have alt text.',
+    'mobile_accessibility.image_s_missing_alt': '{count_missing_alts} of {total_images} image(s) are missing alt text.',
+    'mobile_accessibility.no_major_aria_landmarks': 'No major ARIA landmarks or HTML5 elements (like <main>, <nav>) found.',
+    'mobile_accessibility.use_html5_elements_aria': 'Use HTML5 elements or ARIA landmarks to structure page content for screen reader navigation.',
+    'mobile_accessibility.found_landmarks': 'Found landmarks: {found_landmarks}.',
+    'mobile_accessibility.no_form_elements_found': 'No form elements found requiring labels.',
+    'mobile_accessibility.all_form_elements_appear': 'All {total_form_elements} form elements appear to have labels.',
+    'mobile_accessibility.form_elements_seem_missing': '{elements_without_label} of {total_form_elements} form elements seem to be missing labels.',
+    'mobile_accessibility.detailed_accessibility_checks_unavailable': 'Detailed accessibility checks unavailable (Requires PageSpeed Data).',
+    'mobile_accessibility.warning_viewport_prevents_zooming': 'Warning: Viewport prevents zooming (`user-scalable=no`), harming accessibility.',
+    'mobile_accessibility.remove_user_scalable_no': 'Remove `user-scalable=no` from the viewport tag.',
+    'mobile_accessibility.add_descriptive_alt_text': 'Add descriptive alt text to meaningful images. Missing examples: {examples}. Use `alt=""` for decorative images.',
+    'mobile_accessibility.no_main_landmark_main': "No main landmark (<main> or role='main') found.",
+    'mobile_accessibility.wrap_primary_content_main': 'Wrap primary content in a <main> element.',
+    'mobile_accessibility.ensure_every_form_input': 'Ensure every form input, select, textarea has a programmatically associated label (<label for>, wrapping label, or aria-label).',
+    'mobile_accessibility.heading_levels_follow_logical': 'Heading levels ({heading_tags}) follow a logical order.',
+    'mobile_accessibility.heading_levels_may_skip': 'Heading levels may skip levels (e.g., H1 to H3), confusing structure.',
+    'mobile_accessibility.all_buttons_have_accessible': 'All buttons have accessible names.',
+    'mobile_accessibility.some_buttons_missing_accessible': 'Some buttons are missing accessible names.',
+    'mobile_accessibility.all_links_have_discernible': 'All links have discernible text.',
+    'mobile_accessibility.some_links_lack_discernible': "Some links lack discernible text (empty, or generic like 'click here').",
+    'mobile_accessibility.images_display_correct_aspect': 'Images display with correct aspect ratio.',
+    'mobile_accessibility.some_images_may_distorted': 'Some images may be distorted due to incorrect aspect ratio.',
+    'mobile_accessibility.font_sizes_appear_generally': 'Font sizes appear generally legible.',
+    'mobile_accessibility.some_text_may_too': 'Some text may be too small to read easily, especially on mobile.',
+    'mobile_accessibility.potential_color_contrast_issues': 'Potential color contrast issues found between text and background.',
+    'mobile_accessibility.verify_text_has_sufficient': 'Verify text has sufficient contrast against its background (WCAG AA standard: 4.5:1 for normal text, 3:1 for large text). Requires manual verification or specialized tools.',
+    'mobile_accessibility.warning_viewport_restricts_maximum': 'Warning: Viewport restricts maximum scale, potentially hindering zoom.',
+    'mobile_accessibility.avoid_setting_maximum_scale': 'Avoid setting `maximum-scale=1` in the viewport tag.',
+    'mobile_accessibility.multiple_main_landmarks_found': 'Multiple ({main_elements_count}) main landmarks found. Only one allowed per page.',
+    'mobile_accessibility.ensure_only_one_main': "Ensure only one <main> element or role='main'.",
+    'mobile_accessibility.ensure_heading_ranks_increase': 'Ensure heading ranks increase by only one level at a time (e.g., H1 followed by H2).',
+    'mobile_accessibility.provide_descriptive_text_content': 'Provide descriptive text content or use `aria-label`/`aria-labelledby` for all <button> elements.',
+    'mobile_accessibility.ensure_all_links_tags': 'Ensure all links (<a> tags) have clear, descriptive text indicating their purpose or destination.',
+    'mobile_accessibility.ensure_image_display_dimensions': "Ensure image display dimensions match the image's natural aspect ratio to prevent distortion.",
+    'mobile_accessibility.ensure_base_font_size': 'Ensure base font size is adequate and text scales appropriately. ({fail_count} instances found below threshold).',
+
+    # --- Performance ---
+    'performance.core_web_vitals_explanation': 'Core Web Vitals are a set of user-centric metrics defined by Google to measure loading performance, interactivity, and visual stability.',
+    'performance.server_compression_enabled': 'Server compression enabled: {label}',
+    'performance.server_compression_disabled': 'Server compression (Gzip/Brotli) not enabled.',
+    'performance.core_web_vitals_data': 'Core Web Vitals data unavailable (requires PageSpeed/Lighthouse data).',
+    'performance.measures_time_takes_largest': 'Measures the time it takes for the largest visible content element to render.',
+    'performance.measures_time_navigation_when': 'Measures the time from navigation to when the first text or image is painted.',
+    'performance.measures_sum_all_unexpected': 'Measures the sum of all unexpected layout shifts that occur during the page’s lifespan.',
+    'performance.measures_total_amount_time': 'Measures the total amount of time that the main thread was blocked, preventing user input.',
+    'performance.measures_how_quickly_contents': 'Measures how quickly the contents of a page are visibly populated.',
+    'performance.measures_time_until_first': 'Measures the time until the first byte is received from the server after the request is sent.',
+    'performance.performance_opportunities_unavailable_requires': 'Performance opportunities unavailable (requires PageSpeed/Lighthouse data).',
+    'performance.page_load_stats_unavailable': 'Page load stats unavailable.',
+    'performance.enable_gzip_brotli_compression': 'Enable Gzip or Brotli compression on your server.',
+    'performance.measures_time_html_root': 'Measures the time for the HTML root document to start loading.',
+    'performance.optimize_server_configuration_database': 'Optimize server configuration, database queries, caching, or use a CDN to reduce TTFB.',
+    'performance.eliminate_render_blocking_resources': 'Eliminate render-blocking resources (Est. Savings: {savings_ms}).',
+    'performance.inline_critical_resources_defer': 'Inline critical resources, defer non-critical JS, and optimize CSS delivery.',
+    'performance.no_significant_render_blocking': 'No significant render-blocking resources identified.',
+    'performance.reduce_unused_css_est': 'Reduce unused CSS (Est. Savings: {css_bytes}).',
+    'performance.remove_unused_css_rules': 'Remove unused CSS rules or split CSS into smaller files loaded only when needed.',
+    'performance.reduce_unused_javascript_est': 'Reduce unused JavaScript (Est. Savings: {js_bytes}).',
+    'performance.remove_unused_js_code': 'Remove unused JS code or use code splitting to load JS chunks on demand.',
+    'performance.properly_size_images_est': 'Properly size images (Est. Savings: {img_bytes}).',
+    'performance.serve_images_appropriately_sized': 'Serve images appropriately sized for their display dimensions to save bandwidth.',
+    'performance.total_page_size_kb': 'Total Page Size: {total_kb} KB',
+    'performance.total_requests': 'Total Requests: {count}',
+    'performance.modern_image_formats_webp': 'Modern image formats (WebP, AVIF, SVG) used.',
+    'performance.reduce_page_size_requests': 'Reduce page size & requests (optimize images, minify & combine files, lazy load).',
+    'performance.error_processing_page_load': 'Error processing page load stats: {error}',
+    'performance.both_modern_legacy_image': 'Both modern and legacy image formats used.',
+    'performance.consider_converting_remaining_legacy': 'Consider converting remaining legacy images to WebP/AVIF.',
+    'performance.only_legacy_image_formats': 'Only legacy image formats (JPG, PNG, GIF) found.',
+    'performance.use_modern_image_formats': 'Use modern image formats (WebP/AVIF) for better compression.',
+    'performance.could_not_identify_modern': 'Could not identify modern image formats.',
+
+    # --- Technical Configuration ---
+    'technical_config.robots_txt_status': 'Robots.txt status: {robots_status}',
+    'technical_config.final_url_does_not': 'Final URL ({final_url}) does not use HTTPS.',
+    'technical_config.migrate_entire_site_https': 'Migrate the entire site to HTTPS.',
+    'technical_config.page_served_over_https': 'Page is served over HTTPS.',
+    'technical_config.ipv4_addresses_records': 'IPv4 addresses (A records): {addresses}',
+    'technical_config.ipv6_addresses_aaaa_records': 'IPv6 addresses (AAAA records): {addresses}',
+    'technical_config.no_ipv6_aaaa_records': 'No IPv6 (AAAA) records found. The site is not reachable from IPv6-only networks.',
+    'technical_config.create_robots_txt_file': 'Create a `robots.txt` file in the root directory.',
+    'technical_config.sitemap_status': 'Sitemap status: {sitemap_status}',
+    'technical_config.all_checked_security_headers': 'All checked security headers found: {found_headers}.',
+    'technical_config.found_headers': 'Found headers: {found_headers}.',
+    'technical_config.missing_headers': 'Missing headers: {missing_headers}.',
+    'technical_config.implement_missing_headers_like': 'Implement missing headers like {missing_headers} to enhance security.',
+    'technical_config.detailed_technical_checks_unavailable': 'Detailed technical checks unavailable (Requires PageSpeed Data).',
+    'technical_config.redirect_chain_detected': 'Redirect chain detected: {redirect_chain}.',
+    'technical_config.minimize_redirects_ensure_correct': 'Minimize redirects and ensure correct status codes (301).',
+    'technical_config.domain_could_not_resolved': 'Domain could not be resolved: {error}',
+    'technical_config.ensure_sitemap_url_robots': 'Ensure the Sitemap URL in robots.txt is correct.',
+    'technical_config.html_doctype_present': 'HTML doctype is present.',
+    'technical_config.html_doctype_missing': 'HTML doctype is missing.',
+    'technical_config.no_browser_errors_reported': 'No browser errors reported in the console during page load.',
+    'technical_config.browser_errors_found_console': '{error_items_count} browser errors found in the console.',
+    'technical_config.fix_javascript_errors_reported': 'Fix JavaScript errors reported in the browser console to ensure proper page functionality.',
+    'technical_config.no_deprecated_apis_reported': 'No deprecated APIs reported in use.',
+    'technical_config.deprecated_apis_found': '{deprecation_items_count} deprecated APIs found.',
+    'technical_config.replace_deprecated_browser_apis': 'Replace deprecated browser APIs with modern alternatives to prevent future breakage.',
+    'technical_config.page_may_not_return': 'Page may not return a successful HTTP status code (2xx).',
+    'technical_config.page_returns_successful_http': 'Page returns a successful HTTP status code (2xx).',
+    'technical_config.page_appears_crawlable_search': 'Page appears to be crawlable by search engines.',
+    'technical_config.page_may_blocked_crawling': 'Page may be blocked from crawling (check robots.txt and meta tags).',
+    'technical_config.no_specific_platform_advice': 'No specific platform advice (Stack Packs) detected.',
+    'technical_config.correct_redirect_http_https': 'Correct redirect from HTTP to HTTPS detected ({initial_url} -> {final_url}).',
+    'technical_config.redirect_detected': 'Redirect detected: {initial_url} -> ... -> {final_url}.',
+    'technical_config.error_during_www_non': 'Error during WWW/Non-WWW check setup: {error}',
+    'technical_config.www_check_unverified': 'Could not verify WWW/Non-WWW consistency.',
+    'technical_config.www_redirects_correctly': 'The {version} version correctly redirects.',
+    'technical_config.www_inconsistent': 'WWW and non-WWW versions resolve inconsistently (Opposite: {url}).',
+    'technical_config.www_check_error': 'Error checking WWW/Non-WWW redirect: {error}',
+    'technical_config.create_xml_sitemap_sitemap': 'Create an XML sitemap (sitemap.xml) and submit it to search engines.',
+    'technical_config.add_doctype_html_beginning': 'Add `<!DOCTYPE html>` at the beginning of your HTML.',
+    'technical_config.detected_platform': 'Detected Platform: {pack_title}',
+    'technical_config.ensure_only_one_canonical': 'Ensure only one canonical version (www or non-www) is live, and the other 301 redirects.',
+
+    # --- AI Analysis ---
+    'ai.no_title_description_found': 'No title or description found for AI analysis.',
+    'ai.original_description': 'Original Description: "{description_content}"',
+    'ai.rating': 'AI Rating: {rating}/100. Reasoning: {reason}',
+    'ai.original_title': 'Original Title: "{title_text}"',
+    'ai.ai_analysis_could_not': 'AI analysis could not be performed: {error}',
+    'ai.suggestion': 'AI Suggestion: {suggestion}',
+    'ai.no_description_found': 'No description found.',
+    'ai.no_title_found': 'No title found.',
+
+    # --- General & Overall Results (text_snippet_functions.py, build_overall_results) ---
+    'general.response_time_excellent': 'The website response time is excellent.',
+    'general.response_time_good': 'The website response time is good.',
+    'general.response_time_improvable': 'The website response time could be improved.',
+    'general.file_size_very_good': 'The website HTML file size is very good.',
+    'general.file_size_good': 'The website HTML file size is good.',
+    'general.file_size_improvable': 'The website HTML file size could be improved.',
+    'general.content_short': "The content, with {word_count} words, is somewhat short. Depending on the website's design and purpose, this might be sufficient, but often more content is better for SEO.",
+    'general.content_sufficient': 'The content length, with {word_count} words, appears sufficient.',
+    'general.media_count_low': 'The number of media elements on the page is low.',
+    'general.media_count_reasonable': 'The number of media elements on the page is reasonable.',
+    'general.media_count_high': 'The number of media elements on the page is high.',
+    'general.link_count_low': 'The number of internal and external links is low.',
+    'general.link_count_good': 'The number of internal and external links is good.',
+    'general.link_count_high': 'The number of internal and external links is high.',
+    'overall.rating_excellent': 'Excellent! This page follows most best practices.',
+    'overall.rating_good': "Good. The page is well-optimized, but there's room for improvement.",
+    'overall.rating_fair': 'Fair. Several areas need attention for better optimization.',
+    'overall.rating_poor': 'Poor. Significant improvements are needed across multiple areas.',
+    'overall.no_improvements': 'No specific improvement suggestions found.',
+    'overall.one_improvement': '1 improvement suggestion found.',
+    'overall.improvements': '{count} improvement suggestions found.',
+
+    # --- Shared ---
+    'performance_premium_only': 'Performance metrics, including Core Web Vitals and PageSpeed insights, are only available for premium users.',
+    'ai_premium_only': 'AI Analysis is only available for premium users. Please upgrade your subscription.',
+    'service_unavailable': '{service_name} is temporarily unavailable, so this section was skipped. Please run the analysis again later.',
+    'list_item_with_size': '- {url} ({size})',
+    'list_item': '- {value}',
+    'list_item_with_source': '- {description} (Source: {source})',
+}
+
+TRANSLATIONS = {
+    'en': MESSAGES,
+}
+
+DEFAULT_LANGUAGE = 'en'
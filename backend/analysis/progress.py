@@ -0,0 +1,182 @@
+import threading
+import time
+import uuid as uuid_lib
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.config.env import ANALYSIS_WORKERS, ANALYSIS_STREAM_HEARTBEAT_SECONDS, ANALYSIS_PROGRESS_RETENTION_SECONDS, ANALYSIS_STALE_AFTER_SECONDS
+from backend.models.results import AnalyzedWebsite
+from backend.analysis.analyzer import analyze_website, settle_status
+
+RECONNECT_DELAY_MS = 3000  # sent as the SSE retry field
+
+class _Channel:
+    __slots__ = ('events', 'finished_at', 'condition', 'user_uuid')
+
+    def __init__(self, user_uuid):
+        self.events = []  # event data, the event ID is the 1-based position
+        self.finished_at = None
+        self.condition = threading.Condition()
+        self.user_uuid = user_uuid  # who started the analysis, None if anonymous
+
+class ProgressBroker:
+    """
+    In-process pub/sub for analysis progress. Every analysis publishes to its own
+    channel; subscribers get the events after a given position (for Last-Event-ID)
+    and then block until the next one, waking up every heartbeat seconds so the
+    stream can send a keep-alive. Finished channels are kept for retention seconds
+    so reconnecting clients can still read the final event.
+
+    Waiting uses threading primitives, which gevent's monkey patching makes
+    cooperative: an idle subscriber is a parked greenlet, not a thread.
+    """
+
+    def __init__(self, retention=ANALYSIS_PROGRESS_RETENTION_SECONDS):
+        self.retention = retention
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def open(self, channel_id, user_uuid=None):
+        with self._lock:
+            now = time.monotonic()
+            expired = [key for key, channel in self._channels.items()
+                       if channel.finished_at is not None and channel.finished_at + self.retention < now]
+            for key in expired:
+                del self._channels[key]
+            self._channels.setdefault(channel_id, _Channel(user_uuid))
+
+    def publish(self, channel_id, data, final=False):
+        channel = self._channels[channel_id]
+        with channel.condition:
+            channel.events.append(data)
+            if final:
+                channel.finished_at = time.monotonic()
+            channel.condition.notify_all()
+
+    def owner(self, channel_id):
+        """(True, user_uuid) of a channel of this process, (False, None) if it's unknown here."""
+        channel = self._channels.get(channel_id)
+        return (True, channel.user_uuid) if channel else (False, None)
+
+    def subscribe(self, channel_id, after=0, heartbeat=ANALYSIS_STREAM_HEARTBEAT_SECONDS):
+        """
+        Yields (event_id, data) for every event after the given ID and None whenever
+        heartbeat seconds pass without one. Ends after the final event. Returns None
+        if the channel is unknown in this process.
+        """
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            return None
+
+        def events():
+            position = after
+            while True:
+                with channel.condition:
+                    if len(channel.events) <= position and channel.finished_at is None:
+                        channel.condition.wait(heartbeat)
+                    new_events = channel.events[position:]
+                    finished = channel.finished_at is not None
+                if not new_events:
+                    yield None
+                for data in new_events:
+                    position += 1
+                    yield position, data
+                if finished and position >= len(channel.events):
+                    return
+        return events()
+
+_broker = None
+_executor = None
+_init_lock = threading.Lock()
+
+def get_progress_broker() -> ProgressBroker:
+    global _broker
+    with _init_lock:
+        if _broker is None:
+            _broker = ProgressBroker()
+        return _broker
+
+def _get_executor():
+    global _executor
+    with _init_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix="analysis-worker")
+        return _executor
+
+def start_analysis(app, db, user_uuid, url, is_premium_user) -> str:
+    """Runs analyze_website in the worker pool, publishing its progress events. Returns the analysis UUID."""
+    analysis_uuid = str(uuid_lib.uuid4())
+    broker = get_progress_broker()
+    broker.open(analysis_uuid, user_uuid)
+    broker.publish(analysis_uuid, "0|Waiting for a free analysis worker...")
+
+    def run():
+        final = "ERROR|Analysis failed"
+        try:
+            with app.app_context():
+                for event in analyze_website(user_uuid, url, db, is_premium_user, send_progress=True, analysis_uuid=analysis_uuid):
+                    data = event.removeprefix("data: ").rstrip("\n")
+                    if data.startswith("DONE|"):
+                        final = data
+                    else:
+                        broker.publish(analysis_uuid, data)
+        except Exception as e:
+            print(f"Warning: Analysis {analysis_uuid} of {url} failed: {e}")
+        finally:
+            broker.publish(analysis_uuid, final, final=True)
+
+    _get_executor().submit(run)
+    return analysis_uuid
+
+def parse_event_id(event_id):
+    """Returns (analysis_uuid, position) of a 'uuid:position' event ID, else None."""
+    analysis_uuid, _, position = (event_id or '').partition(':')
+    try:
+        return str(uuid_lib.UUID(analysis_uuid)), int(position)
+    except ValueError:
+        return None
+
+def may_follow(db, analysis_uuid, user_uuid) -> bool:
+    """
+    Whether a user (None if anonymous) may follow an analysis: their own ones and anonymous
+    ones. An analysis still waiting in another process's pool has no row yet and is allowed
+    here; stream_progress checks it once the row exists.
+    """
+    known, owner = get_progress_broker().owner(analysis_uuid)
+    if not known:
+        row = db.session.query(AnalyzedWebsite.user_uuid).filter_by(uuid=analysis_uuid).first()
+        owner = row.user_uuid if row else None
+    return owner is None or owner == user_uuid
+
+def stream_progress(app, db, analysis_uuid, after=0, user_uuid=None, heartbeat=ANALYSIS_STREAM_HEARTBEAT_SECONDS):
+    """
+    Server-sent events for an analysis: 'id: <uuid>:<position>' lines for reconnection via
+    Last-Event-ID and comment lines as heartbeats. Analyses running in another process
+    (e.g. after reconnecting to a different worker) are followed through their status
+    in the database instead, also while they wait for a worker and have no row yet (for
+    up to ANALYSIS_STALE_AFTER_SECONDS). No database connection is held between events.
+    """
+    yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+    events = get_progress_broker().subscribe(analysis_uuid, after, heartbeat)
+    if events is not None:
+        for event in events:
+            yield ": heartbeat\n\n" if event is None else f"id: {analysis_uuid}:{event[0]}\ndata: {event[1]}\n\n"
+        return
+
+    waiting_since = time.monotonic()
+    while True:
+        with app.app_context():
+            row = db.session.query(AnalyzedWebsite.status, AnalyzedWebsite.time, AnalyzedWebsite.user_uuid).filter_by(uuid=analysis_uuid).first()
+            status = settle_status(db.session, analysis_uuid, row.status, row.time) if row else None
+            db.session.remove()
+        if row and row.user_uuid is not None and row.user_uuid != user_uuid:
+            data = "ERROR|Analysis not found"
+        elif status == 'complete':
+            data = f"DONE|{analysis_uuid}"
+        elif status == 'failed' or (row is None and time.monotonic() - waiting_since > ANALYSIS_STALE_AFTER_SECONDS):
+            data = "ERROR|Analysis failed"
+        else:  # running, or still queued for a worker
+            yield ": heartbeat\n\n"
+            time.sleep(heartbeat)
+            continue
+        yield f"id: {analysis_uuid}:{after + 1}\ndata: {data}\n\n"
+        return
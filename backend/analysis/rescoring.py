@@ -0,0 +1,145 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import bindparam, func, select, update
+
+from backend.models.results import AnalyzedWebsite, Card, TrackedUrl, summary_columns
+from backend.analysis.card_builders import build_overall_results
+from backend.analysis.result_schema import compact_results, expand_results
+from backend.storage.results_codec import CompressedJSON, get_results_codec
+
+RESCORE_MODES = ('points', 'snapshot', 'compact')
+
+def rescore_points(results: dict) -> dict:
+    """
+    Recomputes card points and the overall results from the stored card content.
+    Cards without any True/False entries (e.g. "not available" cards) keep their manual points.
+    """
+    for card_dict in results.values():
+        if not isinstance(card_dict, dict) or not card_dict.get('isCard', False):
+            continue
+        true_count = false_count = 0
+        for category in card_dict.values():
+            if isinstance(category, dict) and 'content' in category:
+                for content in category['content']:
+                    if content['bool'] is True:
+                        true_count += 1
+                    elif content['bool'] is False:
+                        false_count += 1
+        if not true_count and not false_count:
+            continue
+        card_dict['points'] = Card.score(true_count, false_count)
+    results['overall_results'] = build_overall_results(results)
+    return results
+
+def is_premium_analysis(results: dict) -> bool:
+    """
+    Premium analyses are the ones whose performance card is not the "not available" placeholder.
+    Takes stored (compact) or legacy results; categories are only keyed by name once expanded.
+    """
+    results = expand_results(results)
+    performance_card = results.get('6') or results.get(6) or {}
+    return 'performance data not available' not in performance_card
+
+def _rescore_row(row):
+    """Process pool worker. Returns (uuid, new_results or None, error or None)."""
+    uuid, url, results, snapshot_id, mode = row
+    try:
+        if mode == 'snapshot':
+            if not snapshot_id:
+                return uuid, None, "no snapshot stored"
+            from backend.analysis.analyzer import analyze_snapshot
+            new_results = analyze_snapshot(snapshot_id, url, is_premium_analysis(results))
+        elif mode == 'points':
+            new_results = rescore_points(expand_results(results))
+        else:
+            new_results = results  # only re-encoded below
+        return uuid, compact_results(new_results), None
+    except Exception as e:
+        return uuid, None, str(e)
+
+def rescore_analyses(db, mode='points', batch_size=500, workers=None, checkpoint_path=None, resume=False, echo=print):
+    """
+    Streams all stored analyses with a server-side cursor (ordered by uuid), re-scores
+    them in a process pool and writes changed results back, one transaction per batch.
+    The last committed uuid is written to checkpoint_path so an interrupted run can resume.
+    """
+    if mode not in RESCORE_MODES:
+        raise ValueError(f"Invalid mode '{mode}'. Use one of: {', '.join(RESCORE_MODES)}.")
+
+    checkpoint = Path(checkpoint_path) if checkpoint_path else None
+    last_uuid = ''
+    if resume and checkpoint and checkpoint.exists():
+        last_uuid = checkpoint.read_text().strip()
+        echo(f"Resuming after {last_uuid}")
+
+    table = AnalyzedWebsite.__table__
+    write_stmt = (
+        update(table)
+        .where(table.c.uuid == bindparam('b_uuid'))
+        .values(
+            results_data=bindparam('b_results', type_=CompressedJSON()),
+            results=None,  # legacy uncompressed column
+            overall_rating=bindparam('b_overall_rating'),
+            improvement_count=bindparam('b_improvement_count')
+        )
+    )
+
+    tracked = TrackedUrl.__table__
+    tracked_stmt = (
+        update(tracked)
+        .where(tracked.c.latest_analysis_uuid == bindparam('b_uuid'))
+        .values(latest_rating=bindparam('b_overall_rating'), latest_improvement_count=bindparam('b_improvement_count'))
+    )
+
+    pending = (table.c.uuid > last_uuid) & (table.c.status == 'complete')  # running/failed analyses have no results yet
+    total = db.session.scalar(select(func.count()).select_from(table).where(pending))
+    read_stmt = (
+        select(table.c.uuid, table.c.url, table.c.results_data, table.c.results, table.c.snapshot_id)
+        .where(pending)
+        .order_by(table.c.uuid)
+    )
+
+    worker_count = workers or os.cpu_count() or 1
+    chunksize = max(1, batch_size // (4 * worker_count))
+
+    processed = updated = failed = 0
+    bytes_before = bytes_after = 0  # stored size of the updated rows' results
+    codec = get_results_codec()
+    started = time.time()
+    with ProcessPoolExecutor(max_workers=worker_count) as pool, db.engine.connect() as read_conn:
+        stream = read_conn.execution_options(yield_per=batch_size).execute(read_stmt)
+        for partition in stream.partitions():
+            rows = [(r.uuid, r.url, r.results_data if r.results_data is not None else r.results, r.snapshot_id, mode) for r in partition]
+            legacy = {r.uuid for r in partition if r.results_data is None}
+            changes = []
+            for (uuid, new_results, error), row in zip(pool.map(_rescore_row, rows, chunksize=chunksize), rows):
+                if error:
+                    failed += 1
+                    echo(f"Failed to re-score {uuid}: {error}")
+                elif new_results != row[2] or uuid in legacy or mode == 'compact':
+                    bytes_before += len(json.dumps(row[2])) if uuid in legacy else len(codec.encode(row[2]))
+                    bytes_after += len(codec.encode(new_results))
+                    overall_rating, improvement_count = summary_columns(new_results)
+                    changes.append({'b_uuid': uuid, 'b_results': new_results, 'b_overall_rating': overall_rating, 'b_improvement_count': improvement_count})
+
+            if changes:
+                with db.engine.begin() as write_conn:
+                    write_conn.execute(write_stmt, changes)
+                    write_conn.execute(tracked_stmt, [{k: v for k, v in c.items() if k != 'b_results'} for c in changes])
+            updated += len(changes)
+            processed += len(rows)
+            if checkpoint:
+                checkpoint.write_text(rows[-1][0])
+
+            elapsed = time.time() - started
+            rate = processed / elapsed if elapsed else 0
+            eta = (total - processed) / rate if rate else 0
+            echo(f"{processed}/{total} processed, {updated} updated, {failed} failed ({rate:.0f} rows/s, ETA {eta:.0f}s)")
+
+    if updated:
+        echo(f"Stored results of updated rows: {bytes_before / 1024 / 1024:.1f} MiB -> {bytes_after / 1024 / 1024:.1f} MiB")
+    return processed, updated, failed
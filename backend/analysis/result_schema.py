@@ -0,0 +1,139 @@
+import re
+import string
+
+from backend.analysis.messages import MESSAGES, TRANSLATIONS, DEFAULT_LANGUAGE
+
+# Version 1 (no 'schema_version' key) is the format the card builders produce and the
+# frontend reads. Version 2 is how results are stored:
+# - cards are {'isCard', 'card_name', 'points', 'categories': [[category_name, content], ...]}
+#   instead of one {'category_name', 'content'} entry per lowercased category name
+# - text content items are [bool, message_id] or [bool, message_id, [params...]] referencing
+#   backend/analysis/messages.py (params in template order), other texts are [bool, None, text]
+# - '*_text' fields of the non-card entries are [message_id] or [message_id, [params...]]
+# - chart content items are unchanged
+RESULTS_SCHEMA_VERSION = 2
+
+def _template_fields(template):
+    fields = []
+    for _, field, _, _ in string.Formatter().parse(template):
+        if field is not None and field not in fields:
+            fields.append(field)
+    return fields
+
+def _compile_template(template):
+    """Regex that matches exactly the strings template.format(**params) can produce."""
+    pattern, fields = '', []
+    for literal, field, _, _ in string.Formatter().parse(template):
+        pattern += re.escape(literal)
+        if field is None:
+            continue
+        if field in fields:
+            pattern += f'(?P={field})'
+        else:
+            pattern += f'(?P<{field}>.*?)'
+            fields.append(field)
+    return re.compile(pattern, re.DOTALL)
+
+_FIELDS = {message_id: _template_fields(template) for message_id, template in MESSAGES.items()}
+_STATIC_MESSAGES = {}  # rendered text -> message_id, for templates without parameters
+_PARAMETERIZED_MESSAGES = []  # (literal prefix, regex, message_id), longest prefix first
+for _message_id, _template in MESSAGES.items():
+    if _FIELDS[_message_id]:
+        _prefix = next(string.Formatter().parse(_template))[0]
+        _PARAMETERIZED_MESSAGES.append((_prefix, _compile_template(_template), _message_id))
+    else:
+        _STATIC_MESSAGES[_template.format()] = _message_id
+_PARAMETERIZED_MESSAGES.sort(key=lambda entry: len(entry[0]), reverse=True)
+
+def encode_message(text: str):
+    """Returns (message_id, params) for a text the catalog renders exactly, else None."""
+    message_id = _STATIC_MESSAGES.get(text)
+    if message_id:
+        return message_id, []
+    for prefix, regex, message_id in _PARAMETERIZED_MESSAGES:
+        if not text.startswith(prefix):
+            continue
+        match = regex.fullmatch(text)
+        if match and MESSAGES[message_id].format(**match.groupdict()) == text:
+            return message_id, [match.group(field) for field in _FIELDS[message_id]]
+    return None
+
+def render_message(message_id: str, params=(), language=DEFAULT_LANGUAGE) -> str:
+    template = TRANSLATIONS.get(language, MESSAGES).get(message_id) or MESSAGES[message_id]
+    return template.format(**dict(zip(_FIELDS[message_id], params)))
+
+def compact_results(results: dict) -> dict:
+    """Converts results built by the card builders into the stored (version 2) format."""
+    if results.get('schema_version') == RESULTS_SCHEMA_VERSION:
+        return results
+    compacted = {}
+    for key, value in results.items():
+        if not isinstance(value, dict):
+            compacted[key] = value
+        elif value.get('isCard', False):
+            compacted[key] = _compact_card(value)
+        else:
+            compacted[key] = {k: _compact_text_field(k, v) for k, v in value.items()}
+    compacted['schema_version'] = RESULTS_SCHEMA_VERSION
+    return compacted
+
+def expand_results(results: dict, language=DEFAULT_LANGUAGE) -> dict:
+    """Renders stored results back into the format the frontend and the point calculation use."""
+    if results.get('schema_version') != RESULTS_SCHEMA_VERSION:
+        return results
+    expanded = {}
+    for key, value in results.items():
+        if key == 'schema_version':
+            continue
+        if not isinstance(value, dict):
+            expanded[key] = value
+        elif value.get('isCard', False):
+            expanded[key] = _expand_card(value, language)
+        else:
+            expanded[key] = {k: _expand_text_field(k, v, language) for k, v in value.items()}
+    return expanded
+
+def _compact_card(card):
+    compacted = {k: v for k, v in card.items() if not (isinstance(v, dict) and 'content' in v)}
+    compacted['categories'] = [
+        [category['category_name'], [_compact_item(item) for item in category['content']]]
+        for category in card.values() if isinstance(category, dict) and 'content' in category
+    ]
+    return compacted
+
+def _expand_card(card, language):
+    expanded = {k: v for k, v in card.items() if k != 'categories'}
+    for category_name, content in card['categories']:
+        expanded[category_name.lower()] = {
+            'category_name': category_name,
+            'content': [_expand_item(item, language) for item in content]
+        }
+    return expanded
+
+def _compact_item(item):
+    if not isinstance(item, dict) or set(item) != {'bool', 'text'}:
+        return item  # chart content
+    encoded = encode_message(item['text']) if isinstance(item['text'], str) else None
+    if encoded is None:
+        return [item['bool'], None, item['text']]
+    message_id, params = encoded
+    return [item['bool'], message_id, params] if params else [item['bool'], message_id]
+
+def _expand_item(item, language):
+    if not isinstance(item, list):
+        return item
+    if item[1] is None:
+        return {'bool': item[0], 'text': item[2]}
+    return {'bool': item[0], 'text': render_message(item[1], item[2] if len(item) > 2 else (), language)}
+
+def _compact_text_field(key, value):
+    encoded = encode_message(value) if key.endswith('_text') and isinstance(value, str) else None
+    if encoded is None:
+        return value
+    message_id, params = encoded
+    return [message_id, params] if params else [message_id]
+
+def _expand_text_field(key, value, language):
+    if not (key.endswith('_text') and isinstance(value, list)):
+        return value
+    return render_message(value[0], value[1] if len(value) > 1 else (), language)
@@ -0,0 +1,38 @@
+import hashlib
+from io import BytesIO
+
+from PIL import Image
+
+from backend.config.env import SCREENSHOT_FORMAT, SCREENSHOT_QUALITY, SCREENSHOT_THUMBNAIL_WIDTH
+
+MIMETYPES = {'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+def process_screenshot(png: bytes, image_format=SCREENSHOT_FORMAT, quality=SCREENSHOT_QUALITY, thumbnail_width=SCREENSHOT_THUMBNAIL_WIDTH) -> dict:
+    """
+    Converts a PNG screenshot from Chrome into a lossy WebP/JPEG and a small thumbnail.
+    Returns the AnalysisScreenshot fields: image, thumbnail, mimetype and etag.
+    """
+    if image_format not in MIMETYPES:
+        raise ValueError(f"Invalid screenshot format '{image_format}'. Use one of: {', '.join(MIMETYPES)}.")
+
+    with Image.open(BytesIO(png)) as source:
+        image = source.convert('RGB')  # JPEG has no alpha channel, and screenshots don't need one
+
+    thumbnail = image.copy()
+    thumbnail.thumbnail((thumbnail_width, thumbnail_width * 4))
+
+    encoded_image = _encode(image, image_format, quality)
+    return {
+        'image': encoded_image,
+        'thumbnail': _encode(thumbnail, image_format, quality),
+        'mimetype': MIMETYPES[image_format],
+        'etag': hashlib.sha256(encoded_image).hexdigest()[:32],
+    }
+
+def _encode(image, image_format, quality):
+    buffer = BytesIO()
+    if image_format == 'webp':
+        image.save(buffer, format='WEBP', quality=quality, method=4)
+    else:
+        image.save(buffer, format='JPEG', quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue()
@@ -0,0 +1,106 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+class SharedResources:
+    """
+    Fetches and Chrome instances shared by the analyses of one batch.
+
+    fetch() memoizes the outcome (value or exception) of a call by key for the
+    lifetime of the object, and concurrent calls with the same key share one
+    request. driver() hands out idle Chrome instances instead of starting a new
+    one per page; a driver is reset between pages and retired after
+    max_pages_per_driver pages or when a page load fails.
+    """
+
+    def __init__(self, max_idle_drivers=4, max_pages_per_driver=25):
+        self.max_idle_drivers = max_idle_drivers
+        self.max_pages_per_driver = max_pages_per_driver
+        self._results = {}
+        self._inflight = {}
+        self._idle_drivers = []  # (driver, pages loaded)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def fetch(self, key, func, *args, **kwargs):
+        with self._lock:
+            outcome = self._results.get(key)
+            if outcome is None:
+                done = self._inflight.get(key)
+                owner = done is None
+                if owner:
+                    done = self._inflight[key] = threading.Event()
+        if outcome is None:
+            if owner:
+                try:
+                    outcome = (True, func(*args, **kwargs))
+                except Exception as e:
+                    outcome = (False, e)
+                with self._lock:
+                    self._results[key] = outcome
+                    del self._inflight[key]
+                done.set()
+            else:
+                done.wait()
+                outcome = self._results[key]
+        succeeded, value = outcome
+        if not succeeded:
+            raise value
+        return value
+
+    @contextmanager
+    def driver(self, create):
+        with self._lock:
+            driver, pages = self._idle_drivers.pop() if self._idle_drivers else (None, 0)
+        if driver is None:
+            driver = create()
+        try:
+            yield driver
+        except BaseException:
+            driver.quit()  # the browser may be in any state after a failed page load
+            raise
+        pages += 1
+        try:
+            driver.delete_all_cookies()
+            driver.get('about:blank')
+        except Exception:
+            pages = self.max_pages_per_driver
+        with self._lock:
+            if not self._closed and pages < self.max_pages_per_driver and len(self._idle_drivers) < self.max_idle_drivers:
+                self._idle_drivers.append((driver, pages))
+                return
+        driver.quit()
+
+    def close(self):
+        """Quits the idle Chrome instances and drops the memoized fetches."""
+        with self._lock:
+            self._closed = True
+            drivers = [driver for driver, _ in self._idle_drivers]
+            self._idle_drivers.clear()
+            self._results.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Warning: Could not quit Chrome: {e}")
+
+_current = ContextVar('shared_resources', default=None)
+
+def current_shared_resources() -> SharedResources | None:
+    return _current.get()
+
+@contextmanager
+def sharing(resources: SharedResources):
+    """Makes the analyses run in this context (thread) use the given resources."""
+    token = _current.set(resources)
+    try:
+        yield resources
+    finally:
+        _current.reset(token)
+
+def shared_fetch(key, func, *args, **kwargs):
+    """func(*args, **kwargs), memoized by key while the analysis runs as part of a batch."""
+    resources = _current.get()
+    if resources is None:
+        return func(*args, **kwargs)
+    return resources.fetch(key, func, *args, **kwargs)
@@ -0,0 +1,183 @@
+import datetime
+import functools
+import queue
+import threading
+import zlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from xml.etree import ElementTree
+
+from backend.config.env import SITEMAP_FETCH_CONCURRENCY, SITEMAP_MAX_FILES, SITEMAP_MAX_BYTES
+from backend.analysis.dns_resolver import get_http_session
+
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+CHUNK_SIZE = 64 * 1024
+FEED_SIZE = 64 * 1024
+GZIP_MAGIC = b'\x1f\x8b'
+
+class SitemapEntry(namedtuple('SitemapEntry', ['loc', 'lastmod', 'sitemap'])):
+    """A page URL of a sitemap, its lastmod (datetime or None) and the sitemap file that listed it."""
+
+ENTRY_TAGS = {'url': 'url', 'sitemap': 'sitemap', f'{{{SITEMAP_NAMESPACE}}}url': 'url', f'{{{SITEMAP_NAMESPACE}}}sitemap': 'sitemap'}
+LOC_TAGS = ('loc', f'{{{SITEMAP_NAMESPACE}}}loc')  # image:loc, video:loc etc. are other namespaces
+LASTMOD_TAGS = ('lastmod', f'{{{SITEMAP_NAMESPACE}}}lastmod')
+
+@functools.lru_cache(maxsize=4096)  # sitemaps repeat the same few lastmod values a lot
+def parse_lastmod(value):
+    """W3C datetime (or plain date) of a <lastmod> as naive UTC, None if missing or invalid."""
+    if not value:
+        return None
+    try:
+        lastmod = datetime.datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if lastmod.tzinfo is not None:
+        lastmod = lastmod.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return lastmod
+
+def _xml_pieces(chunks, max_bytes):
+    """
+    The XML of a sitemap in pieces of at most FEED_SIZE bytes, inflating gzip on the fly.
+    Bounding the pieces bounds the elements the parser builds per feed, which matters as
+    sitemaps compress 20-30x.
+    """
+    decompressor = None
+    size = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if size == 0 and decompressor is None and chunk.startswith(GZIP_MAGIC):
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        while chunk:
+            if decompressor:
+                data = decompressor.decompress(chunk, FEED_SIZE)
+                chunk = decompressor.unconsumed_tail
+            else:
+                data, chunk = chunk[:FEED_SIZE], chunk[FEED_SIZE:]
+            size += len(data)
+            if size > max_bytes:
+                raise ValueError(f"Sitemap is larger than {max_bytes} bytes.")
+            yield data
+    if decompressor:
+        yield decompressor.flush()
+
+def parse_sitemap(chunks, max_bytes=SITEMAP_MAX_BYTES):
+    """
+    Incrementally parses a sitemap or sitemap index from an iterable of byte chunks.
+    Yields ('url' | 'sitemap', loc, lastmod) as soon as an entry is complete and
+    drops it from the tree, so memory stays constant however large the file is.
+    Gzip-compressed files (.xml.gz) are inflated on the fly; more than max_bytes of
+    XML raise ValueError.
+    """
+    parser = ElementTree.XMLPullParser(events=('start', 'end'))
+    root = None
+    for data in _xml_pieces(chunks, max_bytes):
+        parser.feed(data)
+        for event, element in parser.read_events():
+            if event == 'start':
+                if root is None:
+                    root = element
+                continue
+            kind = ENTRY_TAGS.get(element.tag)
+            if kind is None or element is root:
+                continue
+            loc = lastmod = None
+            for child in element:
+                if child.tag in LOC_TAGS:
+                    loc = (child.text or '').strip()
+                elif child.tag in LASTMOD_TAGS:
+                    lastmod = parse_lastmod(child.text)
+            root.clear()
+            if loc:
+                yield kind, loc, lastmod
+    parser.close()
+
+class SitemapReader:
+    """
+    Reads sitemaps and sitemap indexes as a stream of SitemapEntry.
+
+    Every file is streamed from the network into parse_sitemap. Child sitemaps of
+    an index are fetched by up to `concurrency` threads, at most max_files files in
+    total, and their entries are handed over through a bounded queue, so neither
+    the number of URLs nor the number of files makes the reader hold more than a
+    few thousand entries. Files that can't be fetched or parsed are skipped with a
+    warning; entries parsed before an error are kept.
+    """
+
+    def __init__(self, concurrency=SITEMAP_FETCH_CONCURRENCY, max_files=SITEMAP_MAX_FILES, max_bytes=SITEMAP_MAX_BYTES, timeout=30, queue_size=1000):
+        self.concurrency = concurrency
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.queue_size = queue_size
+
+    def entries(self, sitemap_urls):
+        """Generator of the page entries of the given sitemaps (in no particular order across files)."""
+        entries = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        lock = threading.Lock()
+        scheduled = set()
+        active = [0]
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="sitemap-reader")
+        done = object()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    entries.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def schedule(sitemap_url):
+            with lock:
+                if sitemap_url in scheduled or len(scheduled) >= self.max_files or stop.is_set():
+                    return
+                scheduled.add(sitemap_url)
+                active[0] += 1
+            try:
+                executor.submit(read, sitemap_url)
+            except RuntimeError:  # the consumer stopped and the executor shut down meanwhile
+                with lock:
+                    active[0] -= 1
+
+        def read(sitemap_url):
+            try:
+                for kind, loc, lastmod in self._read_file(sitemap_url, stop):
+                    if kind == 'sitemap':
+                        schedule(loc)
+                    elif not put(SitemapEntry(loc, lastmod, sitemap_url)):
+                        return
+            except Exception as e:
+                print(f"Warning: Could not read sitemap {sitemap_url}: {e}")
+            finally:
+                with lock:
+                    active[0] -= 1
+                    finished = not active[0]
+                if finished:
+                    put(done)
+
+        try:
+            for sitemap_url in sitemap_urls:
+                schedule(sitemap_url)
+            if not scheduled:
+                return
+            while True:
+                entry = entries.get()
+                if entry is done:
+                    return
+                yield entry
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _read_file(self, sitemap_url, stop):
+        response = get_http_session().get(sitemap_url, stream=True, timeout=self.timeout)
+        with closing(response):
+            response.raise_for_status()
+            for item in parse_sitemap(response.iter_content(CHUNK_SIZE), self.max_bytes):
+                if stop.is_set():
+                    return
+                yield item
@@ -0,0 +1,85 @@
+import click
+
+def register_commands(app, db):
+    @app.cli.command('rescore')
+    @click.option('--mode', type=click.Choice(['points', 'snapshot', 'compact']), default='points', show_default=True,
+                  help="'points' recomputes card points and overall results from the stored content, "
+                       "'snapshot' re-runs the card builders on the stored snapshot, "
+                       "'compact' only rewrites results in the current schema and storage format "
+                       "(message IDs, zstd with the newest dictionary).")
+    @click.option('--batch-size', default=500, show_default=True, help="Rows per fetch and per write transaction.")
+    @click.option('--workers', default=None, type=int, help="Size of the process pool (default: CPU count).")
+    @click.option('--checkpoint', default='rescore.checkpoint', show_default=True, help="File storing the last committed uuid.")
+    @click.option('--resume', is_flag=True, help="Continue after the uuid stored in the checkpoint file.")
+    def rescore(mode, batch_size, workers, checkpoint, resume):
+        """Re-scores all stored analyses, e.g. after tuning thresholds in card_builders.py."""
+        from backend.analysis.rescoring import rescore_analyses
+
+        processed, updated, failed = rescore_analyses(db, mode=mode, batch_size=batch_size, workers=workers,
+                                                      checkpoint_path=checkpoint, resume=resume, echo=click.echo)
+        click.echo(f"Done: {processed} processed, {updated} updated, {failed} failed.")
+
+    @app.cli.command('geoip-import')
+    @click.argument('csv_path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--output', default=None, help="Target file (default: GEOIP_DATABASE_PATH).")
+    def geoip_import(csv_path, output):
+        """Builds the local GeoIP database from an IP range CSV (e.g. DB-IP city lite)."""
+        from backend.analysis.geoip import GeoIPDatabase
+        from backend.config.env import GEOIP_DATABASE_PATH
+
+        count = GeoIPDatabase.build(csv_path, output or GEOIP_DATABASE_PATH)
+        click.echo(f"Imported {count} IP ranges into {output or GEOIP_DATABASE_PATH}.")
+
+    @app.cli.command('screenshots-compress')
+    @click.option('--batch-size', default=100, show_default=True)
+    def screenshots_compress(batch_size):
+        """Converts stored PNG screenshots to the configured format and adds thumbnails."""
+        from backend.analysis.screenshots import process_screenshot
+        from backend.models.results import AnalysisScreenshot
+
+        converted = saved_bytes = 0
+        last_uuid = ''
+        while True:
+            rows = (db.session.query(AnalysisScreenshot)
+                    .filter(AnalysisScreenshot.etag.is_(None), AnalysisScreenshot.analysis_uuid > last_uuid)
+                    .order_by(AnalysisScreenshot.analysis_uuid)
+                    .options(db.undefer(AnalysisScreenshot.image))
+                    .limit(batch_size).all())
+            if not rows:
+                break
+            last_uuid = rows[-1].analysis_uuid
+            for row in rows:
+                try:
+                    processed = process_screenshot(row.image)
+                except Exception as e:
+                    click.echo(f"Skipping {row.analysis_uuid}: {e}")
+                    continue
+                saved_bytes += len(row.image) - len(processed['image'])
+                converted += 1
+                for field, value in processed.items():
+                    setattr(row, field, value)
+            db.session.commit()
+            click.echo(f"{converted} converted, {saved_bytes / 1024 / 1024:.1f} MiB saved")
+
+    @app.cli.command('results-train-dictionary')
+    @click.option('--samples', default=5000, show_default=True, help="Newest analyses to train on.")
+    @click.option('--size', default=112640, show_default=True, help="Dictionary size in bytes.")
+    def results_train_dictionary(samples, size):
+        """Trains a zstd dictionary on stored results and makes it the one new results are compressed with."""
+        from backend.models.results import AnalyzedWebsite
+        from backend.storage.results_codec import get_results_codec, train_dictionary
+
+        rows = (db.session.query(AnalyzedWebsite)
+                .options(db.load_only(AnalyzedWebsite.results_data, AnalyzedWebsite.legacy_results))
+                .order_by(AnalyzedWebsite.time.desc()).limit(samples).all())
+        corpus = [row.results for row in rows if row.results]
+        if len(corpus) < 10:
+            raise click.ClickException(f"Need at least 10 stored analyses to train on, found {len(corpus)}.")
+
+        codec = get_results_codec()
+        before = sum(len(codec.encode(results)) for results in corpus)
+        dict_id = codec.save_dictionary(train_dictionary(corpus, size))
+        after = sum(len(codec.encode(results)) for results in corpus)
+        click.echo(f"Saved dictionary {dict_id} (trained on {len(corpus)} results): "
+                   f"{before / len(corpus):.0f} -> {after / len(corpus):.0f} bytes per result. "
+                   "Other hosts load it from the database; run 'flask rescore --mode compact' to recompress existing rows.")
\ No newline at end of file
@@ -8,4 +8,44 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 FLASK_SECRET_KEY = os.getenv("FLASK_SECRET_KEY")
 GOOGLE_PAGESPEED_API_KEY = os.getenv("GOOGLE_PAGESPEED_API_KEY")
 POSTGRES_DATABASE_URL = os.getenv("POSTGRES_DATABASE_URL")
-FLASK_ENV = os.getenv("FLASK_ENV", "dev") # Default to development if not set
\ No newline at end of file
+FLASK_ENV = os.getenv("FLASK_ENV", "dev") # Default to development if not set
+SNAPSHOT_STORE_PATH = os.getenv("SNAPSHOT_STORE_PATH", str(Path(__file__).resolve().parents[2] / "data" / "snapshots"))
+AI_MODEL = os.getenv("AI_MODEL", "gpt-4o")
+AI_RATING_MODE = os.getenv("AI_RATING_MODE", "separate") # "separate" (one request each) or "combined" (single tool call)
+AI_REQUEST_TIMEOUT_SECONDS = float(os.getenv("AI_REQUEST_TIMEOUT_SECONDS", 30))
+AI_CACHE_TTL_SECONDS = int(os.getenv("AI_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", 10000))
+AI_BATCH_WINDOW_SECONDS = float(os.getenv("AI_BATCH_WINDOW_SECONDS", 0)) # 0 disables batching
+AI_BATCH_MAX_SIZE = int(os.getenv("AI_BATCH_MAX_SIZE", 10))
+AI_MAX_CONCURRENT_REQUESTS = int(os.getenv("AI_MAX_CONCURRENT_REQUESTS", 8))
+GEOIP_DATABASE_PATH = os.getenv("GEOIP_DATABASE_PATH", str(Path(__file__).resolve().parents[2] / "data" / "geoip.bin"))
+DNS_NAMESERVERS = [ns.strip() for ns in os.getenv("DNS_NAMESERVERS", "").split(",") if ns.strip()] # empty: use /etc/resolv.conf
+DNS_TIMEOUT_SECONDS = float(os.getenv("DNS_TIMEOUT_SECONDS", 3))
+DNS_MIN_TTL_SECONDS = int(os.getenv("DNS_MIN_TTL_SECONDS", 30))
+DNS_MAX_TTL_SECONDS = int(os.getenv("DNS_MAX_TTL_SECONDS", 3600))
+DNS_NEGATIVE_TTL_SECONDS = int(os.getenv("DNS_NEGATIVE_TTL_SECONDS", 60))
+SCREENSHOT_FORMAT = os.getenv("SCREENSHOT_FORMAT", "webp") # "webp" or "jpeg"
+SCREENSHOT_QUALITY = int(os.getenv("SCREENSHOT_QUALITY", 75))
+SCREENSHOT_THUMBNAIL_WIDTH = int(os.getenv("SCREENSHOT_THUMBNAIL_WIDTH", 320))
+RESULTS_COMPRESSION_LEVEL = int(os.getenv("RESULTS_COMPRESSION_LEVEL", 9)) # zstd level for stored results
+RESULTS_DICTIONARY_PATH = os.getenv("RESULTS_DICTIONARY_PATH", str(Path(__file__).resolve().parents[2] / "data" / "results_dictionaries")) # local cache, the dictionaries themselves are in the results_dictionaries table
+RESULTS_CACHE_MAX_BYTES = int(os.getenv("RESULTS_CACHE_MAX_BYTES", 64 * 1024 * 1024)) # per process, serialized /api/get_results bodies
+RESULTS_CACHE_TTL_SECONDS = int(os.getenv("RESULTS_CACHE_TTL_SECONDS", 300))
+RESULTS_HTTP_MAX_AGE = int(os.getenv("RESULTS_HTTP_MAX_AGE", 24 * 3600)) # browser/proxy cache lifetime of results
+ANALYSIS_STREAM_MODE = os.getenv("ANALYSIS_STREAM_MODE", "sync") # "sync" (analysis runs in the SSE request) or "async" (worker pool + progress broker, serve with gevent workers)
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", 4)) # concurrent analyses per process in async mode
+ANALYSIS_STREAM_HEARTBEAT_SECONDS = int(os.getenv("ANALYSIS_STREAM_HEARTBEAT_SECONDS", 15))
+ANALYSIS_PROGRESS_RETENTION_SECONDS = int(os.getenv("ANALYSIS_PROGRESS_RETENTION_SECONDS", 600)) # finished progress channels kept for reconnects
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", 4)) # concurrent batch analyses per process
+BATCH_PER_HOST_CONCURRENCY = int(os.getenv("BATCH_PER_HOST_CONCURRENCY", 1)) # concurrent analyses of one host
+BATCH_HOST_DELAY_SECONDS = float(os.getenv("BATCH_HOST_DELAY_SECONDS", 2)) # pause between two analyses of one host
+BATCH_MAX_URLS = int(os.getenv("BATCH_MAX_URLS", 500))
+CHROME_MAX_PAGES_PER_DRIVER = int(os.getenv("CHROME_MAX_PAGES_PER_DRIVER", 25)) # batch analyses reuse Chrome for this many pages
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", 2)) # concurrent page analyses per site crawl
+CRAWL_DELAY_SECONDS = float(os.getenv("CRAWL_DELAY_SECONDS", 1)) # between page analyses of a crawl, a higher robots.txt Crawl-delay wins
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", 10000))
+CRAWL_MAX_DEPTH = int(os.getenv("CRAWL_MAX_DEPTH", 10))
+SITEMAP_FETCH_CONCURRENCY = int(os.getenv("SITEMAP_FETCH_CONCURRENCY", 4)) # child sitemaps of an index fetched at once
+SITEMAP_MAX_FILES = int(os.getenv("SITEMAP_MAX_FILES", 500)) # sitemap files read per crawl, indexes included
+SITEMAP_MAX_BYTES = int(os.getenv("SITEMAP_MAX_BYTES", 64 * 1024 * 1024)) # per file after decompression (the protocol allows 50 MB)
+ANALYSIS_STALE_AFTER_SECONDS = int(os.getenv("ANALYSIS_STALE_AFTER_SECONDS", 900)) # a 'running' analysis started longer ago lost its worker (timeout, OOM, redeploy) and counts as failed
\ No newline at end of file
@@ -0,0 +1,20 @@
+from gevent import monkey, socket
+from gunicorn.workers.ggevent import GeventWorker as _GeventWorker
+
+class GeventWorker(_GeventWorker):
+    """
+    gunicorn worker for ANALYSIS_STREAM_MODE=async (see the Dockerfile):
+
+        gunicorn -k backend.gevent_worker.GeventWorker --worker-connections 2000 run:flask_app
+
+    Same as gunicorn's gevent worker, except that the monkey patching isn't aggressive:
+    that would remove select.epoll, which trio (a selenium dependency, also imported by
+    openai through httpx) needs at import time. psycopg2 is made cooperative with
+    psycogreen, so database queries don't block the other greenlets.
+    """
+
+    def patch(self):
+        monkey.patch_all(aggressive=False)
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+        self.sockets = [socket.socket(s.FAMILY, socket.SOCK_STREAM, fileno=s.sock.fileno()) for s in self.sockets]
@@ -0,0 +1,71 @@
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: everything falls back to the stdlib json module
+    orjson = None
+
+# Card keys are ints while results are being built
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+def dumps_bytes(obj) -> bytes:
+    """Compact UTF-8 JSON, keys in insertion order."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers beyond 64 bit, which only the stdlib encoder handles
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def dumps(obj) -> str:
+    """Serializer for SQLAlchemy JSON columns."""
+    return dumps_bytes(obj).decode('utf-8')
+
+def loads(data):
+    """Deserializer for SQLAlchemy JSON columns and the results codec. Accepts str or bytes."""
+    if orjson is not None and not isinstance(data, str):
+        return orjson.loads(data)
+    # For str (what the database drivers hand over) the stdlib decoder is as fast, see benchmarks/json_provider.py
+    return json.loads(data)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, if installed. Keeps the default provider's
+    behaviour: sort_keys, compact/debug indentation and its default() for types orjson
+    doesn't handle the same way (datetimes are still sent as HTTP dates). Calls with
+    extra json.dumps/json.loads arguments go to the default provider.
+    """
+
+    def _orjson_options(self, indent=False):
+        option = _ORJSON_OPTIONS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options()).decode('utf-8')
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        try:
+            body = orjson.dumps(obj, default=self.default, option=self._orjson_options(indent) | orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            return super().response(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
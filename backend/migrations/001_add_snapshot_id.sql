@@ -0,0 +1,2 @@
+-- Analyses reference the stored fetch (HTML, headers, redirects, screenshot) by its snapshot ID.
+ALTER TABLE analyzed_websites ADD COLUMN IF NOT EXISTS snapshot_id VARCHAR;
@@ -0,0 +1,11 @@
+-- Screenshots move out of analyzed_websites so listing a user's analyses no longer reads the PNG data.
+CREATE TABLE IF NOT EXISTS analysis_screenshots (
+    analysis_uuid VARCHAR PRIMARY KEY REFERENCES analyzed_websites (uuid) ON DELETE CASCADE,
+    image BYTEA
+);
+
+INSERT INTO analysis_screenshots (analysis_uuid, image)
+SELECT uuid, screenshot FROM analyzed_websites WHERE screenshot IS NOT NULL
+ON CONFLICT (analysis_uuid) DO NOTHING;
+
+ALTER TABLE analyzed_websites DROP COLUMN IF EXISTS screenshot;
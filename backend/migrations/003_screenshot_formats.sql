@@ -0,0 +1,5 @@
+-- Screenshots are stored as WebP/JPEG with a thumbnail. Existing PNG rows keep their format
+-- until 'flask screenshots-compress' converts them.
+ALTER TABLE analysis_screenshots ADD COLUMN IF NOT EXISTS mimetype VARCHAR DEFAULT 'image/png';
+ALTER TABLE analysis_screenshots ADD COLUMN IF NOT EXISTS etag VARCHAR;
+ALTER TABLE analysis_screenshots ADD COLUMN IF NOT EXISTS thumbnail BYTEA;
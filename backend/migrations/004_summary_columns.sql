@@ -0,0 +1,14 @@
+-- The profile list queries read the overall rating and improvement count from summary
+-- columns instead of the results JSON, and filter/sort through (user_uuid, ...) indexes.
+ALTER TABLE analyzed_websites ALTER COLUMN results TYPE JSONB USING results::jsonb;
+
+ALTER TABLE analyzed_websites ADD COLUMN IF NOT EXISTS overall_rating INTEGER;
+ALTER TABLE analyzed_websites ADD COLUMN IF NOT EXISTS improvement_count INTEGER;
+
+UPDATE analyzed_websites
+SET overall_rating = (results -> 'overall_results' ->> 'overall_rating')::integer,
+    improvement_count = (results -> 'overall_results' ->> 'improvement_count')::integer
+WHERE overall_rating IS NULL AND results ? 'overall_results';
+
+CREATE INDEX IF NOT EXISTS ix_analyzed_websites_user_time ON analyzed_websites (user_uuid, time);
+CREATE INDEX IF NOT EXISTS ix_analyzed_websites_user_url ON analyzed_websites (user_uuid, url, time);
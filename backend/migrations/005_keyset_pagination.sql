@@ -0,0 +1,11 @@
+-- The profile table pages through a user's analyses by (time, uuid) instead of OFFSET
+-- and reads the total from a per-user counter instead of COUNT(*).
+CREATE INDEX IF NOT EXISTS ix_analyzed_websites_user_time_uuid ON analyzed_websites (user_uuid, time, uuid);
+DROP INDEX IF EXISTS ix_analyzed_websites_user_time;
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS analysis_count INTEGER NOT NULL DEFAULT 0;
+
+UPDATE users
+SET analysis_count = counts.analysis_count
+FROM (SELECT user_uuid, COUNT(*) AS analysis_count FROM analyzed_websites GROUP BY user_uuid) AS counts
+WHERE users.uuid = counts.user_uuid;
@@ -0,0 +1,7 @@
+-- Substring and prefix search over a user's analysis history. btree_gin lets the GIN index
+-- hold user_uuid next to the URL trigrams, so a search only touches that user's entries.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+CREATE INDEX IF NOT EXISTS ix_analyzed_websites_user_url_trgm
+ON analyzed_websites USING gin (user_uuid, lower(url) gin_trgm_ops);
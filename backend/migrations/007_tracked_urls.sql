@@ -0,0 +1,26 @@
+-- Per-user summary of analyzed URLs for the profile's URL selector and overview,
+-- upserted by analyze_website in the same transaction as the analysis.
+CREATE TABLE IF NOT EXISTS user_tracked_urls (
+    user_uuid INTEGER NOT NULL REFERENCES users (uuid) ON DELETE CASCADE,
+    url VARCHAR NOT NULL,
+    first_seen TIMESTAMP,
+    last_analyzed TIMESTAMP,
+    latest_analysis_uuid VARCHAR,
+    latest_rating INTEGER,
+    latest_improvement_count INTEGER,
+    analysis_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_uuid, url)
+);
+
+INSERT INTO user_tracked_urls (user_uuid, url, first_seen, last_analyzed, latest_analysis_uuid,
+                               latest_rating, latest_improvement_count, analysis_count)
+SELECT DISTINCT ON (user_uuid, url)
+       user_uuid, url,
+       MIN(time) OVER w, time, uuid,
+       overall_rating, improvement_count,
+       COUNT(*) OVER w
+FROM analyzed_websites
+WHERE user_uuid IS NOT NULL AND url IS NOT NULL
+WINDOW w AS (PARTITION BY user_uuid, url)
+ORDER BY user_uuid, url, time DESC NULLS LAST
+ON CONFLICT (user_uuid, url) DO NOTHING;
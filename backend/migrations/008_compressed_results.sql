@@ -0,0 +1,7 @@
+-- Results are stored zstd-compressed in results_data (see backend/storage/results_codec.py).
+-- Existing rows keep their JSONB in results until 'flask rescore --mode compact' moves them;
+-- once no row has results set anymore, the column can be dropped.
+ALTER TABLE analyzed_websites ADD COLUMN IF NOT EXISTS results_data BYTEA;
+
+-- Keep TOAST from compressing the already compressed data a second time.
+ALTER TABLE analyzed_websites ALTER COLUMN results_data SET STORAGE EXTERNAL;
@@ -0,0 +1,10 @@
+-- analyze_website inserts the analysis as 'running' and stores every results section
+-- as soon as it is built, so partial results survive a crash and can be shown early.
+ALTER TABLE analyzed_websites ADD COLUMN IF NOT EXISTS status VARCHAR NOT NULL DEFAULT 'complete';
+
+CREATE TABLE IF NOT EXISTS analysis_sections (
+    analysis_uuid VARCHAR NOT NULL REFERENCES analyzed_websites (uuid) ON DELETE CASCADE,
+    section VARCHAR NOT NULL,
+    data JSONB,
+    PRIMARY KEY (analysis_uuid, section)
+);
@@ -0,0 +1,18 @@
+-- URLs submitted together through /api/analyze/batch and their per-URL state.
+CREATE TABLE IF NOT EXISTS analysis_batches (
+    uuid VARCHAR PRIMARY KEY,
+    user_uuid INTEGER REFERENCES users (uuid) ON DELETE CASCADE,
+    time TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_analysis_batches_user_uuid ON analysis_batches (user_uuid);
+
+CREATE TABLE IF NOT EXISTS analysis_batch_items (
+    batch_uuid VARCHAR NOT NULL REFERENCES analysis_batches (uuid) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    url VARCHAR NOT NULL,
+    status VARCHAR NOT NULL DEFAULT 'queued',
+    analysis_uuid VARCHAR,
+    error VARCHAR,
+    PRIMARY KEY (batch_uuid, position)
+);
@@ -0,0 +1,28 @@
+-- Whole-site crawls and their resumable frontier (one row per discovered URL).
+CREATE TABLE IF NOT EXISTS site_crawls (
+    uuid VARCHAR PRIMARY KEY,
+    user_uuid INTEGER REFERENCES users (uuid) ON DELETE CASCADE,
+    root_url VARCHAR NOT NULL,
+    time TIMESTAMP,
+    max_depth INTEGER NOT NULL,
+    max_pages INTEGER NOT NULL,
+    is_premium_user BOOLEAN NOT NULL DEFAULT FALSE,
+    status VARCHAR NOT NULL DEFAULT 'running',
+    updated_at TIMESTAMP,
+    report JSONB
+);
+
+CREATE INDEX IF NOT EXISTS ix_site_crawls_user_uuid ON site_crawls (user_uuid);
+
+CREATE TABLE IF NOT EXISTS crawl_pages (
+    crawl_uuid VARCHAR NOT NULL REFERENCES site_crawls (uuid) ON DELETE CASCADE,
+    url VARCHAR NOT NULL,
+    position INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    status VARCHAR NOT NULL DEFAULT 'queued',
+    analysis_uuid VARCHAR,
+    error VARCHAR,
+    PRIMARY KEY (crawl_uuid, url)
+);
+
+CREATE INDEX IF NOT EXISTS ix_crawl_pages_frontier ON crawl_pages (crawl_uuid, status, depth, position);
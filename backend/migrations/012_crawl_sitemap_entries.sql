@@ -0,0 +1,3 @@
+-- Crawl pages seeded from the site's sitemaps, with their <lastmod>, for the sitemap coverage of the site report.
+ALTER TABLE crawl_pages ADD COLUMN IF NOT EXISTS in_sitemap BOOLEAN NOT NULL DEFAULT FALSE;
+ALTER TABLE crawl_pages ADD COLUMN IF NOT EXISTS lastmod TIMESTAMP;
@@ -0,0 +1,10 @@
+-- Trained zstd dictionaries of the results codec (see backend/storage/results_codec.py).
+-- Rows compressed with a dictionary can only be read where it is available, so every host
+-- loads them from here; data/results_dictionaries is just a local cache. Dictionaries
+-- trained before this table existed are copied into it by the first process that finds
+-- them in its cache.
+CREATE TABLE IF NOT EXISTS results_dictionaries (
+    dict_id BIGINT PRIMARY KEY,
+    data BYTEA NOT NULL,
+    created_at TIMESTAMP NOT NULL
+);
@@ -0,0 +1,3 @@
+-- Refreshed while a process's BatchScheduler holds the batch. Batches with unfinished items
+-- and an old (or missing) updated_at were interrupted and are queued again when read.
+ALTER TABLE analysis_batches ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP;
@@ -1,3 +1,5 @@
+from backend.models.results import CardResult
+
 class Calc:
     def __init__(self, results):
         self.results = results
@@ -19,6 +21,8 @@ class Calc:
         return false_count
 
     def count_false_in_card(self, card):
+        if isinstance(card, CardResult):
+            return card.false_count  # counted while the card was built
         false_count = 0
         for category in card.values():
             if isinstance(category, dict) and 'content' in category: 
@@ -1,7 +1,10 @@
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSON, JSONB
 import uuid
 
+from backend.storage.results_codec import CompressedJSON
+
 from . import db        
 
 class AnalyzedWebsite(db.Model):
@@ -9,31 +12,203 @@ class AnalyzedWebsite(db.Model):
     user_uuid = db.Column(db.Integer, db.ForeignKey('users.uuid'))
     uuid = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
     url = db.Column(db.String)
-    results = db.Column(JSON)  # <-- Wichtig: Nicht db.JSON!
+    results_data = db.Column(CompressedJSON)  # zstd-compressed results JSON, see backend/storage/results_codec.py
+    # Rows written before compression, moved to results_data by 'flask rescore --mode compact'
+    legacy_results = db.Column('results', JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), 'postgresql'))  # <-- Wichtig: Nicht db.JSON!
     computation_time = db.Column(db.String)
     time = db.Column(db.DateTime)
-    screenshot = db.Column(db.BLOB)
+    # Copied from results['overall_results'] whenever results is set, so list queries don't read the JSON
+    overall_rating = db.Column(db.Integer)
+    improvement_count = db.Column(db.Integer)
+    snapshot_id = db.Column(db.String)  # content-addressed fetch snapshot, see backend/storage/snapshots.py
+    # 'running' while analyze_website works on it (sections are in AnalysisSection), then 'complete' or 'failed'
+    status = db.Column(db.String, nullable=False, default='complete', server_default='complete')
+    # Screenshots live in their own table so listing analyses doesn't pull the image data
+    screenshot_record = db.relationship('AnalysisScreenshot', uselist=False, lazy='select', cascade='all, delete-orphan')
+
+    __table_args__ = (
+        db.Index('ix_analyzed_websites_user_time_uuid', 'user_uuid', 'time', 'uuid'),  # keyset pagination
+        db.Index('ix_analyzed_websites_user_url', 'user_uuid', 'url', 'time'),
+        # URL search uses a pg_trgm GIN index on (user_uuid, lower(url)), see migrations/006_url_trigram_search.sql
+    )
 
     def __repr__(self):
         return f'<AnalyzedWebsite {self.website}>'
 
+    @property
+    def results(self):
+        return self.results_data if self.results_data is not None else self.legacy_results
+
+    @results.setter
+    def results(self, results):
+        self.results_data = results
+        self.legacy_results = None
+        self.overall_rating, self.improvement_count = summary_columns(results)
+
     def get_id(self):
         return self.uuid
 
-class Content:
-    def __init__(self, bool, text):
-        self.bool = bool
-        self.text = text
+def summary_columns(results) -> tuple[int | None, int | None]:
+    """Returns (overall_rating, improvement_count) of a results dict."""
+    overall_results = (results or {}).get('overall_results') or {}
+    return overall_results.get('overall_rating'), overall_results.get('improvement_count')
+
+class ResultsDictionary(db.Model):
+    """A trained zstd dictionary of the results codec. Every host reads rows with these, so they live in the DB."""
+    __tablename__ = 'results_dictionaries'
+    dict_id = db.Column(db.BigInteger, primary_key=True, autoincrement=False)  # the ID zstd records in every frame
+    data = db.Column(db.LargeBinary, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)  # the newest dictionary compresses new results
+
+class TrackedUrl(db.Model):
+    """Per-user summary of every analyzed URL, maintained by record_tracked_url."""
+    __tablename__ = 'user_tracked_urls'
+    user_uuid = db.Column(db.Integer, db.ForeignKey('users.uuid', ondelete='CASCADE'), primary_key=True)
+    url = db.Column(db.String, primary_key=True)
+    first_seen = db.Column(db.DateTime)
+    last_analyzed = db.Column(db.DateTime)
+    latest_analysis_uuid = db.Column(db.String)
+    latest_rating = db.Column(db.Integer)
+    latest_improvement_count = db.Column(db.Integer)
+    analysis_count = db.Column(db.Integer, nullable=False, default=0)
 
     def to_dict(self):
         return {
-            'bool': self.bool,
-            'text': self.text
+            'url': self.url,
+            'first_seen': self.first_seen.isoformat() if self.first_seen else None,
+            'last_analyzed': self.last_analyzed.isoformat() if self.last_analyzed else None,
+            'latest_analysis_uuid': self.latest_analysis_uuid,
+            'latest_rating': self.latest_rating,
+            'latest_improvement_count': self.latest_improvement_count,
+            'analysis_count': self.analysis_count,
         }
-    
+
+def record_tracked_url(session, analysis: AnalyzedWebsite):
+    """
+    Upserts the analysis into its user's TrackedUrl row. Runs in the caller's transaction,
+    so the summary is committed together with the analysis.
+    """
+    insert = postgresql.insert if session.get_bind().dialect.name == 'postgresql' else sqlite.insert
+    stmt = insert(TrackedUrl).values(
+        user_uuid=analysis.user_uuid,
+        url=analysis.url,
+        first_seen=analysis.time,
+        last_analyzed=analysis.time,
+        latest_analysis_uuid=analysis.uuid,
+        latest_rating=analysis.overall_rating,
+        latest_improvement_count=analysis.improvement_count,
+        analysis_count=1
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TrackedUrl.user_uuid, TrackedUrl.url],
+        set_={
+            'last_analyzed': stmt.excluded.last_analyzed,
+            'latest_analysis_uuid': stmt.excluded.latest_analysis_uuid,
+            'latest_rating': stmt.excluded.latest_rating,
+            'latest_improvement_count': stmt.excluded.latest_improvement_count,
+            'analysis_count': TrackedUrl.analysis_count + 1,
+        }
+    )
+    session.execute(stmt)
+
+class AnalysisSection(db.Model):
+    """
+    One results section ('general_results', a card index, ...) of an analysis that is still
+    running or failed, in the stored (compact) format. Removed once the analysis completes
+    and the full results are written to AnalyzedWebsite.results.
+    """
+    __tablename__ = 'analysis_sections'
+    analysis_uuid = db.Column(db.String, db.ForeignKey('analyzed_websites.uuid', ondelete='CASCADE'), primary_key=True)
+    section = db.Column(db.String, primary_key=True)
+    data = db.Column(JSON().with_variant(JSONB(), 'postgresql'))
+
+def save_sections(session, analysis_uuid, sections: dict):
+    """Upserts compacted results sections of a running analysis. Runs in the caller's transaction."""
+    if not sections:
+        return
+    insert = postgresql.insert if session.get_bind().dialect.name == 'postgresql' else sqlite.insert
+    stmt = insert(AnalysisSection).values([
+        {'analysis_uuid': analysis_uuid, 'section': str(section), 'data': data} for section, data in sections.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AnalysisSection.analysis_uuid, AnalysisSection.section],
+        set_={'data': stmt.excluded.data}
+    )
+    session.execute(stmt)
+
+def load_sections(session, analysis_uuid) -> dict:
+    """Returns the stored sections of a running or failed analysis as a compact results dict."""
+    rows = session.query(AnalysisSection.section, AnalysisSection.data).filter_by(analysis_uuid=analysis_uuid).all()
+    return {row.section: row.data for row in rows}
+
+class AnalysisBatch(db.Model):
+    """URLs submitted together through /api/analyze/batch, analyzed by the BatchScheduler."""
+    __tablename__ = 'analysis_batches'
+    uuid = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_uuid = db.Column(db.Integer, db.ForeignKey('users.uuid', ondelete='CASCADE'), index=True)
+    time = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)  # refreshed while a scheduler holds the batch; unfinished and stale means interrupted
+    items = db.relationship('AnalysisBatchItem', order_by='AnalysisBatchItem.position', lazy='select', cascade='all, delete-orphan')
+
+class AnalysisBatchItem(db.Model):
+    """One URL of a batch: 'queued', 'running', then 'complete' or 'failed' like its analysis."""
+    __tablename__ = 'analysis_batch_items'
+    batch_uuid = db.Column(db.String, db.ForeignKey('analysis_batches.uuid', ondelete='CASCADE'), primary_key=True)
+    position = db.Column(db.Integer, primary_key=True)
+    url = db.Column(db.String, nullable=False)
+    status = db.Column(db.String, nullable=False, default='queued')
+    analysis_uuid = db.Column(db.String)  # set when the analysis starts
+    error = db.Column(db.String)
+
+class SiteCrawl(db.Model):
+    """A whole-site crawl started through /api/crawl; its frontier is the CrawlPage rows."""
+    __tablename__ = 'site_crawls'
+    uuid = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_uuid = db.Column(db.Integer, db.ForeignKey('users.uuid', ondelete='CASCADE'), index=True)
+    root_url = db.Column(db.String, nullable=False)
+    time = db.Column(db.DateTime)
+    max_depth = db.Column(db.Integer, nullable=False)
+    max_pages = db.Column(db.Integer, nullable=False)
+    is_premium_user = db.Column(db.Boolean, nullable=False, default=False)
+    status = db.Column(db.String, nullable=False, default='running')  # then 'complete' or 'failed'
+    updated_at = db.Column(db.DateTime)  # last progress; a running crawl without progress can be resumed
+    report = db.Column(JSON().with_variant(JSONB(), 'postgresql'))  # aggregated site report, set on completion
+
+class CrawlPage(db.Model):
+    """
+    One URL of a crawl's frontier, in the format_url form. Pages are analyzed in
+    (depth, position) order; 'queued' and 'running' rows are what a resumed crawl
+    continues with. URLs robots.txt disallows are kept as 'disallowed'.
+    """
+    __tablename__ = 'crawl_pages'
+    crawl_uuid = db.Column(db.String, db.ForeignKey('site_crawls.uuid', ondelete='CASCADE'), primary_key=True)
+    url = db.Column(db.String, primary_key=True)
+    position = db.Column(db.Integer, nullable=False)  # discovery order
+    depth = db.Column(db.Integer, nullable=False)  # link hops from the root URL or a sitemap entry
+    status = db.Column(db.String, nullable=False, default='queued')
+    analysis_uuid = db.Column(db.String)
+    error = db.Column(db.String)
+    in_sitemap = db.Column(db.Boolean, nullable=False, default=False, server_default='false')
+    lastmod = db.Column(db.DateTime)  # <lastmod> of the sitemap entry
+
+    __table_args__ = (
+        db.Index('ix_crawl_pages_frontier', 'crawl_uuid', 'status', 'depth', 'position'),
+    )
+
+class AnalysisScreenshot(db.Model):
+    __tablename__ = 'analysis_screenshots'
+    analysis_uuid = db.Column(db.String, db.ForeignKey('analyzed_websites.uuid', ondelete='CASCADE'), primary_key=True)
+    mimetype = db.Column(db.String, default='image/png')
+    etag = db.Column(db.String)
+    image = db.deferred(db.Column(db.LargeBinary))
+    thumbnail = db.deferred(db.Column(db.LargeBinary))
+
 class ChartContent:
+    __slots__ = ('chart_type', 'threshold1', 'threshold2', 'threshold_unit', 'value')
+    is_chart = True
+    bool = ''  # exclude it from the point calculation
+
     def __init__(self, chart_type, threshold1, threshold2, threshold_unit, value):
-        self.is_chart = True
         self.chart_type = chart_type
         self.threshold1 = threshold1
         self.threshold2 = threshold2
@@ -42,7 +217,7 @@ class ChartContent:
 
     def to_dict(self):
         return {
-            'bool': '',  # exclude it from the point calculation
+            'bool': self.bool,
             'isChart': self.is_chart,
             'chartType': self.chart_type,
             'threshold1': self.threshold1,
@@ -52,39 +227,70 @@ class ChartContent:
         }
 
 class Category:
+    """
+    Collects content and counts True/False entries as they are added. Text content is
+    kept as (bool, text) tuples and only turned into dicts once, by to_dict.
+    """
+    __slots__ = ('category_name', 'content', 'true_count', 'false_count')
+
     def __init__(self, category_name):
         self.category_name = category_name
-        self.content = []
+        self.content = []  # (bool, text) tuples and ChartContent objects
+        self.true_count = 0
+        self.false_count = 0
 
     def add_content(self, bool, text):
-        self.content.append(Content(bool, text).to_dict())
+        self.content.append((bool, text))
+        if bool is True:
+            self.true_count += 1
+        elif bool is False:
+            self.false_count += 1
 
     def add_chart_content(self, chart_type, threshold1, threshold2, threshold_unit, value):
-        self.content.append(ChartContent(chart_type, threshold1, threshold2, threshold_unit, value).to_dict())
+        self.content.append(ChartContent(chart_type, threshold1, threshold2, threshold_unit, value))
 
     def to_dict(self):
         return {
             'category_name': self.category_name,
-            'content': self.content
+            'content': [
+                {'bool': content[0], 'text': content[1]} if type(content) is tuple else content.to_dict()
+                for content in self.content
+            ]
         }
 
+class CardResult(dict):
+    """The dict a Card is stored as in the results, carrying its improvement count for Calc."""
+    __slots__ = ('false_count',)
+
 class Card:
+    __slots__ = ('card_name', 'points', 'categories')
+    is_card = True
+
     def __init__(self, card_name):
         self.card_name = card_name
         self.points = 0
-        self.is_card = True
         self.categories = {}
 
     def add_category(self, category):
-        self.categories[category.category_name.lower()] = category.to_dict()
+        self.categories[category.category_name.lower()] = category
+
+    @property
+    def true_count(self):
+        return sum(category.true_count for category in self.categories.values())
+
+    @property
+    def false_count(self):
+        return sum(category.false_count for category in self.categories.values())
 
     def to_dict(self):
-        return {
+        card = CardResult({
             'isCard': self.is_card,
             'card_name': self.card_name,
             'points': self.points,
-            **self.categories
-        }
+            **{key: category.to_dict() for key, category in self.categories.items()}
+        })
+        card.false_count = self.false_count
+        return card
 
     def add_to_results(self, results, index, manual_points=None):
         if manual_points is not None:
@@ -97,15 +303,9 @@ class Card:
         self.points = points
         
     def calculate_points(self):
-        true_count = 0
-        false_count = 0
-        for category in self.categories.values():
-            for content in category['content']:
-                if content['bool'] is True:
-                    true_count += 1
-                elif content['bool'] is False:
-                    false_count += 1
-        total_points = true_count + false_count
+        self.update_points(self.score(self.true_count, self.false_count))
 
-        points_percentage = (true_count / total_points) * 100 if total_points != 0 else 0
-        self.update_points(points_percentage)
+    @staticmethod
+    def score(true_count, false_count):
+        total_points = true_count + false_count
+        return (true_count / total_points) * 100 if total_points != 0 else 0
@@ -11,6 +11,7 @@ class User(db.Model, UserMixin):
     password = db.Column(db.String, nullable=False)
     role = db.Column(db.String)
     authenticated = db.Column(db.Boolean, default=False)
+    analysis_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # kept in sync by analyze_website
     analyzed_websites = db.relationship('AnalyzedWebsite', backref='user', lazy=True)
 
     def __repr__(self):
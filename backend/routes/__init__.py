@@ -3,8 +3,12 @@ def register_routes(app, db, bcrypt):
     from .api_routes import register_api_routes
     from .template_routes import register_template_routes
     from .analysis_routes import register_analysis_routes
+    from .batch_routes import register_batch_routes
+    from .crawl_routes import register_crawl_routes
 
     register_auth_routes(app, db, bcrypt)
     register_api_routes(app, db)
     register_template_routes(app)
-    register_analysis_routes(app, db)
\ No newline at end of file
+    register_analysis_routes(app, db)
+    register_batch_routes(app, db)
+    register_crawl_routes(app, db)
\ No newline at end of file
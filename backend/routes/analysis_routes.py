@@ -1,9 +1,13 @@
-import base64
-from flask import jsonify, Response, stream_with_context
+from flask import jsonify, request, Response, stream_with_context, url_for
 from flask_login import current_user
-from backend.models.results import AnalyzedWebsite
+from backend.models.results import AnalyzedWebsite, AnalysisScreenshot, load_sections
+from backend.analysis.messages import TRANSLATIONS, DEFAULT_LANGUAGE
+from backend.analysis.result_schema import RESULTS_SCHEMA_VERSION, expand_results
 from backend.models.user import UserHierarchy
-from backend.analysis.analyzer import analyze_website
+from backend.analysis.analyzer import RESULT_SECTIONS, analyze_website, settle_status
+from backend.analysis.progress import may_follow, parse_event_id, start_analysis, stream_progress
+from backend.storage.results_cache import get_results_cache, negotiate_encoding
+from backend.config.env import RESULTS_HTTP_MAX_AGE, ANALYSIS_STREAM_MODE
 
 def register_analysis_routes(app, db):
     @app.route('/api/analyze/<path:url>', methods=['GET'])
@@ -28,6 +32,19 @@ def register_analysis_routes(app, db):
             user_uuid = current_user.uuid
             is_premium_user = UserHierarchy.is_higher_than_basic(current_user)
 
+        if ANALYSIS_STREAM_MODE == 'async':
+            # The analysis runs in the worker pool; this request only follows its progress channel.
+            # EventSource reconnects with the last event ID, which resumes the stream instead of starting over.
+            resumed = parse_event_id(request.headers.get('Last-Event-ID'))
+            if resumed:
+                analysis_uuid, after = resumed
+                if not may_follow(db, analysis_uuid, user_uuid):
+                    return jsonify({"error": "Not Found"}), 404
+            else:
+                analysis_uuid, after = start_analysis(app, db, user_uuid, url, is_premium_user), 0
+            return Response(stream_progress(app, db, analysis_uuid, after, user_uuid), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
         @stream_with_context
         def generate():
             yield from analyze_website(user_uuid, url, db, is_premium_user, send_progress=True)
@@ -36,8 +53,95 @@ def register_analysis_routes(app, db):
 
     @app.route('/api/get_results/<uuid:uuid>', methods=['GET'])
     def get_results(uuid):
-        result = db.session.query(AnalyzedWebsite).filter_by(uuid=str(uuid)).first()
-        if not result:
+        """
+        Completed analyses don't change, so their serialized body is kept in an in-process
+        LRU per language and served with a strong ETag, long-lived caching and gzip/brotli
+        compression. A matching If-None-Match is answered with 304 without touching the
+        database while the body is cached.
+
+        While an analysis is running (or after it failed) the sections stored so far are
+        returned uncached; 'status' and 'sections' tell which ones are still missing. An
+        analysis running for longer than ANALYSIS_STALE_AFTER_SECONDS lost its worker and
+        is reported (and stored) as failed.
+        """
+        language = results_language()
+        cache = get_results_cache()
+        key = (str(uuid), language)
+        entry = cache.get(key)
+        if entry is None:
+            result = db.session.query(AnalyzedWebsite).filter_by(uuid=str(uuid)).first()
+            if not result:
+                return jsonify({"error": "Not Found"}), 404
+            status = settle_status(db.session, result.uuid, result.status, result.time)
+            if status != 'complete':
+                results = expand_results({**load_sections(db.session, result.uuid), 'schema_version': RESULTS_SCHEMA_VERSION}, language)
+                response = jsonify({
+                    "status": status,
+                    "sections": section_status(results, status),
+                    "results": results,
+                    "screenshot_url": None,
+                    "thumbnail_url": None
+                })
+                response.headers['Cache-Control'] = 'no-store'
+                return response
+            screenshot = result.screenshot_record  # image data is deferred, only the metadata is loaded
+            results = expand_results(result.results or {}, language)
+            entry = cache.put(key, app.json.response({
+                "status": result.status,
+                "sections": section_status(results, result.status),
+                "results": results,
+                "screenshot_url": url_for('get_screenshot', uuid=uuid) if screenshot else None,
+                "thumbnail_url": url_for('get_screenshot_thumbnail', uuid=uuid) if screenshot and screenshot.etag else None
+            }).get_data())
+
+        encoding = negotiate_encoding(request.accept_encodings)
+        etag = entry.variant_etag(encoding)
+        if etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            response = Response(cache.body(key, entry, encoding), mimetype=app.json.mimetype)
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = f'public, max-age={RESULTS_HTTP_MAX_AGE}, immutable'
+        response.vary.update(('Accept-Encoding', 'Accept-Language'))
+        return response
+
+    @app.route('/api/get_screenshot/<uuid:uuid>', methods=['GET'])
+    def get_screenshot(uuid):
+        return send_screenshot(uuid, AnalysisScreenshot.image)
+
+    @app.route('/api/get_screenshot/<uuid:uuid>/thumbnail', methods=['GET'])
+    def get_screenshot_thumbnail(uuid):
+        return send_screenshot(uuid, AnalysisScreenshot.thumbnail)
+
+    def results_language():
+        """Language to render result texts in: ?lang=, else the best Accept-Language match."""
+        language = request.args.get('lang')
+        if language in TRANSLATIONS:
+            return language
+        return request.accept_languages.best_match(TRANSLATIONS) or DEFAULT_LANGUAGE
+
+    def section_status(results, status):
+        """'complete' for every section present, the others are 'pending' while the analysis runs, else 'failed'."""
+        missing = 'pending' if status == 'running' else 'failed'
+        return {section: 'complete' if section in results else missing for section in RESULT_SECTIONS}
+
+    def send_screenshot(uuid, column):
+        """Serves a screenshot binary with long-lived caching. Answers 304 without loading the image if the ETag matches."""
+        screenshot = db.session.query(AnalysisScreenshot.mimetype, AnalysisScreenshot.etag).filter_by(analysis_uuid=str(uuid)).first()
+        if not screenshot:
             return jsonify({"error": "Not Found"}), 404
-        screenshot_blob = base64.b64encode(result.screenshot).decode('utf-8') if result.screenshot else None
-        return jsonify({"results": result.results, "screenshot": screenshot_blob}), 200
\ No newline at end of file
+        # Rows migrated from the PNG column have no etag (and no thumbnail) until 'flask screenshots-compress' ran
+        etag = f"{screenshot.etag}-{column.key}" if screenshot.etag else None
+        if etag and etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            data = db.session.query(column).filter_by(analysis_uuid=str(uuid)).scalar()
+            if not data:
+                return jsonify({"error": "Not Found"}), 404
+            response = Response(data, mimetype=screenshot.mimetype)
+        if etag:
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
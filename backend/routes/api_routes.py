@@ -1,65 +1,157 @@
+import datetime
+import re
 from flask import jsonify, redirect, request, url_for
 from flask_login import login_required, current_user
+from sqlalchemy import and_, func, tuple_
 from backend.models.user import User
-from backend.models.results import AnalyzedWebsite
+from backend.models.results import AnalyzedWebsite, TrackedUrl
+from backend.analysis.circuit_breaker import circuit_breaker_states
 
 def register_api_routes(app, db):
     @app.route('/api/profile/get_analyses', methods=['POST'])
     @login_required
     def get_users_analysis():
+        """
+        Server-side DataTables endpoint, newest analyses first.
+        Pages are sought by (time, uuid): every response carries a cursor for the row after
+        it, which the table sends back as 'cursor' when it moves to the next page. Requests
+        without a cursor (first page, page jumps) fall back to OFFSET. Legacy rows without a
+        time come last, newest uuid first.
+        """
         draw = int(request.form.get('draw', 1))
         start = int(request.form.get('start', 0))
         length = int(request.form.get('length', 10))
         search_value = request.form.get('search[value]', '').lower()
         url_filter = request.form.get('url_filter', '').lower()
+        cursor = decode_cursor(request.form.get('cursor', ''))
 
         user_uuid = current_user.uuid
-        query = db.session.query(AnalyzedWebsite).filter_by(user_uuid=user_uuid)
+        query = db.session.query(
+            AnalyzedWebsite.uuid, AnalyzedWebsite.time, AnalyzedWebsite.url,
+            AnalyzedWebsite.overall_rating, AnalyzedWebsite.improvement_count
+        ).filter_by(user_uuid=user_uuid, status='complete')
 
-        if search_value:
-            query = query.filter(AnalyzedWebsite.url.ilike(f'%{search_value}%'))
-        if url_filter:
-            query = query.filter(AnalyzedWebsite.url.ilike(f'%{url_filter}%'))
+        url_condition = url_search_condition(search_value, url_filter)
+        if url_condition is not None:
+            query = query.filter(url_condition)
 
-        records_filtered = query.count()
-        results_paginated = query.order_by(AnalyzedWebsite.time.desc()).offset(start).limit(length).all()
+        records_total = current_user.analysis_count
+        # Only filtered views need a COUNT(*), answered by the trigram index
+        if not (search_value or url_filter):
+            records_filtered = records_total
+        else:
+            records_filtered = query.order_by(None).count()
+
+        untimed = query.filter(AnalyzedWebsite.time.is_(None)).order_by(AnalyzedWebsite.uuid.desc())
+        if cursor and cursor[0] is None:
+            results_paginated = untimed.filter(AnalyzedWebsite.uuid < cursor[1]).limit(length).all()
+        elif cursor:
+            results_paginated = (query.filter(tuple_(AnalyzedWebsite.time, AnalyzedWebsite.uuid) < cursor)
+                                 .order_by(AnalyzedWebsite.time.desc(), AnalyzedWebsite.uuid.desc()).limit(length).all())
+            if len(results_paginated) < length:  # past the last timed row, continue with the untimed ones
+                results_paginated += untimed.limit(length - len(results_paginated)).all()
+        else:
+            results_paginated = (query.order_by(AnalyzedWebsite.time.desc().nulls_last(), AnalyzedWebsite.uuid.desc())
+                                 .offset(start).limit(length).all())
 
         data = [{
             "uuid": a.uuid,
             "time": a.time.isoformat() if a.time else "Unknown",
             "url": a.url,
-            "overall_rating": a.results['overall_results']['overall_rating'],
-            "improvement_count": a.results['overall_results']['improvement_count']
+            "overall_rating": a.overall_rating,
+            "improvement_count": a.improvement_count
         } for a in results_paginated]
 
-        records_total = db.session.query(AnalyzedWebsite).filter_by(user_uuid=user_uuid).count()
         return jsonify({
             "draw": draw,
             "recordsTotal": records_total,
             "recordsFiltered": records_filtered,
-            "data": data
+            "data": data,
+            "next_cursor": encode_cursor(results_paginated[-1]) if len(results_paginated) == length else None
         })
 
     @app.route('/api/profile/get_all_urls', methods=['GET'])
     @login_required
     def get_all_urls():
-        urls = db.session.query(AnalyzedWebsite.url).filter_by(user_uuid=current_user.uuid).distinct().all()
+        urls = db.session.query(TrackedUrl.url).filter_by(user_uuid=current_user.uuid).order_by(TrackedUrl.url).all()
         return jsonify([url[0] for url in urls])
 
+    @app.route('/api/profile/get_url_overview', methods=['GET'])
+    @login_required
+    def get_url_overview():
+        tracked_urls = db.session.query(TrackedUrl).filter_by(user_uuid=current_user.uuid).order_by(TrackedUrl.last_analyzed.desc()).all()
+        return jsonify([t.to_dict() for t in tracked_urls])
+
     @app.route('/api/profile/get_analyses_by_url', methods=['GET'])
     @login_required
     def get_analyses_by_url():
         url = request.args.get('url', type=str)
-        analyses = db.session.query(AnalyzedWebsite).filter_by(user_uuid=current_user.uuid, url=url).order_by(AnalyzedWebsite.time).all()
+        analyses = db.session.query(
+            AnalyzedWebsite.time, AnalyzedWebsite.overall_rating, AnalyzedWebsite.improvement_count
+        ).filter_by(user_uuid=current_user.uuid, url=url, status='complete').order_by(AnalyzedWebsite.time).all()
 
         data = [{
             'time': a.time.isoformat() if a.time else None,
-            'overall_rating': a.results.get('overall_results', {}).get('overall_rating'),
-            'improvement_count': a.results.get('overall_results', {}).get('improvement_count')
+            'overall_rating': a.overall_rating,
+            'improvement_count': a.improvement_count
         } for a in analyses]
 
         return jsonify(data)
 
+    @app.route('/api/profile/get_rating_series', methods=['GET'])
+    @login_required
+    def get_rating_series():
+        """
+        Rating history of one URL aggregated per day, week or month in SQL.
+        Query parameters: url, bucket (day|week|month|auto), from and to (ISO dates, 'to' inclusive).
+        'auto' picks the finest bucket that yields at most SERIES_MAX_POINTS points.
+        """
+        url = request.args.get('url', type=str)
+        bucket = request.args.get('bucket', 'auto')
+        try:
+            date_from = parse_query_datetime(request.args.get('from'))
+            date_to = parse_query_datetime(request.args.get('to'))
+        except ValueError:
+            return jsonify({"error": "Invalid date, use YYYY-MM-DD"}), 400
+        if date_to and len(request.args['to']) <= 10:
+            date_to += datetime.timedelta(days=1)  # a plain date includes the whole day
+        if bucket != 'auto' and bucket not in SERIES_BUCKETS:
+            return jsonify({"error": f"Invalid bucket, use one of: auto, {', '.join(SERIES_BUCKETS)}"}), 400
+
+        if bucket == 'auto':
+            tracked = db.session.get(TrackedUrl, (current_user.uuid, url))
+            if not tracked:
+                return jsonify({"bucket": None, "data": []})
+            start = max((d for d in (date_from, tracked.first_seen) if d), default=None)
+            end = date_to or tracked.last_analyzed
+            span = end - start if start and end and end > start else datetime.timedelta(0)
+            bucket = next((b for b, days in SERIES_BUCKETS.items() if span.days / days <= SERIES_MAX_POINTS), 'month')
+
+        bucket_start = time_bucket(AnalyzedWebsite.time, bucket, db.engine.dialect.name).label('bucket_start')
+        query = db.session.query(
+            bucket_start,
+            func.count().label('count'),
+            func.min(AnalyzedWebsite.overall_rating).label('rating_min'),
+            func.avg(AnalyzedWebsite.overall_rating).label('rating_avg'),
+            func.max(AnalyzedWebsite.overall_rating).label('rating_max'),
+            func.min(AnalyzedWebsite.improvement_count).label('improvements_min'),
+            func.avg(AnalyzedWebsite.improvement_count).label('improvements_avg'),
+            func.max(AnalyzedWebsite.improvement_count).label('improvements_max'),
+        ).filter_by(user_uuid=current_user.uuid, url=url, status='complete')
+        if date_from:
+            query = query.filter(AnalyzedWebsite.time >= date_from)
+        if date_to:
+            query = query.filter(AnalyzedWebsite.time < date_to)
+        buckets = query.group_by(bucket_start).order_by(bucket_start).all()
+
+        data = [{
+            'time': b.bucket_start.isoformat() if isinstance(b.bucket_start, datetime.datetime) else str(b.bucket_start),
+            'count': b.count,
+            'overall_rating': {'min': b.rating_min, 'avg': round(float(b.rating_avg), 1) if b.rating_avg is not None else None, 'max': b.rating_max},
+            'improvement_count': {'min': b.improvements_min, 'avg': round(float(b.improvements_avg), 1) if b.improvements_avg is not None else None, 'max': b.improvements_max},
+        } for b in buckets]
+        return jsonify({"bucket": bucket, "data": data})
+
     @app.route('/api/roles/upgrade_user', methods=['POST'])
     def upgrade_user():
         if not current_user.is_authenticated:
@@ -67,4 +159,78 @@ def register_api_routes(app, db):
         user = db.session.query(User).filter_by(uuid=current_user.uuid).first()
         user.role = 'premium'
         db.session.commit()
-        return jsonify({"message": "User upgraded to premium"}), 200
\ No newline at end of file
+        return jsonify({"message": "User upgraded to premium"}), 200
+
+    @app.route('/api/status/circuit_breakers', methods=['GET'])
+    def get_circuit_breakers():
+        return jsonify(circuit_breaker_states()), 200
+
+SERIES_BUCKETS = {'day': 1, 'week': 7, 'month': 30}  # approximate length in days, for the 'auto' bucket
+SERIES_MAX_POINTS = 120
+
+def time_bucket(column, bucket, dialect):
+    """Start of the day/week (Monday)/month containing column, as an SQL expression."""
+    if dialect == 'postgresql':
+        return func.date_trunc(bucket, column)
+    # SQLite (local development) has no date_trunc
+    if bucket == 'day':
+        return func.date(column)
+    if bucket == 'week':
+        return func.date(column, 'weekday 0', '-6 days')
+    return func.strftime('%Y-%m-01', column)
+
+def url_search_condition(*terms):
+    """
+    Builds the URL filter for the given search terms (None if there are none) as LIKE
+    patterns on lower(url), which the trigram index answers. Stored URLs have no scheme or 'www.', so a term typed as a
+    full URL ('https://www.example.de/blog') matches as a prefix, anything else as a substring.
+    Terms implied by another term are dropped, e.g. a search within the selected URL filter: a
+    substring term contained in any other term, a prefix term that starts another prefix term.
+    """
+    patterns = {}
+    for term in terms:
+        term = (term or '').strip().lower()
+        anchored = bool(re.match(r'^(https?://|www\.)', term))
+        term = re.sub(r'^(https?://)?(www\.)?', '', term)
+        if term:
+            patterns[term] = patterns.get(term, False) or anchored
+
+    def implies(other, term):
+        if patterns[term]:
+            return patterns[other] and other.startswith(term)
+        return term in other
+    terms = [t for t in patterns if not any(t != other and implies(other, t) for other in patterns)]
+    if not terms:
+        return None
+    conditions = [
+        func.lower(AnalyzedWebsite.url).like(('' if patterns[t] else '%') + escape_like(t) + '%', escape='\\')
+        for t in terms
+    ]
+    return conditions[0] if len(conditions) == 1 else and_(*conditions)
+
+def parse_query_datetime(value):
+    """ISO date or datetime of a query parameter as naive UTC, like the stored timestamps; None if empty. Raises ValueError."""
+    if not value:
+        return None
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def escape_like(term: str) -> str:
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def encode_cursor(row) -> str:
+    return f"{row.time.isoformat() if row.time else ''}|{row.uuid}"
+
+def decode_cursor(cursor: str):
+    """Returns (time, uuid) for a cursor from encode_cursor (time None for an untimed row), or None if it's missing or malformed."""
+    time, _, uuid = cursor.partition('|')
+    if not uuid:
+        return None
+    if not time:
+        return None, uuid
+    try:
+        return datetime.datetime.fromisoformat(time), uuid
+    except ValueError:
+        return None
\ No newline at end of file
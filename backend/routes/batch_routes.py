@@ -0,0 +1,77 @@
+import datetime
+from collections import Counter
+
+from flask import jsonify, request, url_for
+from flask_login import login_required, current_user
+from backend.models.results import AnalyzedWebsite, AnalysisBatch, AnalysisBatchItem
+from backend.models.user import UserHierarchy
+from backend.analysis.fetcher import format_url
+from backend.analysis.batches import get_batch_scheduler, requeue_if_interrupted
+from backend.config.env import BATCH_MAX_URLS
+
+BATCH_ITEM_STATUSES = ('queued', 'running', 'complete', 'failed')
+
+def register_batch_routes(app, db):
+    @app.route('/api/analyze/batch', methods=['POST'])
+    @login_required
+    def submit_batch():
+        """Queues a JSON list of URLs ({"urls": [...]}) for analysis. Duplicates are analyzed once."""
+        urls = (request.get_json(silent=True) or {}).get('urls')
+        if not isinstance(urls, list) or not all(isinstance(url, str) and url.strip() for url in urls):
+            return jsonify({"error": "Expected a JSON object with a list of URLs: {\"urls\": [...]}"}), 400
+        urls = list(dict.fromkeys(format_url(url.strip()) for url in urls))
+        if not urls or len(urls) > BATCH_MAX_URLS:
+            return jsonify({"error": f"A batch must contain between 1 and {BATCH_MAX_URLS} URLs."}), 400
+
+        now = datetime.datetime.now()
+        batch = AnalysisBatch(user_uuid=current_user.uuid, time=now, updated_at=now,
+                              items=[AnalysisBatchItem(position=position, url=url) for position, url in enumerate(urls)])
+        db.session.add(batch)
+        db.session.commit()
+        get_batch_scheduler(app, db).submit(batch.uuid, current_user.uuid, UserHierarchy.is_higher_than_basic(current_user), list(enumerate(urls)))
+        return jsonify({
+            "message": "Batch queued",
+            "uuid": batch.uuid,
+            "url_count": len(urls),
+            "status_url": url_for('get_batch', uuid=batch.uuid)
+        }), 202
+
+    @app.route('/api/analyze/batch/<uuid:uuid>', methods=['GET'])
+    @login_required
+    def get_batch(uuid):
+        """
+        Aggregate progress of a batch and one entry per URL, with the rating once its analysis is complete.
+        A batch whose process exited with items left is queued again here (see requeue_if_interrupted).
+        """
+        batch = db.session.get(AnalysisBatch, str(uuid))
+        if not batch or batch.user_uuid != current_user.uuid:
+            return jsonify({"error": "Not Found"}), 404
+        requeue_if_interrupted(app, db, batch, UserHierarchy.is_higher_than_basic(current_user))
+
+        rows = db.session.query(
+            AnalysisBatchItem, AnalyzedWebsite.overall_rating, AnalyzedWebsite.improvement_count
+        ).outerjoin(
+            AnalyzedWebsite, AnalyzedWebsite.uuid == AnalysisBatchItem.analysis_uuid
+        ).filter(AnalysisBatchItem.batch_uuid == batch.uuid).order_by(AnalysisBatchItem.position).all()
+
+        counts = Counter(item.status for item, _, _ in rows)
+        finished = counts['complete'] + counts['failed']
+        return jsonify({
+            "uuid": batch.uuid,
+            "time": batch.time.isoformat() if batch.time else None,
+            "status": 'complete' if finished == len(rows) else 'running',
+            "progress": {
+                "total": len(rows),
+                **{status: counts[status] for status in BATCH_ITEM_STATUSES},
+                "percent": round(finished / len(rows) * 100) if rows else 100
+            },
+            "items": [{
+                "position": item.position,
+                "url": item.url,
+                "status": item.status,
+                "analysis_uuid": item.analysis_uuid,
+                "overall_rating": overall_rating if item.status == 'complete' else None,
+                "improvement_count": improvement_count if item.status == 'complete' else None,
+                "error": item.error
+            } for item, overall_rating, improvement_count in rows]
+        })
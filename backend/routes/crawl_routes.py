@@ -0,0 +1,115 @@
+import datetime
+
+from flask import jsonify, request, url_for
+from flask_login import login_required, current_user
+from sqlalchemy import func
+from backend.models.results import AnalyzedWebsite, SiteCrawl, CrawlPage
+from backend.models.user import UserHierarchy
+from backend.analysis.fetcher import format_url
+from backend.analysis.crawler import start_crawl, is_stale
+from backend.config.env import CRAWL_MAX_PAGES, CRAWL_MAX_DEPTH
+
+CRAWL_PAGE_STATUSES = ('queued', 'running', 'complete', 'failed', 'disallowed')
+
+def register_crawl_routes(app, db):
+    @app.route('/api/crawl', methods=['POST'])
+    @login_required
+    def submit_crawl():
+        """Starts a site crawl: {"url": ..., "max_depth": 3, "max_pages": 500}."""
+        data = request.get_json(silent=True) or {}
+        url = data.get('url')
+        max_depth = data.get('max_depth', 3)
+        max_pages = data.get('max_pages', 500)
+        if not isinstance(url, str) or not url.strip():
+            return jsonify({"error": "Expected a JSON object with the URL to crawl: {\"url\": ...}"}), 400
+        if type(max_depth) is not int or not 0 <= max_depth <= CRAWL_MAX_DEPTH:
+            return jsonify({"error": f"max_depth must be between 0 and {CRAWL_MAX_DEPTH}."}), 400
+        if type(max_pages) is not int or not 1 <= max_pages <= CRAWL_MAX_PAGES:
+            return jsonify({"error": f"max_pages must be between 1 and {CRAWL_MAX_PAGES}."}), 400
+
+        now = datetime.datetime.now()
+        crawl = SiteCrawl(user_uuid=current_user.uuid, root_url=format_url(url.strip()), time=now, updated_at=now,
+                          max_depth=max_depth, max_pages=max_pages,
+                          is_premium_user=UserHierarchy.is_higher_than_basic(current_user))
+        db.session.add(crawl)
+        db.session.commit()
+        start_crawl(app, db, crawl.uuid)
+        return jsonify({"message": "Crawl started", "uuid": crawl.uuid, "status_url": url_for('get_crawl', uuid=crawl.uuid)}), 202
+
+    @app.route('/api/crawl/<uuid:uuid>', methods=['GET'])
+    @login_required
+    def get_crawl(uuid):
+        """Progress of a crawl (pages per status) and, once it is complete, the aggregated site report."""
+        crawl = owned_crawl(uuid)
+        if crawl is None:
+            return jsonify({"error": "Not Found"}), 404
+        counts = dict(db.session.query(CrawlPage.status, func.count()).filter_by(crawl_uuid=crawl.uuid).group_by(CrawlPage.status).all())
+        return jsonify({
+            "uuid": crawl.uuid,
+            "root_url": crawl.root_url,
+            "time": crawl.time.isoformat() if crawl.time else None,
+            "status": crawl.status,
+            "resumable": crawl.status == 'failed' or (crawl.status == 'running' and is_stale(crawl)),
+            "max_depth": crawl.max_depth,
+            "max_pages": crawl.max_pages,
+            "pages": {status: counts.get(status, 0) for status in CRAWL_PAGE_STATUSES},
+            "report": crawl.report,
+            "pages_url": url_for('get_crawl_pages', uuid=crawl.uuid)
+        })
+
+    @app.route('/api/crawl/<uuid:uuid>/pages', methods=['GET'])
+    @login_required
+    def get_crawl_pages(uuid):
+        """Pages of a crawl in discovery order, keyset-paginated: ?after=<position>&limit=100&status=complete."""
+        crawl = owned_crawl(uuid)
+        if crawl is None:
+            return jsonify({"error": "Not Found"}), 404
+        after = request.args.get('after', -1, type=int)
+        limit = min(request.args.get('limit', 100, type=int), 1000)
+        query = db.session.query(
+            CrawlPage, AnalyzedWebsite.overall_rating, AnalyzedWebsite.improvement_count
+        ).outerjoin(
+            AnalyzedWebsite, AnalyzedWebsite.uuid == CrawlPage.analysis_uuid
+        ).filter(CrawlPage.crawl_uuid == crawl.uuid, CrawlPage.position > after)
+        if request.args.get('status') in CRAWL_PAGE_STATUSES:
+            query = query.filter(CrawlPage.status == request.args['status'])
+        rows = query.order_by(CrawlPage.position).limit(limit).all()
+        return jsonify({
+            "pages": [{
+                "position": page.position,
+                "url": page.url,
+                "depth": page.depth,
+                "in_sitemap": page.in_sitemap,
+                "lastmod": page.lastmod.isoformat() if page.lastmod else None,
+                "status": page.status,
+                "analysis_uuid": page.analysis_uuid,
+                "overall_rating": overall_rating if page.status == 'complete' else None,
+                "improvement_count": improvement_count if page.status == 'complete' else None,
+                "error": page.error
+            } for page, overall_rating, improvement_count in rows],
+            "next_after": rows[-1][0].position if len(rows) == limit else None
+        })
+
+    @app.route('/api/crawl/<uuid:uuid>/resume', methods=['POST'])
+    @login_required
+    def resume_crawl(uuid):
+        """Continues a failed or interrupted crawl with its stored frontier."""
+        crawl = owned_crawl(uuid)
+        if crawl is None:
+            return jsonify({"error": "Not Found"}), 404
+        if not (crawl.status == 'failed' or (crawl.status == 'running' and is_stale(crawl))):
+            return jsonify({"error": f"The crawl is {crawl.status} and can't be resumed."}), 409
+        # Only one request (on any host) may take over the frontier: claim it with the state we saw
+        seen = SiteCrawl.updated_at == crawl.updated_at if crawl.updated_at else SiteCrawl.updated_at.is_(None)
+        claimed = db.session.query(SiteCrawl).filter(SiteCrawl.uuid == crawl.uuid, SiteCrawl.status == crawl.status, seen).update(
+            {'status': 'running', 'updated_at': datetime.datetime.now()}, synchronize_session=False)
+        db.session.commit()
+        if not claimed:
+            return jsonify({"error": "The crawl was resumed or made progress meanwhile."}), 409
+        if not start_crawl(app, db, crawl.uuid):
+            return jsonify({"error": "The crawl is still running."}), 409
+        return jsonify({"message": "Crawl resumed", "uuid": crawl.uuid}), 202
+
+    def owned_crawl(uuid):
+        crawl = db.session.get(SiteCrawl, str(uuid))
+        return crawl if crawl and crawl.user_uuid == current_user.uuid else None
@@ -5,6 +5,8 @@ from flask_bcrypt import Bcrypt
 
 from backend.models.user import db, User
 from backend.routes import register_routes
+from backend.cli import register_commands
+from backend import json_provider
 
 from backend.config.env import POSTGRES_DATABASE_URL, FLASK_SECRET_KEY
 
@@ -14,8 +16,13 @@ def create_app():
             template_folder="../frontend/templates")
 
     app.config['SQLALCHEMY_DATABASE_URI'] = POSTGRES_DATABASE_URL
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'json_serializer': json_provider.dumps,
+        'json_deserializer': json_provider.loads
+    }
     app.secret_key = FLASK_SECRET_KEY
 
+    app.json = json_provider.FastJSONProvider(app)
     app.json.sort_keys = False
 
     db.init_app(app)
@@ -30,6 +37,7 @@ def create_app():
     bcrypt = Bcrypt(app)
 
     register_routes(app, db, bcrypt)
+    register_commands(app, db)
 
     CORS(app)
 
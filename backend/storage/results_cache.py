@@ -0,0 +1,109 @@
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is offered
+    brotli = None
+
+from backend.config.env import RESULTS_CACHE_MAX_BYTES, RESULTS_CACHE_TTL_SECONDS
+
+CONTENT_ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6, mtime=0)  # mtime=0 keeps the bytes (and ETag) stable across workers
+
+class CachedBody:
+    """A serialized response body, its ETag and the compressed variants built so far."""
+    __slots__ = ('etag', 'bodies', 'expires_at')
+
+    def __init__(self, body: bytes, ttl):
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.bodies = {'identity': body}
+        self.expires_at = time.monotonic() + ttl
+
+    @property
+    def size(self):
+        return sum(len(body) for body in self.bodies.values())
+
+    def variant_etag(self, encoding):
+        return self.etag if encoding == 'identity' else f"{self.etag}-{encoding}"
+
+class ResponseBodyCache:
+    """
+    In-process LRU of serialized response bodies, bounded by the total size of the
+    bodies (including their compressed variants). Entries expire after ttl seconds,
+    so bodies rewritten by another process (e.g. 'flask rescore') are picked up.
+    """
+
+    def __init__(self, max_bytes=RESULTS_CACHE_MAX_BYTES, ttl=RESULTS_CACHE_TTL_SECONDS):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key) -> CachedBody | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, body: bytes) -> CachedBody:
+        entry = CachedBody(body, self.ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if entry.size <= self.max_bytes:
+                self._entries[key] = entry
+                self._size += entry.size
+                self._evict()
+        return entry
+
+    def body(self, key, entry: CachedBody, encoding: str) -> bytes:
+        """Returns the entry's body in the given content encoding, compressing it once."""
+        body = entry.bodies.get(encoding)
+        if body is None:
+            body = _compress(entry.bodies['identity'], encoding)
+            with self._lock:
+                if encoding not in entry.bodies:
+                    entry.bodies[encoding] = body
+                    if self._entries.get(key) is entry:
+                        self._size += len(body)
+                        self._evict()
+        return body
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key):
+        self._size -= self._entries.pop(key).size
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+
+_results_cache = None
+
+def get_results_cache() -> ResponseBodyCache:
+    """Returns the process-wide cache of /api/get_results bodies."""
+    global _results_cache
+    if _results_cache is None:
+        _results_cache = ResponseBodyCache()
+    return _results_cache
+
+def negotiate_encoding(accept_encodings) -> str:
+    """Picks br or gzip from a werkzeug Accept-Encoding header, else 'identity'."""
+    return accept_encodings.best_match(CONTENT_ENCODINGS) or 'identity'
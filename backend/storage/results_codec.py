@@ -0,0 +1,159 @@
+import datetime
+import os
+import threading
+from pathlib import Path
+
+import zstandard
+from flask import has_app_context
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from backend.config.env import RESULTS_COMPRESSION_LEVEL, RESULTS_DICTIONARY_PATH
+from backend.json_provider import dumps_bytes, loads
+
+class ResultsCodec:
+    """
+    zstd codec for the results JSON.
+
+    Serialization goes through backend.json_provider (orjson if installed).
+    Compression uses the newest trained dictionary, if any (see 'flask
+    results-train-dictionary'). zstd records the dictionary ID in every frame,
+    so rows written with older dictionaries stay readable. Dictionaries are
+    stored in the results_dictionaries table, so every host can read every row;
+    dictionary_dir is only a local cache (and all there is outside an app context).
+    """
+
+    def __init__(self, dictionary_dir=RESULTS_DICTIONARY_PATH, level=RESULTS_COMPRESSION_LEVEL):
+        self.dictionary_dir = Path(dictionary_dir)
+        self.level = level
+        self._dictionaries = {}  # dict_id -> ZstdCompressionDict
+        self._active = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load_dictionaries(self):
+        with self._lock:
+            if self._loaded:
+                return
+            stored = self._cached_dictionaries()
+            if has_app_context():
+                try:
+                    stored = self._sync_with_db(stored)
+                except SQLAlchemyError as e:
+                    print(f"Warning: Could not load the results dictionaries from the database, using {self.dictionary_dir} only: {e}")
+            for data, created_at in sorted(stored.values(), key=lambda entry: entry[1]):
+                dictionary = zstandard.ZstdCompressionDict(data)
+                dictionary.precompute_compress(level=self.level)
+                self._dictionaries[dictionary.dict_id()] = dictionary
+                self._active = dictionary  # the newest one wins
+            self._loaded = True
+
+    def _cached_dictionaries(self) -> dict:
+        """dict_id -> (data, created_at) of the dictionaries in the local cache."""
+        cached = {}
+        for path in self.dictionary_dir.glob('*.zdict') if self.dictionary_dir.is_dir() else []:
+            data = path.read_bytes()
+            cached[zstandard.ZstdCompressionDict(data).dict_id()] = (data, datetime.datetime.fromtimestamp(path.stat().st_mtime))
+        return cached
+
+    def _sync_with_db(self, cached: dict) -> dict:
+        """
+        Returns the dictionaries of the results_dictionaries table, after copying cached ones
+        the table doesn't have (trained before dictionaries were stored there) into it, and
+        caches the table's dictionaries locally.
+        """
+        from backend.models import db
+        from backend.models.results import ResultsDictionary
+
+        table = ResultsDictionary.__table__
+        with db.engine.begin() as connection:
+            stored = {row.dict_id: (row.data, row.created_at) for row in connection.execute(select(table))}
+            missing = {dict_id: entry for dict_id, entry in cached.items() if dict_id not in stored}
+            if missing:
+                _insert_dictionaries(connection, missing)
+        for dict_id, (data, _) in stored.items():
+            if dict_id not in cached:
+                self._write_cache(dict_id, data)
+        return {**missing, **stored}
+
+    def _write_cache(self, dict_id, data: bytes):
+        try:
+            self.dictionary_dir.mkdir(parents=True, exist_ok=True)
+            path = self.dictionary_dir / f"{dict_id}.zdict"
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not cache results dictionary {dict_id} in {self.dictionary_dir}: {e}")
+
+    def reload(self):
+        """Picks up newly trained dictionaries."""
+        with self._lock:
+            self._dictionaries, self._active, self._loaded = {}, None, False
+
+    def encode(self, results: dict) -> bytes:
+        self._load_dictionaries()
+        compressor = zstandard.ZstdCompressor(level=self.level, dict_data=self._active)
+        return compressor.compress(dumps_bytes(results))
+
+    def decode(self, data: bytes) -> dict:
+        self._load_dictionaries()
+        dict_id = zstandard.get_frame_parameters(data).dict_id
+        dictionary = None
+        if dict_id:
+            dictionary = self._dictionaries.get(dict_id)
+            if dictionary is None:
+                self.reload()  # trained by another process since we loaded
+                self._load_dictionaries()
+                dictionary = self._dictionaries.get(dict_id)
+            if dictionary is None:
+                raise LookupError(f"Results were compressed with dictionary {dict_id}, which is missing from the results_dictionaries table.")
+        # decompressobj, as frames written before the content size was recorded don't have it
+        return loads(zstandard.ZstdDecompressor(dict_data=dictionary).decompressobj().decompress(data))
+
+    def save_dictionary(self, dictionary: zstandard.ZstdCompressionDict) -> int:
+        """Stores a trained dictionary in the DB (needs an app context), makes it the active one and returns its ID."""
+        from backend.models import db
+
+        dict_id, data = dictionary.dict_id(), dictionary.as_bytes()
+        with db.engine.begin() as connection:
+            _insert_dictionaries(connection, {dict_id: (data, datetime.datetime.now())})
+        self._write_cache(dict_id, data)
+        self.reload()
+        return dict_id
+
+def _insert_dictionaries(connection, dictionaries: dict):
+    """Inserts dict_id -> (data, created_at); dictionaries another process inserted first are left alone."""
+    from backend.models.results import ResultsDictionary
+
+    insert = postgresql.insert if connection.dialect.name == 'postgresql' else sqlite.insert
+    stmt = insert(ResultsDictionary).values([
+        {'dict_id': dict_id, 'data': data, 'created_at': created_at} for dict_id, (data, created_at) in dictionaries.items()
+    ])
+    connection.execute(stmt.on_conflict_do_nothing(index_elements=[ResultsDictionary.dict_id]))
+
+_codec = None
+
+def get_results_codec() -> ResultsCodec:
+    """Returns the process-wide results codec."""
+    global _codec
+    if _codec is None:
+        _codec = ResultsCodec()
+    return _codec
+
+def train_dictionary(samples: list[dict], size: int) -> zstandard.ZstdCompressionDict:
+    """Trains a zstd dictionary on results as the codec serializes them."""
+    return zstandard.train_dictionary(size, [dumps_bytes(results) for results in samples])
+
+class CompressedJSON(TypeDecorator):
+    """Column type storing JSON compressed with the results codec. (De)compression happens in the DB layer, so callers see dicts."""
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return get_results_codec().encode(value) if value is not None else None
+
+    def process_result_value(self, value, dialect):
+        return get_results_codec().decode(bytes(value)) if value is not None else None
@@ -0,0 +1,108 @@
+import datetime
+import hashlib
+import json
+import os
+import zlib
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from backend.config.env import SNAPSHOT_STORE_PATH
+
+SNAPSHOT_VERSION = 1
+COMPRESSION_LEVEL = 6
+
+class SnapshotNotFound(KeyError):
+    pass
+
+class SnapshotStore:
+    """
+    Content-addressed store for everything fetched during an analysis.
+
+    Every blob (rendered HTML, static body, screenshot, manifest) is stored
+    zlib-compressed under its SHA-256 digest, so identical pages share storage.
+    A snapshot is a small JSON manifest referencing those blobs; its digest is
+    the snapshot ID that analyses reference.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:]
+
+    def put_blob(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if path.exists():
+            return digest
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(zlib.compress(data, COMPRESSION_LEVEL))
+        os.replace(tmp_path, path)  # atomic, concurrent writers of the same blob are harmless
+        return digest
+
+    def get_blob(self, digest: str) -> bytes:
+        try:
+            with open(self._blob_path(digest), 'rb') as f:
+                return zlib.decompress(f.read())
+        except FileNotFoundError as e:
+            raise SnapshotNotFound(digest) from e
+
+    def save(self, response: requests.Response, page_source: str, screenshot: bytes | None) -> str:
+        """Stores a fetch and returns its snapshot ID."""
+        manifest = {
+            'version': SNAPSHOT_VERSION,
+            'response': _serialize_response(response),
+            'content': self.put_blob(response.content or b''),
+            'history': [_serialize_response(r) for r in response.history],
+            'page_source': self.put_blob(page_source.encode('utf-8')),
+            'screenshot': self.put_blob(screenshot) if screenshot else None,
+        }
+        return self.put_blob(json.dumps(manifest, sort_keys=True).encode('utf-8'))
+
+    def load(self, snapshot_id: str):
+        """
+        Loads a snapshot.
+        Returns the same tuple as fetch_website_content: (response, page_source, screenshot).
+        """
+        manifest = json.loads(self.get_blob(snapshot_id))
+        response = _deserialize_response(manifest['response'], self.get_blob(manifest['content']))
+        response.history = [_deserialize_response(r, b'') for r in manifest['history']]
+        page_source = self.get_blob(manifest['page_source']).decode('utf-8')
+        screenshot = self.get_blob(manifest['screenshot']) if manifest['screenshot'] else None
+        return response, page_source, screenshot
+
+    def load_screenshot(self, snapshot_id: str) -> bytes | None:
+        manifest = json.loads(self.get_blob(snapshot_id))
+        return self.get_blob(manifest['screenshot']) if manifest['screenshot'] else None
+
+def _serialize_response(response: requests.Response) -> dict:
+    return {
+        'url': response.url,
+        'status_code': response.status_code,
+        'headers': list(response.headers.items()),
+        'elapsed': response.elapsed.total_seconds(),
+        'encoding': response.encoding,
+    }
+
+def _deserialize_response(data: dict, content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.url = data['url']
+    response.status_code = data['status_code']
+    response.headers = CaseInsensitiveDict(data['headers'])
+    response.elapsed = datetime.timedelta(seconds=data['elapsed'])
+    response.encoding = data['encoding']
+    response._content = content
+    return response
+
+_store = None
+
+def get_snapshot_store() -> SnapshotStore:
+    """Returns the process-wide snapshot store."""
+    global _store
+    if _store is None:
+        _store = SnapshotStore(SNAPSHOT_STORE_PATH)
+    return _store
@@ -0,0 +1,52 @@
+"""
+Compares latency and token usage of the 'separate' (two requests) and 'combined'
+(one tool call) AI rating modes against a local mock OpenAI-compatible server.
+
+    python -m benchmarks.ai_rating_modes --runs 50
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.mock_openai import MockOpenAIServer
+from backend.analysis.ai_analyzer import AIService, AI_RATING_MODES
+
+TITLE = "Quark SEO – Kostenlose SEO-Analyse für deine Webseite"
+DESCRIPTION = ("Analysiere deine Webseite in Sekunden: Meta-Tags, Core Web Vitals, Links und KI-Bewertung "
+               "von Titel und Beschreibung. Jetzt kostenlos testen!")
+
+def run(mode, server, runs):
+    service = AIService(api_key="mock", mode=mode)
+    service._client = service._client.with_options(base_url=server.base_url)
+    server.reset()
+    latencies = []
+    for i in range(runs):
+        started = time.perf_counter()
+        service.rate(f"{DESCRIPTION} #{i}", f"{TITLE} #{i}")  # unique inputs, so the cache never hits
+        latencies.append(time.perf_counter() - started)
+    return {
+        'mode': mode,
+        'requests': server.requests / runs,
+        'prompt_tokens': server.prompt_tokens / runs,
+        'completion_tokens': server.completion_tokens / runs,
+        'mean_ms': statistics.mean(latencies) * 1000,
+        'p95_ms': sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--base-latency', type=float, default=0.3, help="Simulated model latency per request in seconds.")
+    args = parser.parse_args()
+
+    server = MockOpenAIServer(base_latency=args.base_latency).start()
+    try:
+        print(f"{'mode':<10}{'req/rating':>12}{'prompt tok':>12}{'compl. tok':>12}{'mean ms':>10}{'p95 ms':>10}")
+        for mode in AI_RATING_MODES:
+            r = run(mode, server, args.runs)
+            print(f"{r['mode']:<10}{r['requests']:>12.1f}{r['prompt_tokens']:>12.0f}{r['completion_tokens']:>12.0f}{r['mean_ms']:>10.0f}{r['p95_ms']:>10.0f}")
+    finally:
+        server.stop()
+
+if __name__ == '__main__':
+    main()
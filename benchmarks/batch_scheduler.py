@@ -0,0 +1,74 @@
+"""
+Runs batches through the BatchScheduler with a simulated analysis (a sleep
+instead of fetching and building cards) and reports the wall time per worker
+count, together with the highest number of analyses that ran at once overall
+and per host, to check that throughput scales with the workers while the
+per-host limit holds.
+
+    python -m benchmarks.batch_scheduler --urls 200 --hosts 20
+    python -m benchmarks.batch_scheduler --urls 60 --hosts 3 --host-delay 0.05
+"""
+import argparse
+import os
+import threading
+import time
+
+os.environ.setdefault("FLASK_SECRET_KEY", "benchmark")
+
+from backend.analysis.batches import BatchScheduler
+
+class SimulatedScheduler(BatchScheduler):
+    def __init__(self, analysis_seconds, **kwargs):
+        super().__init__(app=None, db=None, **kwargs)
+        self.analysis_seconds = analysis_seconds
+        self.running = {}
+        self.max_running = 0
+        self.max_running_per_host = 0
+        self.done = 0
+        self.all_done = threading.Event()
+        self.total = 0
+        self._stats_lock = threading.Lock()
+
+    def _heartbeat(self):
+        pass  # there is no database to refresh batches in
+
+    def _analyze(self, batch, position, url):
+        host = url.split('/')[2]
+        with self._stats_lock:
+            self.running[host] = self.running.get(host, 0) + 1
+            self.max_running = max(self.max_running, sum(self.running.values()))
+            self.max_running_per_host = max(self.max_running_per_host, self.running[host])
+        time.sleep(self.analysis_seconds)
+        with self._stats_lock:
+            self.running[host] -= 1
+            self.done += 1
+            if self.done == self.total:
+                self.all_done.set()
+
+def run(urls, workers, per_host, host_delay, analysis_seconds):
+    scheduler = SimulatedScheduler(analysis_seconds, workers=workers, per_host=per_host, host_delay=host_delay)
+    scheduler.total = len(urls)
+    started = time.perf_counter()
+    scheduler.submit('benchmark', None, False, list(enumerate(urls)))
+    scheduler.all_done.wait()
+    return time.perf_counter() - started, scheduler.max_running, scheduler.max_running_per_host
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--urls', type=int, default=200)
+    parser.add_argument('--hosts', type=int, default=20)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--per-host', type=int, default=1)
+    parser.add_argument('--host-delay', type=float, default=0.0, help="Seconds a host rests between two analyses.")
+    parser.add_argument('--analysis-seconds', type=float, default=0.05, help="Simulated duration of one analysis.")
+    args = parser.parse_args()
+
+    urls = [f"http://site{i % args.hosts}.example/page{i}/" for i in range(args.urls)]
+    print(f"{args.urls} URLs on {args.hosts} hosts, {args.analysis_seconds * 1000:.0f} ms per analysis")
+    print(f"{'workers':>8}{'wall s':>10}{'URLs/s':>10}{'max running':>13}{'max per host':>14}")
+    for workers in args.workers:
+        elapsed, max_running, max_per_host = run(urls, workers, args.per_host, args.host_delay, args.analysis_seconds)
+        print(f"{workers:>8}{elapsed:>10.2f}{args.urls / elapsed:>10.1f}{max_running:>13}{max_per_host:>14}")
+
+if __name__ == '__main__':
+    main()
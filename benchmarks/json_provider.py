@@ -0,0 +1,85 @@
+"""
+Compares the stdlib json module with backend.json_provider (orjson) on real
+results payloads: the /api/get_results response body and the JSON
+serializer/deserializer used by the SQLAlchemy JSON columns and the results
+codec. Checks that both produce the same documents with the same key order.
+
+Payloads are the stored analyses of the configured database plus the card
+builders' results for the app's own pages and any HTML files given.
+
+    python -m benchmarks.json_provider --limit 200
+    python -m benchmarks.json_provider page.html other.html
+"""
+import argparse
+import json
+import os
+import tempfile
+import timeit
+
+if not os.getenv("POSTGRES_DATABASE_URL"):
+    os.environ["POSTGRES_DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/json_provider.db"
+os.environ.setdefault("FLASK_SECRET_KEY", "benchmark")
+
+from flask.json.provider import DefaultJSONProvider
+
+from backend import json_provider
+from backend.server import create_app
+from backend.models import db
+from backend.models.results import AnalyzedWebsite
+from backend.analysis.result_schema import compact_results, expand_results
+from benchmarks.results_storage import SAMPLE_PAGES, build_results
+
+def per_call_us(func, payloads, repeat):
+    best = min(timeit.repeat(lambda: [func(payload) for payload in payloads], number=1, repeat=repeat))
+    return best / len(payloads) * 1e6
+
+def compare(label, baseline, fast, payloads, repeat):
+    baseline_us = per_call_us(baseline, payloads, repeat)
+    fast_us = per_call_us(fast, payloads, repeat)
+    print(f"{label:<28}{baseline_us:>12.1f}{fast_us:>12.1f}{baseline_us / fast_us:>9.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('html_files', nargs='*', help="Additional HTML pages to analyze.")
+    parser.add_argument('--limit', type=int, default=200, help="Stored analyses to include (newest first).")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    if json_provider.orjson is None:
+        parser.error("orjson is not installed, backend.json_provider is using the stdlib json module.")
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        rows = (db.session.query(AnalyzedWebsite)
+                .options(db.load_only(AnalyzedWebsite.results_data, AnalyzedWebsite.legacy_results))
+                .order_by(AnalyzedWebsite.time.desc()).limit(args.limit))
+        payloads = [expand_results(row.results) for row in rows if row.results]
+        client = app.test_client()
+        pages = [client.get(path).data for path in SAMPLE_PAGES]
+        pages += [open(path, 'rb').read() for path in args.html_files]
+        payloads += [json.loads(json.dumps(build_results(html))) for html in pages]  # as read back from the database
+    stored = [compact_results(results) for results in payloads]
+    stored_json = [json.dumps(results) for results in stored]
+
+    default_provider = DefaultJSONProvider(app)
+    default_provider.sort_keys = False
+    fast_provider = app.json
+    with app.test_request_context():
+        for results in payloads:
+            body = {"results": results, "screenshot_url": None, "thumbnail_url": None}
+            default_body = default_provider.response(body).get_data()
+            fast_body = fast_provider.response(body).get_data()
+            assert json.dumps(json.loads(default_body)) == json.dumps(json.loads(fast_body)), "response bodies differ"
+        for results, text in zip(stored, stored_json):
+            assert json.dumps(json_provider.loads(json_provider.dumps(results))) == text, "column round trip differs"
+
+        print(f"{len(payloads)} payloads, {sum(map(len, stored_json)) / len(stored_json):.0f} bytes stored JSON on average")
+        print(f"{'per payload':<28}{'json us':>12}{'orjson us':>12}{'speedup':>10}")
+        compare("get_results response", lambda r: default_provider.response({"results": r}).get_data(),
+                lambda r: fast_provider.response({"results": r}).get_data(), payloads, args.repeat)
+        compare("column serialize", json.dumps, json_provider.dumps, stored, args.repeat)
+        compare("deserialize str (column)", json.loads, json_provider.loads, stored_json, args.repeat)
+        compare("deserialize bytes (codec)", json.loads, json_provider.loads, [text.encode() for text in stored_json], args.repeat)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Minimal OpenAI-compatible stand-in for /v1/chat/completions with forced tool calls.
+
+Answers every request with tool call arguments generated from the tool's JSON schema
+(one array item per entry of a "###Beginn der Liste###[...]###Ende der Liste###" block).
+Ratings and texts are derived from the rated page's title (or description), see
+expected_rating and expected_text, so callers can check they got their own answer. Reports token usage estimated from the request size (~4 characters per token) and
+sleeps for a simulated model latency. Used by the benchmarks in this directory.
+"""
+import json
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHARS_PER_TOKEN = 4
+LIST_PATTERN = re.compile(r"###Beginn der Liste###(.*)###Ende der Liste###", re.DOTALL)
+SUBJECT_PATTERNS = (re.compile(r"###Beginn des Titels###(.*?)\.?###Ende des Titels###", re.DOTALL),
+                    re.compile(r"###Beginn der Beschreibung###(.*?)\.?###Ende der Beschreibung###", re.DOTALL))
+
+def expected_rating(subject):
+    """The rating the mock gives a page with this title (or description, if the request has no title)."""
+    return zlib.crc32(subject.encode('utf-8')) % 101
+
+def expected_text(subject):
+    """The reason/improvement text the mock gives a page with this title (or description)."""
+    return f"Kurze Bewertung von '{subject}' nach den genannten Kriterien."
+
+def _subject(entry):
+    return entry.get('title') or entry.get('description') or '' if isinstance(entry, dict) else ''
+
+class MockOpenAIServer:
+    def __init__(self, base_latency=0.3, seconds_per_prompt_token=0.0001, seconds_per_completion_token=0.01):
+        self.base_latency = base_latency
+        self.seconds_per_prompt_token = seconds_per_prompt_token
+        self.seconds_per_completion_token = seconds_per_completion_token
+        self.omit_list_indices = set()  # list entries left out of the answer, to simulate partial batch failures
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+
+    def reset(self):
+        with self._lock:
+            self.requests = self.prompt_tokens = self.completion_tokens = 0
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                tool = body['tools'][0]['function']
+                content = body['messages'][-1]['content']
+                subject = next((match.group(1) for match in (pattern.search(content) for pattern in SUBJECT_PATTERNS) if match), '')
+                arguments = json.dumps(mock.generate(tool['parameters'], body, subject))
+                prompt_tokens = len(json.dumps(body['messages']) + json.dumps(body['tools'])) // CHARS_PER_TOKEN
+                completion_tokens = len(arguments) // CHARS_PER_TOKEN
+                with mock._lock:
+                    mock.requests += 1
+                    mock.prompt_tokens += prompt_tokens
+                    mock.completion_tokens += completion_tokens
+                time.sleep(mock.base_latency
+                           + prompt_tokens * mock.seconds_per_prompt_token
+                           + completion_tokens * mock.seconds_per_completion_token)
+
+                payload = json.dumps({
+                    "id": "chatcmpl-mock",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body['model'],
+                    "choices": [{
+                        "index": 0,
+                        "finish_reason": "tool_calls",
+                        "message": {
+                            "role": "assistant",
+                            "content": None,
+                            "tool_calls": [{"id": "call_mock", "type": "function", "function": {"name": tool['name'], "arguments": arguments}}]
+                        }
+                    }],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+                }).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+    def generate(self, schema, body, subject):
+        """Generates a value matching the schema. Integers are ratings, strings short texts, both derived from subject."""
+        schema_type = schema.get('type')
+        if schema_type == 'object':
+            return {name: self.generate(prop, body, subject) for name, prop in schema.get('properties', {}).items()}
+        if schema_type == 'array':
+            match = LIST_PATTERN.search(body['messages'][-1]['content'])
+            entries = json.loads(match.group(1)) if match else [None]
+            items = []
+            for index, entry in enumerate(entries):
+                if index in self.omit_list_indices:
+                    continue
+                item = self.generate(schema['items'], body, _subject(entry) or subject)
+                if isinstance(item, dict) and 'index' in item:
+                    item['index'] = index
+                items.append(item)
+            return items
+        if schema_type == 'integer':
+            return expected_rating(subject)
+        return expected_text(subject)
@@ -0,0 +1,139 @@
+"""
+Fills a database with one user's analyses and compares the profile table queries:
+OFFSET vs. keyset pages at increasing depth, COUNT(*) vs. the per-user counter,
+and the /api/profile/get_analyses endpoint paging through with its cursors.
+
+    POSTGRES_DATABASE_URL=postgresql://... python -m benchmarks.profile_pagination --analyses 100000
+
+Without POSTGRES_DATABASE_URL a temporary SQLite file is used.
+"""
+import argparse
+import datetime
+import os
+import tempfile
+import time
+import uuid
+
+if not os.getenv("POSTGRES_DATABASE_URL"):
+    os.environ["POSTGRES_DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/profile_pagination.db"
+os.environ.setdefault("FLASK_SECRET_KEY", "benchmark")
+
+from sqlalchemy import func, insert, tuple_
+
+from backend.server import create_app
+from backend.models import db
+from backend.models.results import AnalyzedWebsite
+from backend.models.user import User
+
+BENCHMARK_EMAIL = "profile-pagination@benchmark.invalid"
+
+def seed(analyses, urls):
+    user = User(first_name="Bench", last_name="Mark", email=BENCHMARK_EMAIL, password="-", role="basic", analysis_count=analyses)
+    db.session.add(user)
+    db.session.commit()
+    started = datetime.datetime(2024, 1, 1)
+    rows = ({
+        'uuid': str(uuid.uuid4()),
+        'user_uuid': user.uuid,
+        'url': f"site-{i % urls}.example",
+        'results_data': {'overall_results': {'overall_rating': i % 100, 'improvement_count': i % 15}},
+        'overall_rating': i % 100,
+        'improvement_count': i % 15,
+        'time': started + datetime.timedelta(minutes=i),
+    } for i in range(analyses))
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == 5000:
+            db.session.execute(insert(AnalyzedWebsite), chunk)
+            chunk = []
+    if chunk:
+        db.session.execute(insert(AnalyzedWebsite), chunk)
+    db.session.commit()
+    return user
+
+def timed(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+def page_query(user_uuid):
+    return (db.session.query(AnalyzedWebsite.uuid, AnalyzedWebsite.time, AnalyzedWebsite.overall_rating)
+            .filter_by(user_uuid=user_uuid)
+            .order_by(AnalyzedWebsite.time.desc(), AnalyzedWebsite.uuid.desc()))
+
+def compare_pages(user, length):
+    print(f"{'page start':>12}{'OFFSET ms':>12}{'keyset ms':>12}")
+    for start in (0, 1000, 10000, 50000, user.analysis_count - length):
+        if start < 0 or start >= user.analysis_count:
+            continue
+        offset_ms, offset_rows = timed(lambda: page_query(user.uuid).offset(start).limit(length).all())
+        if start:
+            before = page_query(user.uuid).offset(start - 1).limit(1).one()  # the row a cursor would point at
+            keyset_ms, keyset_rows = timed(lambda: page_query(user.uuid).filter(
+                tuple_(AnalyzedWebsite.time, AnalyzedWebsite.uuid) < (before.time, before.uuid)
+            ).limit(length).all())
+        else:
+            keyset_ms, keyset_rows = offset_ms, offset_rows
+        assert [r.uuid for r in offset_rows] == [r.uuid for r in keyset_rows], "keyset page differs from OFFSET page"
+        print(f"{start:>12}{offset_ms:>12.2f}{keyset_ms:>12.2f}")
+
+def compare_counts(user):
+    count_ms, count = timed(lambda: db.session.query(func.count(AnalyzedWebsite.uuid)).filter_by(user_uuid=user.uuid).scalar())
+    counter_ms, counter = timed(lambda: db.session.query(User.analysis_count).filter_by(uuid=user.uuid).scalar())
+    assert count == counter, "analysis_count is out of sync"
+    print(f"COUNT(*) {count_ms:.2f} ms, analysis_count {counter_ms:.2f} ms")
+
+def walk_endpoint(app, user, length, pages):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user.uuid)
+        session['_fresh'] = True
+    cursor, seen = '', set()
+    started = time.perf_counter()
+    for page in range(pages):
+        data = client.post('/api/profile/get_analyses', data={
+            'draw': page + 1, 'start': page * length, 'length': length, 'cursor': cursor or ''
+        }).get_json()
+        seen.update(row['uuid'] for row in data['data'])
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+    elapsed = time.perf_counter() - started
+    assert len(seen) == min(pages * length, user.analysis_count), "pages overlap or skip rows"
+    print(f"endpoint: {page + 1} pages in {elapsed * 1000:.0f} ms ({elapsed * 1000 / (page + 1):.2f} ms/page)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--analyses', type=int, default=100000)
+    parser.add_argument('--urls', type=int, default=50, help="Distinct URLs among the analyses.")
+    parser.add_argument('--length', type=int, default=10, help="DataTables page length.")
+    parser.add_argument('--walk', type=int, default=200, help="Pages to walk through the endpoint.")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        previous = db.session.query(User).filter_by(email=BENCHMARK_EMAIL).first()
+        if previous:
+            db.session.query(AnalyzedWebsite).filter_by(user_uuid=previous.uuid).delete()
+            db.session.delete(previous)
+            db.session.commit()
+
+        started = time.perf_counter()
+        user = seed(args.analyses, args.urls)
+        print(f"Seeded {args.analyses} analyses in {time.perf_counter() - started:.1f}s ({db.engine.url.get_backend_name()})")
+        try:
+            compare_pages(user, args.length)
+            compare_counts(user)
+            walk_endpoint(app, user, args.length, args.walk)
+        finally:
+            db.session.query(AnalyzedWebsite).filter_by(user_uuid=user.uuid).delete()
+            db.session.delete(user)
+            db.session.commit()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures what idle analysis progress streams cost: memory per subscriber of one
+ProgressBroker channel and the time to fan an event out to all of them, with
+gevent greenlets (the async serving mode) or OS threads (one per sync worker
+connection) as subscribers.
+
+    python -m benchmarks.progress_streams --subscribers 5000
+    python -m benchmarks.progress_streams --subscribers 1000 --threads
+"""
+import sys
+
+if '--threads' not in sys.argv:
+    from gevent import monkey
+    monkey.patch_all(aggressive=False)  # as backend.gevent_worker does before loading the app
+
+import argparse
+import os
+import threading
+import time
+
+os.environ.setdefault("FLASK_SECRET_KEY", "benchmark")
+
+from backend.analysis.progress import ProgressBroker
+
+def rss_mib():
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--subscribers', type=int, default=5000)
+    parser.add_argument('--events', type=int, default=10)
+    parser.add_argument('--threads', action='store_true', help="Subscribe from OS threads instead of greenlets.")
+    args = parser.parse_args()
+
+    broker = ProgressBroker()
+    broker.open('bench')
+    received = [0] * (args.events + 1)
+    received_lock = threading.Lock()
+    all_received = [threading.Event() for _ in range(args.events + 1)]
+
+    def subscriber():
+        for event in broker.subscribe('bench', heartbeat=60):
+            if event is None:
+                continue
+            with received_lock:
+                received[event[0] - 1] += 1
+                if received[event[0] - 1] == args.subscribers:
+                    all_received[event[0] - 1].set()
+
+    before = rss_mib()
+    started = time.perf_counter()
+    workers = [threading.Thread(target=subscriber, daemon=True) for _ in range(args.subscribers)]
+    for worker in workers:
+        worker.start()
+    time.sleep(0.5)  # let every subscriber park on the channel
+    idle = rss_mib()
+    print(f"{args.subscribers} idle subscribers ({'threads' if args.threads else 'greenlets'}): "
+          f"{idle - before:.1f} MiB, {(idle - before) * 1024 / args.subscribers:.1f} KiB each, "
+          f"started in {time.perf_counter() - started - 0.5:.2f}s")
+
+    latencies = []
+    for position in range(args.events + 1):
+        started = time.perf_counter()
+        broker.publish('bench', f"{position}|event", final=position == args.events)
+        all_received[position].wait()
+        latencies.append(time.perf_counter() - started)
+    print(f"fan-out of one event to all subscribers: {sum(latencies) / len(latencies) * 1000:.1f} ms average, "
+          f"{max(latencies) * 1000:.1f} ms max")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Measures how much smaller the compact (message ID) results schema and the
+zstd-compressed storage are than the rendered JSON, and checks that every
+result renders back unchanged.
+
+Stored analyses from the configured database are measured as they are (rows
+already converted are expanded first). Additionally the card builders run on
+the app's own pages and on any HTML files given, as a reproducible sample.
+
+    python -m benchmarks.results_storage --limit 1000
+    python -m benchmarks.results_storage page.html other.html
+"""
+import argparse
+import datetime
+import json
+import os
+import tempfile
+
+if not os.getenv("POSTGRES_DATABASE_URL"):
+    os.environ["POSTGRES_DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/results_storage.db"
+os.environ.setdefault("FLASK_SECRET_KEY", "benchmark")
+
+import requests
+from bs4 import BeautifulSoup
+
+from backend.server import create_app
+from backend.models import db
+from backend.models.results import AnalyzedWebsite
+from backend.analysis.analyzer import build_general_results
+from backend.analysis.card_builders import build_all_cards, build_serp_preview, build_overall_results
+from backend.analysis.result_schema import compact_results, expand_results
+from backend.storage.results_codec import get_results_codec
+
+SAMPLE_PAGES = ['/', '/about', '/pricing', '/contact', '/imprint']
+SAMPLE_URL = 'http://127.0.0.1:9/'  # literal IP on a closed port: the network checks fail fast instead of timing out
+
+def build_results(html: bytes) -> dict:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = html
+    response.url = SAMPLE_URL
+    response.elapsed = datetime.timedelta(seconds=0.2)
+    response.headers['Content-Type'] = 'text/html; charset=utf-8'
+    soup = BeautifulSoup(html, 'html.parser')
+    results = {'general_results': build_general_results(soup, SAMPLE_URL, response)}
+    for _ in build_all_cards(results, soup, SAMPLE_URL, response, is_premium_user=False):
+        pass
+    results['serp_preview'] = build_serp_preview(soup, SAMPLE_URL, response)
+    results['overall_results'] = build_overall_results(results)
+    return results
+
+def measure(label, results_list):
+    codec = get_results_codec()
+    full_bytes = compact_bytes = stored_bytes = verbatim = items = 0
+    for results in results_list:
+        compact = compact_results(results)
+        stored = codec.encode(compact)
+        full_json = json.dumps(results)
+        assert expand_results(codec.decode(stored)) == json.loads(full_json), f"{label}: results don't render back unchanged"
+        full_bytes += len(full_json.encode())
+        compact_bytes += len(json.dumps(compact).encode())
+        stored_bytes += len(stored)
+        for card in compact.values():
+            for _, content in card.get('categories', []) if isinstance(card, dict) else []:
+                text_items = [item for item in content if isinstance(item, list)]
+                items += len(text_items)
+                verbatim += sum(1 for item in text_items if item[1] is None)
+    if not results_list:
+        print(f"{label:<22} no results")
+        return
+    count = len(results_list)
+    print(f"{label:<22}{count:>7}{full_bytes / count:>12.0f}{compact_bytes / count:>12.0f}{stored_bytes / count:>12.0f}"
+          f"{full_bytes / stored_bytes:>9.1f}x{verbatim / items if items else 0:>12.1%}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('html_files', nargs='*', help="Additional HTML pages to analyze.")
+    parser.add_argument('--limit', type=int, default=1000, help="Stored analyses to measure (newest first).")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        rows = (db.session.query(AnalyzedWebsite)
+                .options(db.load_only(AnalyzedWebsite.results_data, AnalyzedWebsite.legacy_results))
+                .order_by(AnalyzedWebsite.time.desc()).limit(args.limit))
+        stored = [expand_results(row.results) for row in rows if row.results]
+
+        client = app.test_client()
+        pages = [client.get(path).data for path in SAMPLE_PAGES]
+        pages += [open(path, 'rb').read() for path in args.html_files]
+        sample = [build_results(html) for html in pages]
+
+    print(f"{'source':<22}{'rows':>7}{'full B':>12}{'compact B':>12}{'stored B':>12}{'ratio':>10}{'verbatim':>12}")
+    measure("stored analyses", stored)
+    measure("sample pages", sample)
+
+if __name__ == '__main__':
+    main()
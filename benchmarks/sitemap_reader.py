@@ -0,0 +1,107 @@
+"""
+Serves a generated gzip-compressed sitemap index with large child sitemaps from a
+local HTTP server and reads it with backend.analysis.sitemaps.SitemapReader, at
+different fetch concurrencies. Reports entries per second and the peak of traced
+Python memory, next to parsing every child in one piece with
+ElementTree.fromstring (how sitemaps were read before).
+
+    python -m benchmarks.sitemap_reader --children 20 --urls-per-file 20000
+    python -m benchmarks.sitemap_reader --children 100 --urls-per-file 10000 --latency 0.2
+"""
+import argparse
+import gzip
+import os
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.etree import ElementTree
+
+os.environ.setdefault("FLASK_SECRET_KEY", "benchmark")
+
+from backend.analysis.dns_resolver import get_http_session
+from backend.analysis.sitemaps import SitemapReader, SITEMAP_NAMESPACE
+
+def build_sitemap(file_index, urls):
+    entries = ''.join(f'<url><loc>https://example.com/section-{file_index}/page-{i}.html</loc>'
+                      f'<lastmod>2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}T10:00:00+02:00</lastmod>'
+                      f'<changefreq>weekly</changefreq></url>' for i in range(urls))
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="{SITEMAP_NAMESPACE}">{entries}</urlset>'.encode()
+
+def start_server(children, urls_per_file, latency):
+    files = {}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), None)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    files['/sitemap_index.xml'] = (f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="{SITEMAP_NAMESPACE}">'
+                                   + ''.join(f'<sitemap><loc>{base_url}/sitemap-{i}.xml.gz</loc></sitemap>' for i in range(children))
+                                   + '</sitemapindex>').encode()
+    for i in range(children):
+        files[f'/sitemap-{i}.xml.gz'] = gzip.compress(build_sitemap(i, urls_per_file), compresslevel=6)
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            body = files.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            time.sleep(latency)  # simulated time to first byte
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-gzip' if self.path.endswith('.gz') else 'application/xml')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server.RequestHandlerClass = Handler
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    compressed = sum(len(body) for path, body in files.items() if path.endswith('.gz'))
+    return server, base_url, compressed
+
+def measure(func):
+    """(result, seconds of an untraced run, peak traced bytes of a second run)."""
+    started = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+def read_in_one_piece(index_url):
+    index = ElementTree.fromstring(get_http_session().get(index_url).content)
+    count = 0
+    for loc in index.iter(f'{{{SITEMAP_NAMESPACE}}}loc'):
+        root = ElementTree.fromstring(gzip.decompress(get_http_session().get(loc.text).content))
+        count += sum(1 for _ in root.iter(f'{{{SITEMAP_NAMESPACE}}}url'))
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--children', type=int, default=20)
+    parser.add_argument('--urls-per-file', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--latency', type=float, default=0.05, help="Seconds before the server answers a request.")
+    args = parser.parse_args()
+
+    server, base_url, compressed = start_server(args.children, args.urls_per_file, args.latency)
+    index_url = f"{base_url}/sitemap_index.xml"
+    total = args.children * args.urls_per_file
+    print(f"{args.children} gzip sitemaps x {args.urls_per_file} URLs, {compressed / 1024 / 1024:.1f} MiB compressed")
+    print(f"{'reader':<24}{'entries':>10}{'wall s':>9}{'entries/s':>12}{'peak MiB':>10}")
+    try:
+        count, elapsed, peak = measure(lambda: read_in_one_piece(index_url))
+        print(f"{'fromstring, sequential':<24}{count:>10}{elapsed:>9.2f}{count / elapsed:>12.0f}{peak / 1024 / 1024:>10.1f}")
+        for concurrency in args.concurrency:
+            reader = SitemapReader(concurrency=concurrency)
+            count, elapsed, peak = measure(lambda: sum(1 for _ in reader.entries([index_url])))
+            assert count == total, f"read {count} of {total} entries"
+            print(f"{f'streaming, {concurrency} fetches':<24}{count:>10}{elapsed:>9.2f}{count / elapsed:>12.0f}{peak / 1024 / 1024:>10.1f}")
+    finally:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
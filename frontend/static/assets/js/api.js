@@ -1,3 +1,6 @@
+const RESULTS_POLL_INTERVAL = 1500; // ms between requests while the analysis is still running
+const renderedSections = new Set();
+
 document.addEventListener('DOMContentLoaded', async function() {
     await fetchAndApplyResults();
 });
@@ -8,18 +11,23 @@ async function fetchAndApplyResults() {
         displayAPIError();
       }else{
         const data = await response.json();
-        const results = data.results;
 
-        if (data.screenshot === null) {
+        // While the analysis is running the sections arrive one by one, each is rendered once
+        applyNewSections(data.results);
+        if (data.status === 'running') {
+          setTimeout(fetchAndApplyResults, RESULTS_POLL_INTERVAL);
+          return;
+        }
+        if (data.status === 'failed' && renderedSections.size === 0) {
+          displayAPIError();
+          return;
+        }
+
+        if (data.screenshot_url === null) {
           document.getElementById("screenshot-container").style.display = "none";
         } else {
-          const screenshotUrl = `data:image/png;base64,${data.screenshot}`;
-          document.getElementById('screenshot').src = screenshotUrl;
+          document.getElementById('screenshot').src = data.screenshot_url;
         }
-        applyGeneralResults(results.general_results);
-        applyOverallResults(results.overall_results);
-        applySerpPreview(results.serp_preview)
-        display(results);
       }
     } catch (error) {
       console.error('Error:', error); 
@@ -27,6 +35,26 @@ async function fetchAndApplyResults() {
     }
 }
 
+function applyNewSections(results) {
+  const newResults = {};
+  Object.keys(results).forEach(section => {
+    if (!renderedSections.has(section)) {
+      renderedSections.add(section);
+      newResults[section] = results[section];
+    }
+  });
+  if (newResults.general_results) {
+    applyGeneralResults(newResults.general_results);
+  }
+  if (newResults.overall_results) {
+    applyOverallResults(newResults.overall_results);
+  }
+  if (newResults.serp_preview) {
+    applySerpPreview(newResults.serp_preview);
+  }
+  display(newResults);
+}
+
 function displayAPIError() {
   document.getElementById('seo-analyse-container').innerHTML = 
   `<section id="features" class="features section">
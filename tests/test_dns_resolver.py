@@ -0,0 +1,131 @@
+"""DNSResolver and get_http_session() against a local stub DNS server."""
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault('FLASK_SECRET_KEY', 'test')
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+import pytest
+
+import backend.analysis.dns_resolver as dns_resolver
+
+ZONE = {
+    ('dual.test.', 'A'): (120, ['192.0.2.10']),
+    ('dual.test.', 'AAAA'): (60, ['2001:db8::10']),
+    ('v4only.test.', 'A'): (300, ['192.0.2.20']),
+    ('local.test.', 'A'): (300, ['127.0.0.1']),
+}
+
+class StubDNSServer(socketserver.ThreadingUDPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        self.queries = Counter()  # (name, record type) -> queries received
+        self.lock = threading.Lock()
+        super().__init__(('127.0.0.1', 0), StubDNSHandler)
+
+class StubDNSHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        data, sock = self.request
+        query = dns.message.from_wire(data)
+        question = query.question[0]
+        name, rdtype = question.name.to_text(), dns.rdatatype.to_text(question.rdtype)
+        with self.server.lock:
+            self.server.queries[(name, rdtype)] += 1
+        time.sleep(0.05)  # upstream latency, so concurrent lookups overlap
+        response = dns.message.make_response(query)
+        if (name, rdtype) in ZONE:
+            ttl, addresses = ZONE[(name, rdtype)]
+            response.answer.append(dns.rrset.from_text_list(name, ttl, 'IN', rdtype, addresses))
+        elif not any(zone_name == name for zone_name, _ in ZONE):
+            response.set_rcode(dns.rcode.NXDOMAIN)
+        sock.sendto(response.to_wire(), self.client_address)
+
+@pytest.fixture
+def dns_server():
+    server = StubDNSServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+
+@pytest.fixture
+def resolver(dns_server):
+    return dns_resolver.DNSResolver(nameservers=['127.0.0.1'], port=dns_server.server_address[1],
+                                    min_ttl=1, max_ttl=3600, negative_ttl=30)
+
+def cache_lifetime(resolver, host):
+    return resolver._cache[host][0] - time.monotonic()
+
+def test_concurrent_lookups_share_one_query_per_record_type(dns_server, resolver):
+    with ThreadPoolExecutor(max_workers=50) as pool:
+        results = list(pool.map(lambda _: resolver.resolve('dual.test'), range(200)))
+    assert all(result == (['192.0.2.10'], ['2001:db8::10']) for result in results)
+    assert dns_server.queries == {('dual.test.', 'A'): 1, ('dual.test.', 'AAAA'): 1}
+
+def test_answers_are_cached_for_the_lowest_record_ttl(dns_server, resolver):
+    resolver.resolve('dual.test')
+    assert 58 < cache_lifetime(resolver, 'dual.test') <= 60  # AAAA has 60s, A 120s
+
+    resolver.resolve('dual.test')
+    assert sum(dns_server.queries.values()) == 2
+
+    expires_at, addresses = resolver._cache['dual.test']
+    resolver._cache['dual.test'] = (time.monotonic() - 1, addresses)
+    resolver.resolve('dual.test')
+    assert sum(dns_server.queries.values()) == 4
+
+def test_ttl_is_clamped(dns_server):
+    resolver = dns_resolver.DNSResolver(nameservers=['127.0.0.1'], port=dns_server.server_address[1], min_ttl=600, max_ttl=3600)
+    resolver.resolve('dual.test')
+    assert 598 < cache_lifetime(resolver, 'dual.test') <= 600
+
+def test_nonexistent_names_are_cached_negatively(dns_server, resolver):
+    for _ in range(3):
+        with pytest.raises(socket.gaierror):
+            resolver.resolve('missing.test')
+    assert dns_server.queries == {('missing.test.', 'A'): 1, ('missing.test.', 'AAAA'): 1}
+    assert 28 < cache_lifetime(resolver, 'missing.test') <= 30
+    assert resolver._cache['missing.test'][1] is None
+
+def test_has_ipv6(resolver):
+    assert resolver.resolve('dual.test').has_ipv6
+    v4only = resolver.resolve('v4only.test')
+    assert v4only.ipv4 == ['192.0.2.20'] and not v4only.has_ipv6
+
+def test_ip_literals_are_not_queried(dns_server, resolver):
+    assert resolver.resolve('192.0.2.1') == dns_resolver.HostAddresses(['192.0.2.1'], [])
+    assert not dns_server.queries
+
+def test_http_session_resolves_through_the_shared_resolver(dns_server, resolver, monkeypatch):
+    monkeypatch.setattr(dns_resolver, '_resolver', resolver)
+    monkeypatch.setattr(dns_resolver, '_resolver_pid', os.getpid())
+
+    class HelloHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            body = f"Hello {self.headers['Host']}".encode()
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    http_server = ThreadingHTTPServer(('127.0.0.1', 0), HelloHandler)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    try:
+        # local.test only exists on the stub server, so the system resolver couldn't have answered
+        response = dns_resolver.get_http_session().get(f"http://local.test:{http_server.server_port}/", timeout=5)
+    finally:
+        http_server.shutdown()
+    assert response.status_code == 200 and response.text == f"Hello local.test:{http_server.server_port}"
+    assert dns_server.queries[('local.test.', 'A')] == 1
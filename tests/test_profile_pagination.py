@@ -0,0 +1,60 @@
+import datetime
+import os
+
+os.environ.setdefault('FLASK_SECRET_KEY', 'test')
+
+import pytest
+
+import backend.server
+from backend.models import db
+from backend.models.results import AnalyzedWebsite
+from backend.models.user import User
+
+TIMED_ROWS = 10
+UNTIMED_ROWS = 5  # legacy rows with time IS NULL
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend.server, 'POSTGRES_DATABASE_URL', f"sqlite:///{tmp_path / 'profile.db'}")
+    app = backend.server.create_app()
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(uuid=1, first_name='a', last_name='b', email='a@b.c', password='x', role='free',
+                            analysis_count=TIMED_ROWS + UNTIMED_ROWS))
+        for i in range(TIMED_ROWS + UNTIMED_ROWS):
+            db.session.add(AnalyzedWebsite(user_uuid=1, url=f'example.de/page-{i}', results={'overall_results': {'overall_rating': i}},
+                                           time=datetime.datetime(2024, 1, 1) + datetime.timedelta(hours=i) if i < TIMED_ROWS else None))
+        db.session.commit()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+        session['_fresh'] = True
+    return client
+
+def get_page(client, start, length, cursor=None, search=''):
+    form = {'draw': 1, 'start': start, 'length': length, 'search[value]': search}
+    if cursor:
+        form['cursor'] = cursor
+    response = client.post('/api/profile/get_analyses', data=form)
+    assert response.status_code == 200
+    return response.get_json()
+
+@pytest.mark.parametrize('length', [3, 4, 5, 7])
+@pytest.mark.parametrize('search', ['', 'example'])
+def test_keyset_pages_match_offset_pages_including_untimed_rows(client, length, search):
+    by_offset, by_cursor = [], []
+    start, cursor = 0, None
+    while True:
+        offset_page = get_page(client, start, length, search=search)
+        cursor_page = get_page(client, start, length, cursor, search=search)
+        by_offset += [row['uuid'] for row in offset_page['data']]
+        by_cursor += [row['uuid'] for row in cursor_page['data']]
+        if not cursor_page['next_cursor']:
+            break
+        start, cursor = start + length, cursor_page['next_cursor']
+
+    assert by_cursor == by_offset
+    assert len(set(by_cursor)) == TIMED_ROWS + UNTIMED_ROWS
+    # newest first, rows without a time last
+    times = [row['time'] for row in get_page(client, 0, 100, search=search)['data']]
+    assert times[TIMED_ROWS:] == ['Unknown'] * UNTIMED_ROWS and times[:TIMED_ROWS] == sorted(times[:TIMED_ROWS], reverse=True)
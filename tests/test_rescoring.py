@@ -0,0 +1,27 @@
+import os
+
+os.environ.setdefault('FLASK_SECRET_KEY', 'test')
+
+from backend.analysis.card_builders import build_not_available_card, build_service_unavailable_card
+from backend.analysis.rescoring import is_premium_analysis
+from backend.analysis.result_schema import compact_results
+
+def results_with_performance_card(card):
+    results = {}
+    card.add_to_results(results, manual_points=100, index=6)
+    return results
+
+def free_tier_results():
+    return results_with_performance_card(build_not_available_card(
+        title='Performance',
+        category_title='Performance Data Not Available',
+        message='Performance metrics, including Core Web Vitals and PageSpeed insights, are only available for premium users.'
+    ))
+
+def test_free_tier_analysis_is_not_premium_in_stored_and_legacy_format():
+    assert is_premium_analysis(compact_results(free_tier_results())) is False
+    assert is_premium_analysis(free_tier_results()) is False
+
+def test_premium_analysis_with_unavailable_pagespeed_stays_premium():
+    results = results_with_performance_card(build_service_unavailable_card('Performance', 'Google PageSpeed Insights'))
+    assert is_premium_analysis(compact_results(results)) is True
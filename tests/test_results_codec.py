@@ -0,0 +1,57 @@
+"""
+Rows compressed with a trained dictionary must be readable by every process sharing
+the database, not just the one that trained it. Each step runs in its own interpreter
+with its own RESULTS_DICTIONARY_PATH, as on separate hosts.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+TRAIN_AND_STORE = """
+import datetime
+from backend.server import create_app
+from backend.models import db
+from backend.models.results import AnalyzedWebsite
+from backend.storage.results_codec import get_results_codec, train_dictionary
+
+samples = [{'url': f'https://example{i}.com/page/{i * 7}', 'overall_results': {'overall_rating': i % 100, 'improvement_count': i % 13},
+            'cards': [{'name': f'Card {j}', 'text': f'Title tag {i} has {j * i % 70} characters.', 'rating': (i + j) % 100} for j in range(12)]}
+           for i in range(200)]
+app = create_app()
+with app.app_context():
+    db.create_all()
+    codec = get_results_codec()
+    dict_id = codec.save_dictionary(train_dictionary(samples, 4096))
+    db.session.add(AnalyzedWebsite(uuid='row-1', url='example7.com', results=samples[7], time=datetime.datetime(2024, 1, 1)))
+    db.session.commit()
+    print(dict_id)
+"""
+
+READ = """
+from backend.server import create_app
+from backend.models import db
+from backend.models.results import AnalyzedWebsite
+
+app = create_app()
+with app.app_context():
+    print(db.session.get(AnalyzedWebsite, 'row-1').results['url'])
+"""
+
+def run(script, database_url, dictionary_dir):
+    env = dict(os.environ, PYTHONPATH=str(ROOT), POSTGRES_DATABASE_URL=database_url,
+               RESULTS_DICTIONARY_PATH=str(dictionary_dir), FLASK_SECRET_KEY='test')
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip().splitlines()[-1]
+
+def test_dictionary_compressed_row_decodes_in_another_process(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'results.db'}"
+    dict_id = run(TRAIN_AND_STORE, database_url, tmp_path / 'trainer_cache')
+    assert int(dict_id) != 0
+
+    reader_cache = tmp_path / 'reader_cache'
+    assert run(READ, database_url, reader_cache) == 'https://example7.com/page/49'
+    assert (reader_cache / f"{dict_id}.zdict").is_file()  # cached locally for the next start
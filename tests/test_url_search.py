@@ -0,0 +1,23 @@
+import os
+
+os.environ.setdefault('FLASK_SECRET_KEY', 'test')
+
+from backend.routes.api_routes import url_search_condition
+
+def sql(*terms):
+    condition = url_search_condition(*terms)
+    return None if condition is None else str(condition.compile(compile_kwargs={'literal_binds': True}))
+
+def test_full_url_matches_as_prefix_anything_else_as_substring():
+    assert sql('https://www.example.de/blog') == "lower(analyzed_websites.url) LIKE 'example.de/blog%' ESCAPE '\\'"
+    assert sql('blog') == "lower(analyzed_websites.url) LIKE '%blog%' ESCAPE '\\'"
+    assert sql('', None) is None
+
+def test_term_contained_in_another_term_is_dropped():
+    assert sql('https://example.de/blog', 'blog') == sql('https://example.de/blog')
+    assert sql('https://example.de', 'https://example.de/blog') == sql('https://example.de/blog')
+
+def test_prefix_term_is_kept_when_only_a_substring_term_contains_it():
+    # 'shop.example.de/sale' doesn't start with example.de, so the prefix constraint still matters
+    condition = sql('https://example.de', 'shop.example.de')
+    assert "LIKE 'example.de%'" in condition and "LIKE '%shop.example.de%'" in condition